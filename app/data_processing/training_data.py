@@ -6,35 +6,92 @@ It converts raw FPL API data into feature vectors suitable for training.
 """
 
 import asyncio
+import functools
 import logging
 import os
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Tuple, Callable, Awaitable
 from datetime import datetime, timedelta
-import json
 
 from app.utils.fpl_data import (
     get_bootstrap_data,
     get_players,
     get_player_with_history,
+    get_player_with_history_all_seasons,
     get_team_by_id,
     get_fixture_difficulty,
     get_player_fixture_difficulty,
     get_teams
 )
+from app.utils.http_client import run_with_client
 
 # Configure logger
 logger = logging.getLogger(__name__)
 
+# Maximum number of player fetches in flight against the FPL API at once
+MAX_CONCURRENT_FETCHES = 20
 
-async def get_player_extended_data(player_id: int, next_n_fixtures: int = 5) -> Dict[str, Any]:
+# Rows per chunk and file buffer size used when writing dataset CSVs
+CSV_CHUNK_SIZE = 10000
+CSV_BUFFER_SIZE = 1 << 20
+
+# Worker processes used to run CPU-bound dataset work off the event loop
+PROCESS_POOL_WORKERS = max(1, (os.cpu_count() or 2) // 2)
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """
+    Get the shared process pool, creating it on first use
+    
+    Returns:
+        ProcessPoolExecutor for CPU-bound dataset work
+    """
+    global _process_pool
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor(max_workers=PROCESS_POOL_WORKERS)
+    return _process_pool
+
+
+def shutdown_process_pool() -> None:
+    """Shut down the shared process pool if it was started"""
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown()
+        _process_pool = None
+
+
+async def run_in_process_pool(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    Run a picklable top-level function in the shared process pool
+    
+    Args:
+        func: Function to run in a worker process
+        *args: Positional arguments for func
+        **kwargs: Keyword arguments for func
+        
+    Returns:
+        Result of func
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_process_pool(), functools.partial(func, *args, **kwargs))
+
+
+async def get_player_extended_data(
+    player_id: int,
+    next_n_fixtures: int = 5,
+    teams_by_id: Optional[Dict[int, Dict[str, Any]]] = None
+) -> Dict[str, Any]:
     """
     Get extended player data including history and fixture difficulty
     
     Args:
         player_id: Player ID from FPL API
         next_n_fixtures: Number of upcoming fixtures to include
+        teams_by_id: Optional preloaded mapping of team ID to team data, avoids a team lookup per player
         
     Returns:
         Dictionary containing player data with extended information
@@ -51,8 +108,16 @@ async def get_player_extended_data(player_id: int, next_n_fixtures: int = 5) ->
     else:
         avg_difficulty = 3.0  # Default medium difficulty
     
+    # Extract per-game points and appearances once so feature building doesn't rescan the history
+    history = player_data.get("history", [])
+    player_data["_hist_pts"] = history_points(history)
+    player_data["_appearances"] = count_appearances(history)
+    
     # Get team data
-    team_data = await get_team_by_id(player_data["team"])
+    if teams_by_id is not None:
+        team_data = teams_by_id.get(player_data["team"])
+    else:
+        team_data = await get_team_by_id(player_data["team"])
     
     # Add extended data
     extended_data = {
@@ -72,20 +137,140 @@ async def get_player_extended_data(player_id: int, next_n_fixtures: int = 5) ->
     return extended_data
 
 
-async def process_player_features(player_data: Dict[str, Any]) -> Dict[str, Any]:
+def history_points(history: List[Dict[str, Any]]) -> np.ndarray:
     """
-    Process player data to extract features for machine learning
+    Extract the points scored in each game of a player's history
     
     Args:
-        player_data: Extended player data from get_player_extended_data
+        history: Per-game history entries from the FPL API
         
     Returns:
-        Dictionary of player features
+        Array of total points per game, oldest first
+    """
+    return np.fromiter((game.get("total_points", 0) for game in history), dtype=np.int16, count=len(history))
+
+
+def count_appearances(history: List[Dict[str, Any]]) -> int:
+    """
+    Count the games in a player's history in which they played any minutes
+    
+    Args:
+        history: Per-game history entries from the FPL API
+        
+    Returns:
+        Number of appearances
+    """
+    return sum(1 for game in history if game.get("minutes", 0) > 0)
+
+
+# Position names indexed by FPL element_type (1=GK, 2=DEF, 3=MID, 4=FWD)
+POSITION_NAMES = ("Unknown", "GK", "DEF", "MID", "FWD")
+
+# Column layout and dtypes of the player feature table, in output order.
+# Per-season counting stats and team strengths fit in int16; rates use float32.
+PLAYER_FEATURE_SCHEMA: Dict[str, Any] = {
+    "player_id": np.int32,
+    "name": object,
+    "team": object,
+    "position": object,
+    "price": np.float32,
+    "form": np.float32,
+    "recent_form": np.float32,
+    "points_per_game": np.float32,
+    "points_per_90": np.float32,
+    "minutes": np.int32,
+    "goals_scored": np.int16,
+    "assists": np.int16,
+    "clean_sheets": np.int16,
+    "goals_conceded": np.int16,
+    "own_goals": np.int16,
+    "penalties_saved": np.int16,
+    "penalties_missed": np.int16,
+    "yellow_cards": np.int16,
+    "red_cards": np.int16,
+    "saves": np.int16,
+    "bonus": np.int16,
+    "bps": np.int32,
+    "influence": np.float32,
+    "creativity": np.float32,
+    "threat": np.float32,
+    "ict_index": np.float32,
+    "xG": np.float32,
+    "xA": np.float32,
+    "ownership_percentage": np.float32,
+    "avg_fixture_difficulty": np.float32,
+    "team_strength": np.float32,
+    "team_strength_attack_home": np.int16,
+    "team_strength_attack_away": np.int16,
+    "team_strength_defence_home": np.int16,
+    "team_strength_defence_away": np.int16,
+}
+
+# Counting stats copied straight from the player data into int columns
+_COUNT_FEATURES = (
+    "minutes", "goals_scored", "assists", "clean_sheets", "goals_conceded",
+    "own_goals", "penalties_saved", "penalties_missed", "yellow_cards",
+    "red_cards", "saves", "bonus", "bps", "team_strength_attack_home",
+    "team_strength_attack_away", "team_strength_defence_home",
+    "team_strength_defence_away"
+)
+
+# Float features the FPL API sends as strings, mapped to their source field.
+# They are collected raw and parsed in one vectorized pass per column.
+_STRING_FLOAT_FEATURES = {
+    "form": "form",
+    "influence": "influence",
+    "creativity": "creativity",
+    "threat": "threat",
+    "ict_index": "ict_index",
+    "ownership_percentage": "selected_by_percent",
+}
+
+
+def allocate_feature_columns(num_players: int) -> Dict[str, np.ndarray]:
+    """
+    Allocate empty typed column arrays for the player feature table
+    
+    Args:
+        num_players: Number of rows to allocate
+        
+    Returns:
+        Dictionary mapping feature names to preallocated arrays
+    """
+    return {
+        name: np.empty(num_players, dtype=object if name in _STRING_FLOAT_FEATURES else dtype)
+        for name, dtype in PLAYER_FEATURE_SCHEMA.items()
+    }
+
+
+def parse_string_float_features(df: pd.DataFrame) -> None:
+    """
+    Convert the raw string-typed float features of a feature table in place
+    
+    Args:
+        df: DataFrame built from allocate_feature_columns / fill_player_features
+    """
+    for name in _STRING_FLOAT_FEATURES:
+        raw = df[name].astype(str).str.replace(",", ".", regex=False)
+        df[name] = pd.to_numeric(raw, errors="coerce").fillna(0.0).astype(PLAYER_FEATURE_SCHEMA[name])
+
+
+def fill_player_features(columns: Dict[str, np.ndarray], row: int, player_data: Dict[str, Any]) -> None:
+    """
+    Extract machine learning features for one player into preallocated feature columns
+    
+    Args:
+        columns: Feature columns from allocate_feature_columns
+        row: Row index to write
+        player_data: Extended player data from get_player_extended_data
     """
     # Calculate points per game (ppg)
     minutes = player_data["minutes"]
     total_points = player_data["total_points"]
-    games_played = len([game for game in player_data.get("history", []) if game.get("minutes", 0) > 0])
+    # Games with any minutes played (appearances, including substitute ones)
+    games_played = player_data.get("_appearances")
+    if games_played is None:
+        games_played = count_appearances(player_data.get("history", []))
     
     # Avoid division by zero
     ppg = total_points / max(1, games_played) if games_played > 0 else 0
@@ -93,15 +278,11 @@ async def process_player_features(player_data: Dict[str, Any]) -> Dict[str, Any]
     # Calculate points per 90 minutes
     points_per_90 = (total_points / max(1, minutes)) * 90 if minutes > 0 else 0
     
-    # Extract raw form and convert to float, with default if missing
-    raw_form = player_data.get("form", "0.0")
-    form = float(raw_form) if raw_form and raw_form != "" else 0.0
-    
     # Calculate recent form (last 3 games)
-    history = player_data.get("history", [])
-    recent_history = history[-3:] if len(history) >= 3 else history
-    recent_points = sum(game.get("total_points", 0) for game in recent_history)
-    recent_form = recent_points / len(recent_history) if recent_history else 0.0
+    hist_pts = player_data.get("_hist_pts")
+    if hist_pts is None:
+        hist_pts = history_points(player_data.get("history", []))
+    recent_form = float(hist_pts[-3:].mean()) if len(hist_pts) else 0.0
     
     # Get xG and xA (expected goals and assists) if available, or approximate
     # Note: FPL API doesn't directly provide xG/xA, so we'll approximate from recent performance
@@ -114,52 +295,112 @@ async def process_player_features(player_data: Dict[str, Any]) -> Dict[str, Any]
     xG_approx = (goals / max(1, games_played)) if games_played > 0 else 0
     xA_approx = (assists / max(1, games_played)) if games_played > 0 else 0
     
-    # Extract ownership percentage
-    selected_by_percent = float(player_data.get("selected_by_percent", "0.0").replace(',', '.'))
-    
     # Process team strength relative to league average
     avg_strength = 1000  # Assumed average team strength in FPL
     relative_team_strength = (player_data.get("team_strength", avg_strength) / avg_strength) * 100
     
-    features = {
-        "player_id": player_data["id"],
-        "name": f"{player_data.get('first_name', '')} {player_data.get('second_name', '')}",
-        "team": player_data.get("team_name", "Unknown"),
-        "position": get_position_name(player_data.get("element_type", 0)),
-        "price": player_data.get("now_cost", 0) / 10.0,
-        "form": form,
-        "recent_form": recent_form,
-        "points_per_game": ppg,
-        "points_per_90": points_per_90,
-        "minutes": player_data.get("minutes", 0),
-        "goals_scored": player_data.get("goals_scored", 0),
-        "assists": player_data.get("assists", 0),
-        "clean_sheets": player_data.get("clean_sheets", 0),
-        "goals_conceded": player_data.get("goals_conceded", 0),
-        "own_goals": player_data.get("own_goals", 0),
-        "penalties_saved": player_data.get("penalties_saved", 0),
-        "penalties_missed": player_data.get("penalties_missed", 0),
-        "yellow_cards": player_data.get("yellow_cards", 0),
-        "red_cards": player_data.get("red_cards", 0),
-        "saves": player_data.get("saves", 0),
-        "bonus": player_data.get("bonus", 0),
-        "bps": player_data.get("bps", 0),
-        "influence": float(player_data.get("influence", 0)),
-        "creativity": float(player_data.get("creativity", 0)),
-        "threat": float(player_data.get("threat", 0)),
-        "ict_index": float(player_data.get("ict_index", 0)),
-        "xG": xG_approx,
-        "xA": xA_approx,
-        "ownership_percentage": selected_by_percent,
-        "avg_fixture_difficulty": player_data.get("avg_fixture_difficulty", 3.0),
-        "team_strength": relative_team_strength,
-        "team_strength_attack_home": player_data.get("team_strength_attack_home", 0),
-        "team_strength_attack_away": player_data.get("team_strength_attack_away", 0),
-        "team_strength_defence_home": player_data.get("team_strength_defence_home", 0),
-        "team_strength_defence_away": player_data.get("team_strength_defence_away", 0),
-    }
+    columns["player_id"][row] = player_data["id"]
+    columns["name"][row] = f"{player_data.get('first_name', '')} {player_data.get('second_name', '')}"
+    columns["team"][row] = player_data.get("team_name", "Unknown")
+    columns["position"][row] = get_position_name(player_data.get("element_type", 0))
+    columns["price"][row] = player_data.get("now_cost", 0) / 10.0
+    columns["recent_form"][row] = recent_form
+    columns["points_per_game"][row] = ppg
+    columns["points_per_90"][row] = points_per_90
+    for name in _COUNT_FEATURES:
+        columns[name][row] = player_data.get(name, 0)
+    # String-typed floats are stored raw and parsed in bulk by parse_string_float_features
+    for name, source in _STRING_FLOAT_FEATURES.items():
+        columns[name][row] = player_data.get(source)
+    columns["xG"][row] = xG_approx
+    columns["xA"][row] = xA_approx
+    columns["avg_fixture_difficulty"][row] = player_data.get("avg_fixture_difficulty", 3.0)
+    columns["team_strength"][row] = relative_team_strength
+
+
+async def build_player_features(
+    players: List[Dict[str, Any]],
+    fetch_player_data: Callable[[int], Awaitable[Dict[str, Any]]],
+    label: str = "player"
+) -> pd.DataFrame:
+    """
+    Fetch and featurize players concurrently with a bounded number of requests in flight
+    
+    Args:
+        players: Player dicts from the FPL API
+        fetch_player_data: Coroutine function returning the data to featurize for a player ID
+        label: Label used in progress log messages
+        
+    Returns:
+        DataFrame of player features, in input order, for players processed successfully
+    """
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_FETCHES)
+    num_players = len(players)
+    columns = allocate_feature_columns(num_players)
+    
+    async def process_player(i: int, player: Dict[str, Any]) -> None:
+        async with semaphore:
+            # Per-player log lines use deferred %-formatting so nothing is built when INFO is off
+            logger.info(
+                "Processing %s %d/%d: %s %s",
+                label, i + 1, num_players, player["first_name"], player["second_name"]
+            )
+            player_data = await fetch_player_data(player["id"])
+        fill_player_features(columns, i, player_data)
+    
+    results = await asyncio.gather(
+        *(process_player(i, player) for i, player in enumerate(players)),
+        return_exceptions=True
+    )
+    
+    processed = np.ones(num_players, dtype=bool)
+    for i, (player, result) in enumerate(zip(players, results)):
+        if isinstance(result, Exception):
+            logger.error("Error processing player %s: %s", player["id"], result)
+            processed[i] = False
+    
+    # Drop the rows of players that failed before building the frame
+    if not processed.all():
+        columns = {name: values[processed] for name, values in columns.items()}
+    
+    df = pd.DataFrame(columns, copy=False)
+    parse_string_float_features(df)
+    return df
+
+
+def write_dataset_csv(df: pd.DataFrame, csv_path: str) -> None:
+    """
+    Write a dataset to CSV in chunks through a large file buffer
     
-    return features
+    Args:
+        df: Dataset to write
+        csv_path: Destination CSV path
+    """
+    with open(csv_path, "w", newline="", buffering=CSV_BUFFER_SIZE) as f:
+        df.to_csv(f, index=False, chunksize=CSV_CHUNK_SIZE)
+
+
+def write_dataset(df: pd.DataFrame, path_stem: str, file_format: str = "csv") -> str:
+    """
+    Write a dataset in the requested file format
+    
+    Args:
+        df: Dataset to write
+        path_stem: Destination path without file extension
+        file_format: "csv" or "parquet" (parquet requires pyarrow to be installed)
+        
+    Returns:
+        Path of the written file
+    """
+    if file_format == "parquet":
+        path = f"{path_stem}.parquet"
+        df.to_parquet(path, index=False)
+    elif file_format == "csv":
+        path = f"{path_stem}.csv"
+        write_dataset_csv(df, path)
+    else:
+        raise ValueError(f"Unsupported dataset format: {file_format}")
+    return path
 
 
 def get_position_name(position_id: int) -> str:
@@ -172,29 +413,21 @@ def get_position_name(position_id: int) -> str:
     Returns:
         Position name as string
     """
-    positions = {
-        1: "GK",   # Goalkeeper
-        2: "DEF",  # Defender
-        3: "MID",  # Midfielder
-        4: "FWD"   # Forward
-    }
-    return positions.get(position_id, "Unknown")
+    if 0 < position_id < len(POSITION_NAMES):
+        return POSITION_NAMES[position_id]
+    return "Unknown"
 
 
-async def prepare_training_data(output_dir: str, num_players: Optional[int] = None) -> str:
+async def build_training_frame(num_players: Optional[int] = None) -> pd.DataFrame:
     """
-    Prepare training data by fetching data for all players and processing features
+    Fetch all players and build the master training feature frame
     
     Args:
-        output_dir: Directory to save the training data
         num_players: Optional limit on number of players to process (for testing)
         
     Returns:
-        Path to the saved training data CSV file
+        DataFrame of player features
     """
-    # Create output directory if it doesn't exist
-    os.makedirs(output_dir, exist_ok=True)
-    
     # Get all players
     players = await get_players()
     
@@ -204,34 +437,44 @@ async def prepare_training_data(output_dir: str, num_players: Optional[int] = No
     
     logger.info(f"Processing data for {len(players)} players...")
     
-    # Process each player
-    player_features = []
-    for i, player in enumerate(players):
-        try:
-            logger.info(f"Processing player {i+1}/{len(players)}: {player['first_name']} {player['second_name']}")
-            # Use all available history (multi-season if possible)
-            from app.utils.fpl_data import get_player_with_history_all_seasons
-            extended_data = await get_player_with_history_all_seasons(player["id"])
-            features = await process_player_features(extended_data)
-            player_features.append(features)
-        except Exception as e:
-            logger.error(f"Error processing player {player['id']}: {str(e)}")
-    
-    # Convert to DataFrame
-    df = pd.DataFrame(player_features)
-    
-    # Save to CSV
+    # Process players concurrently, using all available history (multi-season if possible)
+    return await build_player_features(players, get_player_with_history_all_seasons)
+
+
+async def prepare_training_data(
+    output_dir: str,
+    num_players: Optional[int] = None,
+    write_json: bool = False,
+    file_format: str = "csv"
+) -> str:
+    """
+    Prepare training data by fetching data for all players and processing features
+    
+    Args:
+        output_dir: Directory to save the training data
+        num_players: Optional limit on number of players to process (for testing)
+        write_json: Also save the features as JSON lines for raw data access
+        file_format: Dataset file format, "csv" (default) or "parquet"
+        
+    Returns:
+        Path to the saved training data file
+    """
+    # Create output directory if it doesn't exist
+    os.makedirs(output_dir, exist_ok=True)
+    
+    df = await build_training_frame(num_players)
+    
+    # Save the dataset
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    csv_path = os.path.join(output_dir, f"fpl_training_data_{timestamp}.csv")
-    df.to_csv(csv_path, index=False)
+    dataset_path = write_dataset(df, os.path.join(output_dir, f"fpl_training_data_{timestamp}"), file_format)
     
-    # Also save as JSON for raw data access
-    json_path = os.path.join(output_dir, f"fpl_training_data_{timestamp}.json")
-    with open(json_path, 'w') as f:
-        json.dump(player_features, f, indent=2)
+    # Optionally also save as JSON lines for raw data access
+    if write_json:
+        json_path = os.path.join(output_dir, f"fpl_training_data_{timestamp}.jsonl")
+        df.to_json(json_path, orient="records", lines=True)
     
-    logger.info(f"Training data saved to {csv_path}")
-    return csv_path
+    logger.info(f"Training data saved to {dataset_path}")
+    return dataset_path
 
 
 async def generate_weekly_datasets(base_dir: str, weeks_of_history: int = 10) -> Dict[str, str]:
@@ -271,9 +514,15 @@ async def generate_weekly_datasets(base_dir: str, weeks_of_history: int = 10) ->
     
     current_gw_id = current_gw["id"]
     
+    # Build the feature frame once and only write it out per gameweek
+    # In a real implementation, you'd filter player data to only include data available at that gameweek
+    # For this example, we'll use current data but note this is a simplification
+    master_df = await build_training_frame(num_players=50)  # Limit to 50 players for example
+    
     # Generate datasets for each of the past N gameweeks
     dataset_paths = {}
     start_gw = max(1, current_gw_id - weeks_of_history)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     
     for gw in range(start_gw, current_gw_id + 1):
         logger.info(f"Generating dataset for gameweek {gw}")
@@ -282,10 +531,7 @@ async def generate_weekly_datasets(base_dir: str, weeks_of_history: int = 10) ->
         gw_dir = os.path.join(base_dir, f"gameweek_{gw}")
         os.makedirs(gw_dir, exist_ok=True)
         
-        # Prepare dataset for this gameweek
-        # In a real implementation, you'd filter player data to only include data available at that gameweek
-        # For this example, we'll use current data but note this is a simplification
-        dataset_path = await prepare_training_data(gw_dir, num_players=50)  # Limit to 50 players for example
+        dataset_path = write_dataset(master_df, os.path.join(gw_dir, f"fpl_training_data_{timestamp}"))
         
         dataset_paths[str(gw)] = dataset_path
     
@@ -308,49 +554,36 @@ async def generate_position_specific_datasets(base_dir: str) -> Dict[str, str]:
     # Get all players
     players = await get_players()
     
-    # Group players by position
-    positions = {
-        1: [],  # GK
-        2: [],  # DEF
-        3: [],  # MID
-        4: []   # FWD
-    }
+    # Keep players with a known position
+    players = [player for player in players if 0 < player.get("element_type", 0) < len(POSITION_NAMES)]
+    
+    # Load teams once so each player's team lookup is a dict access
+    teams_by_id = {team["id"]: team for team in await get_teams()}
     
-    for player in players:
-        pos = player.get("element_type", 0)
-        if pos in positions:
-            positions[pos].append(player)
+    async def fetch_player_data(player_id: int) -> Dict[str, Any]:
+        return await get_player_extended_data(player_id, teams_by_id=teams_by_id)
     
-    # Generate dataset for each position
+    # Fetch and featurize every player once, then split the frame by position
+    master_df = await build_player_features(players, fetch_player_data)
+    
+    # Generate dataset for each position, including positions with no players
+    # (position-specific training expects a dataset directory for every position)
+    groups = {}
+    if "position" in master_df.columns:
+        groups = {name: df for name, df in master_df.groupby("position", sort=False, observed=True)}
     dataset_paths = {}
-    for pos_id, pos_players in positions.items():
-        pos_name = get_position_name(pos_id)
-        logger.info(f"Generating dataset for position {pos_name} with {len(pos_players)} players")
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    for pos_name in POSITION_NAMES[1:]:
+        pos_df = groups.get(pos_name, master_df.iloc[0:0])
+        logger.info(f"Generating dataset for position {pos_name} with {len(pos_df)} players")
         
         # Create position directory
         pos_dir = os.path.join(base_dir, pos_name.lower())
         os.makedirs(pos_dir, exist_ok=True)
         
-        # Process players for this position
-        player_features = []
-        for i, player in enumerate(pos_players):
-            try:
-                logger.info(f"Processing {pos_name} {i+1}/{len(pos_players)}: {player['first_name']} {player['second_name']}")
-                extended_data = await get_player_extended_data(player["id"])
-                features = await process_player_features(extended_data)
-                player_features.append(features)
-            except Exception as e:
-                logger.error(f"Error processing player {player['id']}: {str(e)}")
-        
-        # Convert to DataFrame
-        df = pd.DataFrame(player_features)
-        
-        # Save to CSV
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        csv_path = os.path.join(pos_dir, f"{pos_name.lower()}_training_data_{timestamp}.csv")
-        df.to_csv(csv_path, index=False)
-        
-        dataset_paths[pos_name] = csv_path
+        dataset_paths[pos_name] = write_dataset(
+            pos_df, os.path.join(pos_dir, f"{pos_name.lower()}_training_data_{timestamp}")
+        )
     
     return dataset_paths
 
@@ -359,6 +592,32 @@ async def normalize_features(features_df: pd.DataFrame) -> pd.DataFrame:
     """
     Normalize features for better model performance
     
+    Args:
+        features_df: DataFrame of player features
+        
+    Returns:
+        DataFrame with normalized features
+    """
+    return normalize_features_sync(features_df)
+
+
+async def normalize_features_async(features_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Normalize features in a worker process, keeping the event loop responsive
+    
+    Args:
+        features_df: DataFrame of player features
+        
+    Returns:
+        DataFrame with normalized features
+    """
+    return await run_in_process_pool(normalize_features_sync, features_df)
+
+
+def normalize_features_sync(features_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Min-max normalize the numeric player features
+    
     Args:
         features_df: DataFrame of player features
         
@@ -383,17 +642,64 @@ async def normalize_features(features_df: pd.DataFrame) -> pd.DataFrame:
     # Ensure all columns exist
     numeric_cols = [col for col in numeric_cols if col in normalized_df.columns]
     
-    # Apply min-max normalization to numerical features
-    for col in numeric_cols:
-        min_val = normalized_df[col].min()
-        max_val = normalized_df[col].max()
-        
-        if max_val > min_val:
-            normalized_df[col] = (normalized_df[col] - min_val) / (max_val - min_val)
+    if not numeric_cols:
+        return normalized_df
+    
+    # Apply min-max normalization to all numerical features in one block operation
+    values = normalized_df[numeric_cols].to_numpy(dtype=np.float32, copy=True)
+    min_vals = np.nanmin(values, axis=0)
+    value_ranges = np.nanmax(values, axis=0) - min_vals
+    
+    # Leave constant columns untouched
+    constant = ~(value_ranges > 0)
+    min_vals[constant] = 0.0
+    value_ranges[constant] = 1.0
+    
+    values -= min_vals
+    values /= value_ranges
+    normalized_df[numeric_cols] = values
     
     return normalized_df
 
 
+def compute_rate_features(
+    total_points: np.ndarray,
+    minutes: np.ndarray,
+    game_counts: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compute points per 90 minutes and points per game, with 0 where undefined
+    
+    Args:
+        total_points: Points scored per row
+        minutes: Minutes played per row
+        game_counts: Number of games in each row's season for that player
+        
+    Returns:
+        Tuple of (points_per_90, points_per_game) arrays
+    """
+    # Divide only where the denominator is non-zero so no inf/NaN is ever produced
+    points_per_90 = np.zeros_like(total_points, dtype=np.float64)
+    np.divide(total_points, minutes, out=points_per_90, where=minutes != 0)
+    points_per_90 *= 90
+    
+    points_per_game = np.zeros_like(total_points, dtype=np.float64)
+    np.divide(total_points, game_counts, out=points_per_game, where=game_counts != 0)
+    
+    return points_per_90, points_per_game
+
+
+# Essential columns of cleaned_merged_seasons.csv and the dtypes they are parsed into
+MERGED_SEASONS_DTYPES: Dict[str, Any] = {
+    "name": object,
+    "position": object,
+    "minutes": np.float32,
+    "total_points": np.float32,
+    "season_x": object,
+    "GW": np.float32,
+}
+
+
 def load_merged_seasons_training_data(csv_path: str) -> pd.DataFrame:
     """
     Load and preprocess the unified multi-season FPL training dataset from CSV.
@@ -403,24 +709,89 @@ def load_merged_seasons_training_data(csv_path: str) -> pd.DataFrame:
         Preprocessed DataFrame ready for model training
     """
     logger.info(f"Loading multi-season training data from {csv_path}")
-    df = pd.read_csv(csv_path)
+    try:
+        # Parse the essential columns straight into their final dtypes
+        df = pd.read_csv(csv_path, dtype=MERGED_SEASONS_DTYPES)
+        typed = True
+    except ValueError:
+        # Fall back to inference when a numeric column holds non-numeric values
+        df = pd.read_csv(csv_path)
+        typed = False
     # Basic cleaning: drop rows with missing essential values
-    essential_cols = ["name", "position", "minutes", "total_points", "season_x", "GW"]
-    df = df.dropna(subset=essential_cols)
+    df = df.dropna(subset=list(MERGED_SEASONS_DTYPES))
     # Convert types if needed
-    df["minutes"] = pd.to_numeric(df["minutes"], errors="coerce").fillna(0)
-    df["total_points"] = pd.to_numeric(df["total_points"], errors="coerce").fillna(0)
-    df["GW"] = pd.to_numeric(df["GW"], errors="coerce").fillna(0)
+    if not typed:
+        df["minutes"] = pd.to_numeric(df["minutes"], errors="coerce").fillna(0)
+        df["total_points"] = pd.to_numeric(df["total_points"], errors="coerce").fillna(0)
+        df["GW"] = pd.to_numeric(df["GW"], errors="coerce").fillna(0)
     # Add points per 90 and points per game
-    df["points_per_90"] = df["total_points"] / df["minutes"].replace(0, np.nan) * 90
-    df["points_per_game"] = df["total_points"] / df.groupby(["season_x", "name"])['GW'].transform('count')
-    df["points_per_90"] = df["points_per_90"].replace([np.inf, -np.inf], 0).fillna(0)
-    df["points_per_game"] = df["points_per_game"].replace([np.inf, -np.inf], 0).fillna(0)
+    game_counts = df.groupby(["season_x", "name"])['GW'].transform('count').to_numpy(dtype=np.float64)
+    points_per_90, points_per_game = compute_rate_features(
+        df["total_points"].to_numpy(dtype=np.float64),
+        df["minutes"].to_numpy(dtype=np.float64),
+        game_counts
+    )
+    df["points_per_90"] = points_per_90
+    df["points_per_game"] = points_per_game
     # Standardize column names if needed (e.g., 'position' to uppercase)
     df["position"] = df["position"].str.upper()
+    # Downcast float columns to float32 to halve memory for downstream training
+    float_cols = df.select_dtypes(include="float64").columns
+    df[float_cols] = df[float_cols].astype(np.float32)
     return df
 
 
+async def load_merged_seasons_training_data_async(csv_path: str) -> pd.DataFrame:
+    """
+    Load the multi-season training dataset in a worker process
+    
+    Args:
+        csv_path: Path to cleaned_merged_seasons.csv
+        
+    Returns:
+        Preprocessed DataFrame ready for model training
+    """
+    return await run_in_process_pool(load_merged_seasons_training_data, csv_path)
+
+
+def prepare_training_data_sync(
+    output_dir: str,
+    num_players: Optional[int] = None,
+    write_json: bool = False,
+    file_format: str = "csv"
+) -> str:
+    """
+    Run prepare_training_data to completion on a fresh event loop (used by worker processes)
+    
+    Returns:
+        Path to the saved training data file
+    """
+    return run_with_client(prepare_training_data(output_dir, num_players, write_json, file_format))
+
+
+async def prepare_training_data_async(
+    output_dir: str,
+    num_players: Optional[int] = None,
+    write_json: bool = False,
+    file_format: str = "csv"
+) -> str:
+    """
+    Prepare training data in a worker process, keeping the event loop responsive
+    
+    Args:
+        output_dir: Directory to save the training data
+        num_players: Optional limit on number of players to process (for testing)
+        write_json: Also save the features as JSON lines for raw data access
+        file_format: Dataset file format, "csv" (default) or "parquet"
+        
+    Returns:
+        Path to the saved training data file
+    """
+    return await run_in_process_pool(
+        prepare_training_data_sync, output_dir, num_players, write_json, file_format
+    )
+
+
 if __name__ == "__main__":
     # Set up logging
     logging.basicConfig(
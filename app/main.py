@@ -1,10 +1,16 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
+from app.utils.http_client import close_client
 from app.routers import recommendations, captain, team_score, team
 
 app = FastAPI(
     title="FPL Assistant API",
     description="API for Fantasy Premier League assistant providing recommendations, captain picks, and team optimization",
-    version="0.1.0"
+    version="0.1.0",
+    default_response_class=ORJSONResponse
 )
 
 # Include routers
@@ -13,6 +19,19 @@ app.include_router(captain.router)
 app.include_router(team_score.router)
 app.include_router(team.router)
 
+
+@app.on_event("startup")
+async def configure_default_executor():
+    # Size the default thread pool that runs blocking model inference (asyncio.to_thread)
+    max_workers = min(32, (os.cpu_count() or 1) * 2)
+    asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=max_workers))
+
+
+@app.on_event("shutdown")
+async def close_http_client():
+    # Release pooled FPL API connections
+    await close_client()
+
 @app.get("/")
 async def root():
     return {"message": "Welcome to the FPL Assistant API"}
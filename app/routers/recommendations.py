@@ -1,5 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from typing import List, Optional
+from fastapi.responses import StreamingResponse
+from typing import AsyncIterator, List, Optional
 from app.schemas.fpl import TransferRecommendation, Team
 from app.services import recommendation_service
 from app.services.transfer_service import suggest_transfers
@@ -30,6 +31,25 @@ async def get_recommendations(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/stream")
+async def stream_recommendations(
+    team_id: int = Query(..., description="FPL Team ID"),
+    budget: float = Query(..., description="Available budget for transfers"),
+    free_transfers: int = Query(..., description="Number of free transfers available"),
+    subscription_tier: Optional[str] = Query("basic", description="User subscription tier (basic, premium, elite)")
+):
+    """
+    Stream recommended transfers for a given FPL team as newline-delimited JSON
+    """
+    async def ndjson_lines() -> AsyncIterator[str]:
+        async for recommendation in recommendation_service.stream_transfer_recommendations(
+            team_id, budget, free_transfers, subscription_tier
+        ):
+            yield recommendation.model_dump_json() + "\n"
+    
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+
+
 @router.post("/custom", response_model=List[TransferRecommendation])
 async def get_custom_recommendations(
     team: Team,
@@ -1,4 +1,5 @@
-from typing import List, Optional
+from functools import cached_property
+from typing import FrozenSet, List, Optional, TypedDict
 from pydantic import BaseModel
 
 
@@ -22,6 +23,8 @@ class Player(BaseModel):
     red_cards: Optional[int] = 0
     saves: Optional[int] = 0
     bonus: Optional[int] = 0
+    # FPL availability status: a=available, d=doubtful, i=injured, s=suspended, u=unavailable
+    status: str = "a"
     
     
 class Team(BaseModel):
@@ -29,6 +32,11 @@ class Team(BaseModel):
     total_value: float
     remaining_budget: float
 
+    @cached_property
+    def player_ids(self) -> FrozenSet[int]:
+        """IDs of the players in the squad, computed once per Team instance"""
+        return frozenset(p.id for p in self.players)
+
 
 class TransferRecommendation(BaseModel):
     player_out: Player
@@ -48,3 +56,18 @@ class TeamScore(BaseModel):
     areas_of_strength: List[str]
     areas_for_improvement: List[str]
     optimization_tips: List[str]
+
+
+class CaptainPickData(TypedDict, total=False):
+    """Captain pick record returned by model.recommend_captain"""
+    player: str
+    reasoning: str
+    expected_points: float
+
+
+class TransferRecommendationData(TypedDict, total=False):
+    """Transfer record returned by model.rank_transfers"""
+    player_out: str
+    player_in: str
+    reasoning: str
+    expected_point_impact: float
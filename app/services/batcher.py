@@ -0,0 +1,127 @@
+"""
+Micro-batching of model inference calls
+
+Concurrent requests that call the same model method are coalesced into a single
+call to the model's batch method (e.g. recommend_captain_batch) when it exists.
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Largest number of calls merged into one batch, and how long to wait for more
+MAX_BATCH_SIZE = 32
+MAX_BATCH_DELAY = 0.005  # seconds
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent submissions into batched calls
+
+    Each submission is a tuple of positional arguments. The batch function receives
+    the list of argument tuples and must return one result per tuple, in order.
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[List[Tuple[Any, ...]]], Awaitable[List[Any]]],
+        max_batch: int = MAX_BATCH_SIZE,
+        max_delay: float = MAX_BATCH_DELAY
+    ):
+        self.batch_fn = batch_fn
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        # Queue and worker belong to the event loop that created them
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    async def submit(self, *args: Any) -> Any:
+        """
+        Submit one call and wait for its result from the batch it lands in
+
+        Args:
+            *args: Positional arguments for this call
+
+        Returns:
+            The result for this call
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # First use, or a new event loop: the old queue and worker cannot serve it
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = None
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._drain(self._queue))
+
+        future = loop.create_future()
+        self._queue.put_nowait((args, future))
+        return await future
+
+    async def _drain(self, queue: asyncio.Queue) -> None:
+        """
+        Collect queued calls into batches and resolve their futures
+
+        Args:
+            queue: Queue of (args, future) submissions on the running loop
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + self.max_delay
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                results = list(await self.batch_fn([args for args, _ in batch]))
+                if len(results) != len(batch):
+                    # Results can no longer be matched to calls; fail them all rather than leave some unresolved
+                    raise RuntimeError(f"Batch function returned {len(results)} results for {len(batch)} calls")
+            except Exception as e:
+                logger.error(f"Batched model call failed: {str(e)}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+
+# One batcher per (model, method name)
+_BATCHERS: Dict[Tuple[Any, str], MicroBatcher] = {}
+
+
+async def call_batched(model: Any, method_name: str, *args: Any) -> Any:
+    """
+    Call a model method, going through a micro-batcher when the model has a batch variant
+
+    The batch variant is looked up as "<method_name>_batch" and receives a list of
+    argument tuples. Models without it are called directly.
+
+    Args:
+        model: Model instance
+        method_name: Name of the single-call method (e.g. "recommend_captain")
+        *args: Positional arguments for the call
+
+    Returns:
+        Result of the model call
+    """
+    batch_fn = getattr(model, f"{method_name}_batch", None)
+    if batch_fn is None:
+        return await getattr(model, method_name)(*args)
+
+    key = (model, method_name)
+    batcher = _BATCHERS.get(key)
+    if batcher is None:
+        batcher = _BATCHERS[key] = MicroBatcher(batch_fn)
+    return await batcher.submit(*args)
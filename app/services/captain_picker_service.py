@@ -1,4 +1,6 @@
+import asyncio
 from typing import List, Dict, Any, Optional
+from pydantic import TypeAdapter
 from app.schemas.fpl import Team, Player
 from app.models.model_selector import predict_captain_for_subscription
 from app.utils.fpl_data import get_player_fixture_difficulty
@@ -6,6 +8,9 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Serializes a whole squad in one call
+_PLAYERS_ADAPTER = TypeAdapter(List[Player])
+
 async def pick_best_captain(
     team: Team,
     gameweek: int,
@@ -21,15 +26,25 @@ async def pick_best_captain(
         Dict with best captain pick info, or None if not found
     """
     try:
-        players_features = []
+        # Players on the same club share their next fixture, so look it up once per club
+        club_player_ids = {}
         for player in team.players:
-            features = player.dict()
-            try:
-                fixtures = await get_player_fixture_difficulty(player.id, next_n=1)
-                features["avg_fixture_difficulty"] = fixtures[0]["difficulty"] if fixtures else 3.0
-            except:
-                features["avg_fixture_difficulty"] = 3.0
-            players_features.append(features)
+            club_player_ids.setdefault(player.team, player.id)
+        
+        fixture_results = await asyncio.gather(
+            *(get_player_fixture_difficulty(player_id, next_n=1) for player_id in club_player_ids.values()),
+            return_exceptions=True
+        )
+        club_difficulty = {}
+        for club, fixtures in zip(club_player_ids, fixture_results):
+            if isinstance(fixtures, Exception) or not fixtures:
+                club_difficulty[club] = 3.0
+            else:
+                club_difficulty[club] = fixtures[0]["difficulty"]
+        
+        players_features = _PLAYERS_ADAPTER.dump_python(team.players)
+        for player, features in zip(team.players, players_features):
+            features["avg_fixture_difficulty"] = club_difficulty[player.team]
         
         # Try to use ML model
         try:
@@ -1,25 +1,66 @@
 from typing import List, Optional, Dict, Any
-from app.schemas.fpl import CaptainPick, Team, Player
+from app.schemas.fpl import CaptainPick, CaptainPickData, Team, Player
 from app.models.prediction import get_model_for_tier
 from app.utils import fpl_data, config
+from app.services.batcher import call_batched
+from app.services.recommendation_service import get_team_players
 import logging
 
 # Configure logger
 logger = logging.getLogger(__name__)
 
 
-async def get_captain_recommendations(
-    team_id: int, 
-    gameweek: int, 
-    subscription_tier: Optional[str] = "basic"
+def format_captain_picks(
+    captain_picks_data: List[CaptainPickData],
+    players: List[Player],
+    limit: int
 ) -> List[CaptainPick]:
     """
-    Get captain recommendations for a given FPL team and gameweek
+    Convert model captain pick records into CaptainPick objects
     
     Args:
-        team_id: FPL team ID
-        gameweek: Gameweek number
+        captain_picks_data: Records returned by model.recommend_captain
+        players: Players the picks were made from
+        limit: Maximum number of picks to return
+        
+    Returns:
+        List of captain picks for players found in the squad
+    """
+    # Index players by name for O(1) lookups (duplicate names resolve to the first player)
+    players_by_name = {}
+    for p in players:
+        players_by_name.setdefault(p.name, p)
+    
+    # Read each record's fields once, then format results according to schema
+    picks = [
+        (
+            players_by_name.get(pick_data.get("player", "")),
+            pick_data.get("reasoning", "Strong candidate for returns."),
+            pick_data.get("expected_points", 0.0)
+        )
+        for pick_data in captain_picks_data[:limit]
+    ]
+    return [
+        CaptainPick(player=player, reasoning=reasoning, expected_points=expected_points)
+        for player, reasoning, expected_points in picks
+        if player
+    ]
+
+
+async def _recommend_captains(
+    players: List[Player],
+    gameweek: int,
+    subscription_tier: Optional[str],
+    recommendations_label: str
+) -> List[CaptainPick]:
+    """
+    Recommend captains from a list of players with the tier's model
+    
+    Args:
+        players: Players to pick from
+        gameweek: Gameweek number (<= 0 for the current gameweek)
         subscription_tier: User subscription tier (basic, premium, elite)
+        recommendations_label: Recommendation description used in error logs
         
     Returns:
         List of captain picks in order of recommendation
@@ -33,45 +74,42 @@ async def get_captain_recommendations(
         gameweek = current_gw["id"]
     
     # Get tier configuration
-    tier_config = config.settings.SUBSCRIPTION_TIERS.get(
-        subscription_tier or "basic", 
-        config.settings.SUBSCRIPTION_TIERS["basic"]
-    )
-    captain_picks_limit = tier_config.get("captain_picks_limit", 2)
+    captain_picks_limit = config.get_tier_limits(subscription_tier).captain_picks_limit
     
     try:
-        # Get team players - in a real implementation, you would get actual team data
-        # For now, using the helper function from recommendation service
-        from app.services.recommendation_service import get_team_players
-        team_players = await get_team_players(team_id)
-        
         # Use the model to recommend captains
-        captain_picks_data = await model.recommend_captain(team_players, gameweek)
+        captain_picks_data = await call_batched(model, "recommend_captain", players, gameweek)
         
-        # Format results according to schema
-        recommendations = []
-        for pick_data in captain_picks_data[:captain_picks_limit]:
-            # Find player by name
-            player_name = pick_data.get("player", "")
-            player = next((p for p in team_players if p.name == player_name), None)
-            
-            if player:
-                recommendations.append(
-                    CaptainPick(
-                        player=player,
-                        reasoning=pick_data.get("reasoning", "Strong candidate for returns."),
-                        expected_points=pick_data.get("expected_points", 0.0)
-                    )
-                )
-        
-        return recommendations
+        return format_captain_picks(captain_picks_data, players, captain_picks_limit)
     
     except Exception as e:
-        logger.error(f"Error generating captain recommendations: {str(e)}")
+        logger.error(f"Error generating {recommendations_label}: {str(e)}")
         # Return empty list in case of error
         return []
 
 
+async def get_captain_recommendations(
+    team_id: int, 
+    gameweek: int, 
+    subscription_tier: Optional[str] = "basic"
+) -> List[CaptainPick]:
+    """
+    Get captain recommendations for a given FPL team and gameweek
+    
+    Args:
+        team_id: FPL team ID
+        gameweek: Gameweek number
+        subscription_tier: User subscription tier (basic, premium, elite)
+        
+    Returns:
+        List of captain picks in order of recommendation
+    """
+    # Get team players - in a real implementation, you would get actual team data
+    # For now, using the helper function from recommendation service
+    team_players = await get_team_players(team_id)
+    return await _recommend_captains(team_players, gameweek, subscription_tier, "captain recommendations")
+
+
 async def get_custom_captain_recommendations(
     team: Team, 
     gameweek: int, 
@@ -88,44 +126,4 @@ async def get_custom_captain_recommendations(
     Returns:
         List of captain picks in order of recommendation
     """
-    # Get AI model for the subscription tier
-    model = get_model_for_tier(subscription_tier or "basic")
-    
-    # Get current gameweek if not specified
-    if gameweek <= 0:
-        current_gw = await fpl_data.get_current_gameweek()
-        gameweek = current_gw["id"]
-    
-    # Get tier configuration
-    tier_config = config.settings.SUBSCRIPTION_TIERS.get(
-        subscription_tier or "basic", 
-        config.settings.SUBSCRIPTION_TIERS["basic"]
-    )
-    captain_picks_limit = tier_config.get("captain_picks_limit", 2)
-    
-    try:
-        # Use the model to recommend captains
-        captain_picks_data = await model.recommend_captain(team.players, gameweek)
-        
-        # Format results according to schema
-        recommendations = []
-        for pick_data in captain_picks_data[:captain_picks_limit]:
-            # Find player by name
-            player_name = pick_data.get("player", "")
-            player = next((p for p in team.players if p.name == player_name), None)
-            
-            if player:
-                recommendations.append(
-                    CaptainPick(
-                        player=player,
-                        reasoning=pick_data.get("reasoning", "Strong candidate for returns."),
-                        expected_points=pick_data.get("expected_points", 0.0)
-                    )
-                )
-        
-        return recommendations
-    
-    except Exception as e:
-        logger.error(f"Error generating custom captain recommendations: {str(e)}")
-        # Return empty list in case of error
-        return []
+    return await _recommend_captains(team.players, gameweek, subscription_tier, "custom captain recommendations")
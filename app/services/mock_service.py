@@ -5,9 +5,12 @@ from typing import List, Dict, Any, Optional
 from app.schemas.fpl import Team, Player, TransferRecommendation, CaptainPick, TeamScore
 import logging
 import random
+from operator import attrgetter
 
 logger = logging.getLogger(__name__)
 
+_by_total_points = attrgetter("total_points")
+
 async def mock_transfer_suggestions(
     team: Team,
     budget: float,
@@ -20,27 +23,31 @@ async def mock_transfer_suggestions(
     """
     try:
         # Get some popular players as mock suggestions
-        from app.utils.fpl_data import get_players_by_form
+        from app.utils.fpl_data import get_players_by_form, POSITION_ID_BY_NAME
         
         # Get current player IDs to avoid suggesting existing players
         current_ids = {p.id for p in team.players}
         
+        # Group the squad by position once and find each position's lowest scorer
+        by_pos: Dict[str, List[Player]] = {}
+        for p in team.players:
+            by_pos.setdefault(p.position, []).append(p)
+        worst_by_pos = {pos: min(players, key=_by_total_points) for pos, players in by_pos.items()}
+        
         suggestions = []
         positions = ["DEF", "MID", "FWD"]
         
         for pos in positions[:max_suggestions]:
             # Get top players by form for this position
-            position_id = {"DEF": 2, "MID": 3, "FWD": 4}.get(pos, 3)
+            position_id = POSITION_ID_BY_NAME.get(pos, 3)
             top_players = await get_players_by_form(position=position_id, limit=5)
             
             # Find a player not in current team
             for player_data in top_players:
                 if player_data["id"] not in current_ids and player_data["now_cost"] / 10.0 <= budget:
                     # Create mock player out (lowest scoring from same position)
-                    players_same_pos = [p for p in team.players if p.position == pos]
-                    if players_same_pos:
-                        player_out = min(players_same_pos, key=lambda x: x.total_points)
-                        
+                    player_out = worst_by_pos.get(pos)
+                    if player_out:
                         # Create player in
                         player_in = {
                             "id": player_data["id"],
@@ -77,7 +84,7 @@ async def mock_captain_pick(
             return None
         
         # Pick the player with highest total points
-        best_player = max(team.players, key=lambda x: x.total_points)
+        best_player = max(team.players, key=_by_total_points)
         
         return {
             "name": best_player.name,
@@ -1,12 +1,68 @@
-from typing import List, Optional, Dict, Any
-from app.schemas.fpl import TransferRecommendation, Team, Player
+import asyncio
+from typing import AsyncIterator, Iterable, List, Optional, Dict, Any
+from pydantic import TypeAdapter
+from app.schemas.fpl import TransferRecommendation, TransferRecommendationData, Team, Player
 from app.models.prediction import get_model_for_tier
 from app.utils import fpl_data, config
+from app.services.batcher import call_batched
 import logging
 
 # Configure logger
 logger = logging.getLogger(__name__)
 
+# Batch validator for lists of players
+_PLAYERS_ADAPTER = TypeAdapter(List[Player])
+
+# Defaults for player fields missing from the FPL team data
+_PLAYER_DEFAULTS: Dict[str, Any] = {
+    "id": 0,
+    "name": "Unknown",
+    "team": "Unknown",
+    "position": "Unknown",
+    "price": 0.0,
+    "form": 0.0,
+    "total_points": 0,
+    "minutes": 0,
+}
+
+# Team ID -> team name, kept until the gameweek rolls over
+_TEAM_NAME_CACHE: Dict[int, str] = {}
+_team_name_cache_gameweek: Optional[int] = None
+
+
+def clear_team_name_cache() -> None:
+    """
+    Clear the cached team names
+    """
+    _TEAM_NAME_CACHE.clear()
+
+
+async def get_team_names(team_ids: List[int]) -> Dict[int, str]:
+    """
+    Resolve team IDs to team names, fetching only the ones not cached for the current gameweek
+    
+    Args:
+        team_ids: FPL team IDs
+        
+    Returns:
+        Dictionary mapping every requested team ID to its name
+    """
+    global _team_name_cache_gameweek
+    
+    # Invalidate the cache on gameweek rollover
+    gameweek_id = (await fpl_data.get_current_gameweek()).get("id")
+    if gameweek_id != _team_name_cache_gameweek:
+        clear_team_name_cache()
+        _team_name_cache_gameweek = gameweek_id
+    
+    missing = [team_id for team_id in set(team_ids) if team_id not in _TEAM_NAME_CACHE]
+    if missing:
+        team_data_list = await asyncio.gather(*(fpl_data.get_team_by_id(team_id) for team_id in missing))
+        for team_id, team_data in zip(missing, team_data_list):
+            _TEAM_NAME_CACHE[team_id] = team_data.get("name", "Unknown") if team_data else "Unknown"
+    
+    return {team_id: _TEAM_NAME_CACHE[team_id] for team_id in team_ids}
+
 
 async def get_team_players(team_id: int) -> List[Player]:
     """
@@ -22,32 +78,10 @@ async def get_team_players(team_id: int) -> List[Player]:
         # Get actual team data from FPL API
         team_data = await fpl_data.get_team_players(team_id)
         
-        # Convert to Player objects
-        players = []
-        
-        for player_data in team_data:
-            player = Player(
-                id=player_data.get("id", 0),
-                name=player_data.get("name", "Unknown"),
-                team=player_data.get("team", "Unknown"),
-                position=player_data.get("position", "Unknown"),
-                price=player_data.get("price", 0.0),
-                form=player_data.get("form", 0.0),
-                total_points=player_data.get("total_points", 0),
-                minutes=player_data.get("minutes", 0),
-                goals_scored=player_data.get("goals_scored", 0),
-                assists=player_data.get("assists", 0),
-                clean_sheets=player_data.get("clean_sheets", 0),
-                goals_conceded=player_data.get("goals_conceded", 0),
-                own_goals=player_data.get("own_goals", 0),
-                penalties_saved=player_data.get("penalties_saved", 0),
-                penalties_missed=player_data.get("penalties_missed", 0),
-                yellow_cards=player_data.get("yellow_cards", 0),
-                red_cards=player_data.get("red_cards", 0),
-                saves=player_data.get("saves", 0),
-                bonus=player_data.get("bonus", 0)
-            )
-            players.append(player)
+        # Convert to Player objects in one batch validation, filling defaults for missing fields
+        players = _PLAYERS_ADAPTER.validate_python(
+            [{**_PLAYER_DEFAULTS, **player_data} for player_data in team_data]
+        )
         
         return players
     
@@ -77,24 +111,31 @@ async def get_transfer_targets(
         # For now, we'll get players with good form who aren't already in the team
         
         all_targets = []
+        current_ids = {p.id for p in current_players}
+        
+        # Get top form players for every position concurrently
+        position_lists = await asyncio.gather(
+            *(fpl_data.get_players_by_form(position=position_id, limit=limit) for position_id, _ in fpl_data.POSITIONS)
+        )
+        
+        # Resolve every team referenced by the candidates, served from the team name cache
+        team_names = await get_team_names(
+            [player_data.get("team", 0) for position_players in position_lists for player_data in position_players]
+        )
         
         # Get targets for each position
-        for position_id, position_name in [(1, "GK"), (2, "DEF"), (3, "MID"), (4, "FWD")]:
-            # Get top form players for this position
-            position_players = await fpl_data.get_players_by_form(position=position_id, limit=limit)
-            
+        for (position_id, position_name), position_players in zip(fpl_data.POSITIONS, position_lists):
             for player_data in position_players:
                 # Skip if player is already in the team
                 player_id = player_data.get("id", 0)
-                if any(p.id == player_id for p in current_players):
+                if player_id in current_ids:
                     continue
                 
                 # Get team name
-                team_id = player_data.get("team", 0)
-                team_data = await fpl_data.get_team_by_id(team_id)
-                team_name = team_data.get("name", "Unknown") if team_data else "Unknown"
+                team_name = team_names[player_data.get("team", 0)]
                 
-                player = Player(
+                # Fields are composed from trusted FPL API data, so skip validation
+                player = Player.model_construct(
                     id=player_data.get("id", 0),
                     name=f"{player_data.get('first_name', '')} {player_data.get('second_name', '')}",
                     team=team_name,
@@ -113,7 +154,8 @@ async def get_transfer_targets(
                     yellow_cards=player_data.get("yellow_cards", 0),
                     red_cards=player_data.get("red_cards", 0),
                     saves=player_data.get("saves", 0),
-                    bonus=player_data.get("bonus", 0)
+                    bonus=player_data.get("bonus", 0),
+                    status=player_data.get("status", "a")
                 )
                 all_targets.append(player)
         
@@ -124,20 +166,87 @@ async def get_transfer_targets(
         return []
 
 
-async def get_transfer_recommendations(
-    team_id: int, 
-    budget: float, 
-    free_transfers: int, 
-    subscription_tier: Optional[str] = "basic"
+def _index_by_name(players: List[Player]) -> Dict[str, Player]:
+    """
+    Index players by name, keeping the first player when names are duplicated
+    """
+    index = {}  # type: Dict[str, Player]
+    for player in players:
+        index.setdefault(player.name, player)
+    return index
+
+
+def format_transfer_recommendations(
+    recommendations_data: List[TransferRecommendationData],
+    current_team: List[Player],
+    potential_transfers: List[Player],
+    limit: int
 ) -> List[TransferRecommendation]:
     """
-    Get recommended transfers for a given FPL team
+    Convert model transfer records into TransferRecommendation objects
     
     Args:
-        team_id: FPL team ID
+        recommendations_data: Records returned by model.rank_transfers
+        current_team: Players that can be transferred out
+        potential_transfers: Players that can be transferred in
+        limit: Maximum number of recommendations to return
+        
+    Returns:
+        List of transfer recommendations whose players were both found
+    """
+    # Index players by name for O(1) lookups
+    team_idx = _index_by_name(current_team)
+    target_idx = _index_by_name(potential_transfers)
+    
+    recommendations = (
+        _format_transfer(rec_data, team_idx, target_idx) for rec_data in recommendations_data[:limit]
+    )
+    return [recommendation for recommendation in recommendations if recommendation]
+
+
+def _format_transfer(
+    rec_data: TransferRecommendationData,
+    team_idx: Dict[str, Player],
+    target_idx: Dict[str, Player]
+) -> Optional[TransferRecommendation]:
+    """
+    Convert one model transfer record into a TransferRecommendation
+    
+    Args:
+        rec_data: Record returned by the model
+        team_idx: Players that can be transferred out, by name
+        target_idx: Players that can be transferred in, by name
+        
+    Returns:
+        TransferRecommendation, or None if either player was not found
+    """
+    player_out = team_idx.get(rec_data.get("player_out", ""))
+    player_in = target_idx.get(rec_data.get("player_in", ""))
+    if not (player_out and player_in):
+        return None
+    
+    return TransferRecommendation(
+        player_out=player_out,
+        player_in=player_in,
+        reasoning=rec_data.get("reasoning", "Better overall performance expected."),
+        expected_point_impact=rec_data.get("expected_point_impact", 0.0)
+    )
+
+
+async def _recommend_transfers(
+    players: List[Player],
+    budget: float,
+    subscription_tier: Optional[str],
+    recommendations_label: str
+) -> List[TransferRecommendation]:
+    """
+    Rank transfers for a list of players with the tier's model
+    
+    Args:
+        players: Current team players
         budget: Available budget for transfers
-        free_transfers: Number of free transfers available
         subscription_tier: User subscription tier (basic, premium, elite)
+        recommendations_label: Recommendation description used in error logs
         
     Returns:
         List of recommended transfers
@@ -150,58 +259,54 @@ async def get_transfer_recommendations(
     gameweek_id = gameweek_info["id"]
     
     # Get tier configuration
-    tier_config = config.settings.SUBSCRIPTION_TIERS.get(
-        subscription_tier or "basic", 
-        config.settings.SUBSCRIPTION_TIERS["basic"]
-    )
-    recommendations_limit = tier_config.get("recommendations_limit", 3)
+    recommendations_limit = config.get_tier_limits(subscription_tier).recommendations_limit
     
     try:
-        # Get team players data
-        team_players = await get_team_players(team_id)
-        
         # Get potential transfer targets
         potential_transfers = await get_transfer_targets(
-            team_players, 
+            players, 
             budget=budget,
             limit=recommendations_limit*5  # Get more candidates than needed for filtering
         )
         
-        # Use the model to rank transfers
-        recommendations_data = await model.rank_transfers(
-            current_team=team_players,
-            potential_transfers=potential_transfers, 
-            gameweek=gameweek_id
+        # Use the model to rank transfers (coalesced with concurrent requests when the model supports it)
+        recommendations_data = await call_batched(
+            model, "rank_transfers", players, potential_transfers, gameweek_id
         )
         
-        # Format results according to schema
-        recommendations = []
-        for rec_data in recommendations_data[:recommendations_limit]:
-            # Find player objects by name
-            player_out_name = rec_data.get("player_out", "")
-            player_in_name = rec_data.get("player_in", "")
-            
-            player_out = next((p for p in team_players if p.name == player_out_name), None)
-            player_in = next((p for p in potential_transfers if p.name == player_in_name), None)
-            
-            if player_out and player_in:
-                recommendations.append(
-                    TransferRecommendation(
-                        player_out=player_out,
-                        player_in=player_in,
-                        reasoning=rec_data.get("reasoning", "Better overall performance expected."),
-                        expected_point_impact=rec_data.get("expected_point_impact", 0.0)
-                    )
-                )
-        
-        return recommendations
+        return format_transfer_recommendations(
+            recommendations_data, players, potential_transfers, recommendations_limit
+        )
     
     except Exception as e:
-        logger.error(f"Error generating transfer recommendations: {str(e)}")
+        logger.error(f"Error generating {recommendations_label}: {str(e)}")
         # Return empty list in case of error
         return []
 
 
+async def get_transfer_recommendations(
+    team_id: int, 
+    budget: float, 
+    free_transfers: int, 
+    subscription_tier: Optional[str] = "basic"
+) -> List[TransferRecommendation]:
+    """
+    Get recommended transfers for a given FPL team
+    
+    Args:
+        team_id: FPL team ID
+        budget: Available budget for transfers
+        free_transfers: Number of free transfers available
+        subscription_tier: User subscription tier (basic, premium, elite)
+        
+    Returns:
+        List of recommended transfers
+    """
+    # Get team players data
+    team_players = await get_team_players(team_id)
+    return await _recommend_transfers(team_players, budget, subscription_tier, "transfer recommendations")
+
+
 async def get_custom_recommendations(
     team: Team, 
     free_transfers: int, 
@@ -218,6 +323,40 @@ async def get_custom_recommendations(
     Returns:
         List of recommended transfers
     """
+    return await _recommend_transfers(
+        team.players, team.remaining_budget, subscription_tier, "custom recommendations"
+    )
+
+
+async def _iterate(records: Iterable[TransferRecommendationData]) -> AsyncIterator[TransferRecommendationData]:
+    """
+    Adapt a list of records to the async iterator interface of rank_transfers_stream
+    """
+    for record in records:
+        yield record
+
+
+async def stream_transfer_recommendations(
+    team_id: int, 
+    budget: float, 
+    free_transfers: int, 
+    subscription_tier: Optional[str] = "basic"
+) -> AsyncIterator[TransferRecommendation]:
+    """
+    Stream recommended transfers for a given FPL team as the model produces them
+    
+    Uses the model's optional rank_transfers_stream async generator when available,
+    otherwise yields the results of rank_transfers one by one.
+    
+    Args:
+        team_id: FPL team ID
+        budget: Available budget for transfers
+        free_transfers: Number of free transfers available
+        subscription_tier: User subscription tier (basic, premium, elite)
+        
+    Yields:
+        Recommended transfers, in ranked order
+    """
     # Get AI model for the subscription tier
     model = get_model_for_tier(subscription_tier or "basic")
     
@@ -226,50 +365,45 @@ async def get_custom_recommendations(
     gameweek_id = gameweek_info["id"]
     
     # Get tier configuration
-    tier_config = config.settings.SUBSCRIPTION_TIERS.get(
-        subscription_tier or "basic", 
-        config.settings.SUBSCRIPTION_TIERS["basic"]
-    )
-    recommendations_limit = tier_config.get("recommendations_limit", 3)
+    recommendations_limit = config.get_tier_limits(subscription_tier).recommendations_limit
     
     try:
+        team_players = await get_team_players(team_id)
+        
         # Get potential transfer targets
         potential_transfers = await get_transfer_targets(
-            team.players, 
-            budget=team.remaining_budget,
+            team_players, 
+            budget=budget,
             limit=recommendations_limit*5  # Get more candidates than needed for filtering
         )
         
-        # Use the model to rank transfers
-        recommendations_data = await model.rank_transfers(
-            current_team=team.players,
-            potential_transfers=potential_transfers, 
-            gameweek=gameweek_id
-        )
+        # Index players by name for O(1) lookups
+        team_idx = _index_by_name(team_players)
+        target_idx = _index_by_name(potential_transfers)
         
-        # Format results according to schema
-        recommendations = []
-        for rec_data in recommendations_data[:recommendations_limit]:
-            # Find player objects by name
-            player_out_name = rec_data.get("player_out", "")
-            player_in_name = rec_data.get("player_in", "")
-            
-            player_out = next((p for p in team.players if p.name == player_out_name), None)
-            player_in = next((p for p in potential_transfers if p.name == player_in_name), None)
-            
-            if player_out and player_in:
-                recommendations.append(
-                    TransferRecommendation(
-                        player_out=player_out,
-                        player_in=player_in,
-                        reasoning=rec_data.get("reasoning", "Better overall performance expected."),
-                        expected_point_impact=rec_data.get("expected_point_impact", 0.0)
-                    )
-                )
+        rank_transfers_stream = getattr(model, "rank_transfers_stream", None)
+        if rank_transfers_stream is not None:
+            records = rank_transfers_stream(
+                current_team=team_players,
+                potential_transfers=potential_transfers, 
+                gameweek=gameweek_id
+            )
+        else:
+            records = _iterate(await model.rank_transfers(
+                current_team=team_players,
+                potential_transfers=potential_transfers, 
+                gameweek=gameweek_id
+            ))
         
-        return recommendations
+        # Format and emit each record as it arrives, up to the tier limit
+        consumed = 0
+        async for rec_data in records:
+            recommendation = _format_transfer(rec_data, team_idx, target_idx)
+            if recommendation:
+                yield recommendation
+            consumed += 1
+            if consumed >= recommendations_limit:
+                break
     
     except Exception as e:
-        logger.error(f"Error generating custom recommendations: {str(e)}")
-        # Return empty list in case of error
-        return []
+        logger.error(f"Error streaming transfer recommendations: {str(e)}")
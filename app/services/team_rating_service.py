@@ -1,10 +1,204 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
+from collections import Counter
+import numpy as np
 from app.schemas.fpl import Team, Player
-from app.utils.fpl_data import get_player_fixture_difficulty
+from app.utils.fpl_data import get_next_fixture_difficulties
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Integer codes for squad positions; anything else maps to UNKNOWN_POSITION
+POSITION_CODES = {"GK": 0, "DEF": 1, "MID": 2, "FWD": 3}
+UNKNOWN_POSITION = len(POSITION_CODES)
+
+# Player statuses that count as available (a = available, d = doubtful)
+_AVAILABLE_STATUS = frozenset(("a", "d"))
+
+# Minimum squad depth per position code (GK, DEF, MID, FWD)
+MIN_POSITION_COUNTS = np.array([2, 4, 4, 2])
+
+# Bit flags returned by score_squad, mapped to suggestions in flag order
+FLAG_SUGGESTIONS = (
+    "Add a backup goalkeeper.",
+    "Increase defensive depth.",
+    "Increase midfield depth.",
+    "Increase forward depth.",
+    "Too many players with difficult fixtures.",
+    "Consider upgrading to higher-value players.",
+)
+FLAG_HARD_FIXTURES = 1 << 4
+FLAG_LOW_VALUE = 1 << 5
+
+# Most players a squad should hold from any one club
+MAX_PLAYERS_PER_CLUB = 3
+
+
+def score_squad(
+    positions: np.ndarray,
+    prices: np.ndarray,
+    available: np.ndarray,
+    difficulties: np.ndarray,
+    club_counts: np.ndarray
+) -> Tuple[int, int]:
+    """
+    Score a squad from its attribute arrays
+    
+    Args:
+        positions: Position code per player
+        prices: Price per player
+        available: Whether each player is available (status "a" or "d")
+        difficulties: Next fixture difficulty per player
+        club_counts: Number of squad players from each club
+        
+    Returns:
+        Tuple of (score, bitmask of FLAG_SUGGESTIONS that apply)
+    """
+    score = 100
+    
+    # 1. Balance: one flag bit per position below its minimum depth
+    pos_counts = np.bincount(positions, minlength=UNKNOWN_POSITION + 1)[:UNKNOWN_POSITION]
+    short = pos_counts < MIN_POSITION_COUNTS
+    flags = int(np.dot(short, 1 << np.arange(UNKNOWN_POSITION)))
+    score -= 10 * int(short.sum())
+    
+    # 2. Injuries: Penalize for injured/unavailable players
+    score -= 5 * int(np.count_nonzero(~available))
+    
+    # 3. Fixtures: Penalize for too many players with hard fixtures
+    if np.count_nonzero(difficulties >= 4) > 6:
+        score -= 15
+        flags |= FLAG_HARD_FIXTURES
+    
+    # 4. Value: Basic value assessment
+    if prices.sum() < 90:  # Team too cheap
+        score -= 10
+        flags |= FLAG_LOW_VALUE
+    
+    # 5. Coverage: Penalize each club with too many players
+    score -= 5 * int(np.count_nonzero(club_counts > MAX_PLAYERS_PER_CLUB))
+    
+    return max(0, min(100, score)), flags
+
+
+def score_squads(
+    positions: np.ndarray,
+    prices: np.ndarray,
+    available: np.ndarray,
+    difficulties: np.ndarray,
+    club_counts: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Score many squads at once from padded 2-D attribute arrays (one row per squad)
+    
+    Padding slots must hold UNKNOWN_POSITION, price 0, available True,
+    difficulty 0 and club count 0 so they never affect the score.
+    
+    Args:
+        positions: Position codes, shape (squads, players)
+        prices: Prices, shape (squads, players)
+        available: Availability mask, shape (squads, players)
+        difficulties: Next fixture difficulties, shape (squads, players)
+        club_counts: Players per club, shape (squads, clubs)
+        
+    Returns:
+        Tuple of (scores, bitmasks of FLAG_SUGGESTIONS), one entry per squad
+    """
+    # 1. Balance
+    pos_counts = (positions[:, :, None] == np.arange(UNKNOWN_POSITION)).sum(axis=1)
+    short = pos_counts < MIN_POSITION_COUNTS
+    flags = short @ (1 << np.arange(UNKNOWN_POSITION))
+    scores = 100 - 10 * short.sum(axis=1)
+    
+    # 2. Injuries
+    scores -= 5 * np.count_nonzero(~available, axis=1)
+    
+    # 3. Fixtures
+    hard_fixtures = np.count_nonzero(difficulties >= 4, axis=1) > 6
+    scores -= 15 * hard_fixtures
+    flags |= FLAG_HARD_FIXTURES * hard_fixtures
+    
+    # 4. Value
+    low_value = prices.sum(axis=1) < 90
+    scores -= 10 * low_value
+    flags |= FLAG_LOW_VALUE * low_value
+    
+    # 5. Coverage
+    scores -= 5 * np.count_nonzero(club_counts > MAX_PLAYERS_PER_CLUB, axis=1)
+    
+    return np.clip(scores, 0, 100), flags
+
+
+def squad_arrays(
+    players: List[Player],
+    difficulty_by_id: Dict[int, float]
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Gather the squad attributes used for scoring into arrays in one pass
+    
+    Args:
+        players: Squad players
+        difficulty_by_id: Next fixture difficulty per player ID
+        
+    Returns:
+        Tuple of (positions, prices, available, difficulties) arrays
+    """
+    num_players = len(players)
+    positions = np.fromiter(
+        (POSITION_CODES.get(p.position, UNKNOWN_POSITION) for p in players),
+        dtype=np.int8, count=num_players
+    )
+    prices = np.fromiter((p.price for p in players), dtype=np.float32, count=num_players)
+    available = np.fromiter(
+        (p.status in _AVAILABLE_STATUS for p in players),
+        dtype=bool, count=num_players
+    )
+    difficulties = np.fromiter(
+        (difficulty_by_id.get(p.id, 3.0) for p in players),
+        dtype=np.float32, count=num_players
+    )
+    return positions, prices, available, difficulties
+
+
+def build_rating(
+    players: List[Player],
+    score: int,
+    flags: int,
+    available: np.ndarray,
+    club_counts: Counter
+) -> Dict[str, Any]:
+    """
+    Build the rating response for a scored squad
+    
+    Args:
+        players: Squad players
+        score: Squad score
+        flags: Bitmask of FLAG_SUGGESTIONS that apply
+        available: Availability mask per player
+        club_counts: Number of squad players per club
+        
+    Returns:
+        Dict with score, suggestions and rating
+    """
+    # Map the flags back to suggestions, keeping the original order
+    suggestions = [text for bit, text in enumerate(FLAG_SUGGESTIONS[:UNKNOWN_POSITION]) if flags & (1 << bit)]
+    suggestions.extend(
+        f"Replace injured/unavailable player: {players[i].name}" for i in np.flatnonzero(~available)
+    )
+    suggestions.extend(
+        text for bit, text in enumerate(FLAG_SUGGESTIONS) if bit >= UNKNOWN_POSITION and flags & (1 << bit)
+    )
+    suggestions.extend(
+        f"Too many players from {club} (>{count})."
+        for club, count in club_counts.items() if count > MAX_PLAYERS_PER_CLUB
+    )
+
+    return {
+        "score": score,
+        "suggestions": suggestions,
+        "rating": "Excellent" if score >= 90 else "Good" if score >= 70 else "Needs Improvement"
+    }
+
+
 async def rate_team(team: Team, gameweek: int) -> Dict[str, Any]:
     """
     Rate a team (0-100) based on balance, injuries, fixtures, and coverage.
@@ -17,80 +211,68 @@ async def rate_team(team: Team, gameweek: int) -> Dict[str, Any]:
     """
     try:
         players = team.players
-        score = 100
-        suggestions = []
-
-        # 1. Balance: Check for at least 2 GKs, 5 DEFs, 5 MIDs, 3 FWDs
-        pos_counts = {"GK": 0, "DEF": 0, "MID": 0, "FWD": 0}
-        for p in players:
-            pos_counts[p.position] = pos_counts.get(p.position, 0) + 1
-        if pos_counts["GK"] < 2:
-            score -= 10
-            suggestions.append("Add a backup goalkeeper.")
-        if pos_counts["DEF"] < 4:
-            score -= 10
-            suggestions.append("Increase defensive depth.")
-        if pos_counts["MID"] < 4:
-            score -= 10
-            suggestions.append("Increase midfield depth.")
-        if pos_counts["FWD"] < 2:
-            score -= 10
-            suggestions.append("Increase forward depth.")
-
-        # 2. Injuries: Penalize for injured/unavailable players
-        for p in players:
-            if getattr(p, "status", "a") not in ("a", "d"):
-                score -= 5
-                suggestions.append(f"Replace injured/unavailable player: {p.name}")
-
-        # 3. Fixtures: Penalize for too many players with hard fixtures
-        hard_fixture_count = 0
-        for p in players:
-            try:
-                fixtures = await get_player_fixture_difficulty(p.id, next_n=1)
-                avg_diff = fixtures[0]["difficulty"] if fixtures else 3.0
-            except:
-                avg_diff = 3.0
-            if avg_diff >= 4:
-                hard_fixture_count += 1
-        
-        if hard_fixture_count > 6:
-            score -= 15
-            suggestions.append("Too many players with difficult fixtures.")
-
-        # 4. Value: Basic value assessment
-        total_value = sum(p.price for p in players)
-        if total_value < 90:  # Team too cheap
-            score -= 10
-            suggestions.append("Consider upgrading to higher-value players.")
-
-        return {
-            "score": max(0, score),
-            "suggestions": suggestions,
-            "rating": "Excellent" if score >= 90 else "Good" if score >= 70 else "Needs Improvement"
-        }
+        difficulty_by_id = await get_next_fixture_difficulties([p.id for p in players])
+        positions, prices, available, difficulties = squad_arrays(players, difficulty_by_id)
+        club_counts = Counter(p.team for p in players)
+
+        score, flags = score_squad(
+            positions, prices, available, difficulties,
+            np.fromiter(club_counts.values(), dtype=np.int16, count=len(club_counts))
+        )
+        return build_rating(players, score, flags, available, club_counts)
     
     except Exception as e:
         logger.error(f"Error in rate_team: {e}")
         # Use mock service as fallback
         from app.services.mock_service import mock_team_rating
         return await mock_team_rating(team, gameweek)
-    if hard_fixture_count > 4:
-        score -= 10
-        suggestions.append("Too many players with tough upcoming fixtures.")
-
-    # 4. Coverage: Penalize if too many players from one team
-    team_counts = {}
-    for p in players:
-        team_counts[p.team] = team_counts.get(p.team, 0) + 1
-    for t, count in team_counts.items():
-        if count > 3:
-            score -= 5
-            suggestions.append(f"Too many players from {t} (>{count}).")
-
-    # Clamp score
-    score = max(0, min(100, score))
-    result: Dict[str, Any] = {"score": score}
-    if score < 70:
-        result["suggestions"] = suggestions
-    return result
+
+
+async def rate_teams_batch(teams: List[Team], gameweek: int) -> List[Dict[str, Any]]:
+    """
+    Rate many teams (e.g. a league) in one vectorized pass
+    Args:
+        teams: Team schemas
+        gameweek: Target gameweek
+    Returns:
+        List of rating dicts, one per team, as returned by rate_team
+    """
+    try:
+        # Look up each distinct player's next fixture once across all teams
+        player_ids = list({p.id for team in teams for p in team.players})
+        difficulty_by_id = await get_next_fixture_difficulties(player_ids)
+
+        # Stack the squads into padded 2-D arrays
+        num_teams = len(teams)
+        width = max((len(team.players) for team in teams), default=0)
+        all_club_counts = [Counter(p.team for p in team.players) for team in teams]
+        num_clubs = max((len(club_counts) for club_counts in all_club_counts), default=0)
+
+        positions = np.full((num_teams, width), UNKNOWN_POSITION, dtype=np.int8)
+        prices = np.zeros((num_teams, width), dtype=np.float32)
+        available = np.ones((num_teams, width), dtype=bool)
+        difficulties = np.zeros((num_teams, width), dtype=np.float32)
+        club_matrix = np.zeros((num_teams, num_clubs), dtype=np.int16)
+
+        for i, (team, club_counts) in enumerate(zip(teams, all_club_counts)):
+            size = len(team.players)
+            (
+                positions[i, :size], prices[i, :size], available[i, :size], difficulties[i, :size]
+            ) = squad_arrays(team.players, difficulty_by_id)
+            club_matrix[i, :len(club_counts)] = list(club_counts.values())
+
+        scores, flags = score_squads(positions, prices, available, difficulties, club_matrix)
+
+        return [
+            build_rating(
+                team.players, int(scores[i]), int(flags[i]),
+                available[i, :len(team.players)], all_club_counts[i]
+            )
+            for i, team in enumerate(teams)
+        ]
+
+    except Exception as e:
+        logger.error(f"Error in rate_teams_batch: {e}")
+        # Use mock service as fallback
+        from app.services.mock_service import mock_team_rating
+        return [await mock_team_rating(team, gameweek) for team in teams]
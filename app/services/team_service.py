@@ -2,24 +2,28 @@ from typing import Optional, List, Dict, Any
 from app.schemas.fpl import TeamScore, Team, Player
 from app.models.prediction import get_model_for_tier
 from app.utils import fpl_data, config
+from app.services.batcher import call_batched
+from app.services.recommendation_service import get_team_players
 import logging
 
 # Configure logger
 logger = logging.getLogger(__name__)
 
 
-async def get_team_score(
-    team_id: int, 
-    gameweek: int, 
-    subscription_tier: Optional[str] = "basic"
+async def _evaluate_team(
+    players: List[Player],
+    gameweek: int,
+    subscription_tier: Optional[str],
+    team_label: str
 ) -> TeamScore:
     """
-    Get evaluation score and optimization suggestions for a given FPL team
+    Evaluate a list of players with the tier's model
     
     Args:
-        team_id: FPL team ID
-        gameweek: Gameweek number
+        players: Players to evaluate
+        gameweek: Gameweek number (<= 0 for the current gameweek)
         subscription_tier: User subscription tier (basic, premium, elite)
+        team_label: Team description used in error logs
         
     Returns:
         Team score and evaluation
@@ -33,13 +37,8 @@ async def get_team_score(
         gameweek = current_gw["id"]
     
     try:
-        # Get team players - in a real implementation, you would get actual team data
-        # For now, using the helper function from recommendation service
-        from app.services.recommendation_service import get_team_players
-        team_players = await get_team_players(team_id)
-        
         # Use the model to evaluate the team
-        evaluation = await model.evaluate_team(team_players, gameweek)
+        evaluation = await call_batched(model, "evaluate_team", players, gameweek)
         
         # Format results according to schema
         return TeamScore(
@@ -50,7 +49,7 @@ async def get_team_score(
         )
     
     except Exception as e:
-        logger.error(f"Error evaluating team: {str(e)}")
+        logger.error(f"Error evaluating {team_label}: {str(e)}")
         # Return default values in case of error
         return TeamScore(
             total_score=0.0,
@@ -60,6 +59,28 @@ async def get_team_score(
         )
 
 
+async def get_team_score(
+    team_id: int, 
+    gameweek: int, 
+    subscription_tier: Optional[str] = "basic"
+) -> TeamScore:
+    """
+    Get evaluation score and optimization suggestions for a given FPL team
+    
+    Args:
+        team_id: FPL team ID
+        gameweek: Gameweek number
+        subscription_tier: User subscription tier (basic, premium, elite)
+        
+    Returns:
+        Team score and evaluation
+    """
+    # Get team players - in a real implementation, you would get actual team data
+    # For now, using the helper function from recommendation service
+    team_players = await get_team_players(team_id)
+    return await _evaluate_team(team_players, gameweek, subscription_tier, "team")
+
+
 async def get_custom_team_score(
     team: Team, 
     gameweek: int, 
@@ -76,32 +97,4 @@ async def get_custom_team_score(
     Returns:
         Team score and evaluation
     """
-    # Get AI model for the subscription tier
-    model = get_model_for_tier(subscription_tier or "basic")
-    
-    # Get current gameweek if not specified
-    if gameweek <= 0:
-        current_gw = await fpl_data.get_current_gameweek()
-        gameweek = current_gw["id"]
-    
-    try:
-        # Use the model to evaluate the team
-        evaluation = await model.evaluate_team(team.players, gameweek)
-        
-        # Format results according to schema
-        return TeamScore(
-            total_score=evaluation.get("total_score", 0.0),
-            areas_of_strength=evaluation.get("areas_of_strength", []),
-            areas_for_improvement=evaluation.get("areas_for_improvement", []),
-            optimization_tips=evaluation.get("optimization_tips", [])
-        )
-    
-    except Exception as e:
-        logger.error(f"Error evaluating custom team: {str(e)}")
-        # Return default values in case of error
-        return TeamScore(
-            total_score=0.0,
-            areas_of_strength=[],
-            areas_for_improvement=["Unable to evaluate team due to an error."],
-            optimization_tips=["Try again later."]
-        )
+    return await _evaluate_team(team.players, gameweek, subscription_tier, "custom team")
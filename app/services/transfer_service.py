@@ -1,11 +1,26 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
+import asyncio
+import heapq
 from app.schemas.fpl import Team, Player
 from app.models.model_selector import predict_transfer_for_subscription
-from app.utils.fpl_data import get_player_fixture_difficulty
+from app.utils.fpl_data import get_next_fixture_difficulties
 import logging
 
 logger = logging.getLogger(__name__)
 
+
+def _suggestion_rank(suggestion: Dict[str, Any]) -> Tuple[float, float, float]:
+    """
+    Sort key for transfer suggestions: highest predicted impact, then best form, then easiest fixture
+    """
+    player_in = suggestion['player_in']
+    return (
+        -suggestion.get('predicted_impact', 0),
+        -player_in.get('form', 0),
+        player_in.get('avg_fixture_difficulty', 3.0)
+    )
+
+
 async def suggest_transfers(
     team: Team,
     budget: float,
@@ -26,37 +41,34 @@ async def suggest_transfers(
         List of top transfer suggestions
     """
     try:
-        current_players = [player.dict() for player in team.players]
         # Build a pool of potential transfers (all players not in team, within budget)
         from app.utils.fpl_data import get_all_players
         all_players = await get_all_players()
-        current_ids = {p['id'] for p in current_players}
+        current_ids = team.player_ids
         
         # Only consider players not already in team and affordable
-        potential_transfers = []
-        for player in all_players:
-            if player['id'] in current_ids:
-                continue
-            if player['now_cost'] / 10.0 > budget:
-                continue
-            # Add fixture difficulty for next GW
-            try:
-                fixtures = await get_player_fixture_difficulty(player['id'], next_n=1)
-                player['avg_fixture_difficulty'] = fixtures[0]['difficulty'] if fixtures else 3.0
-            except:
-                player['avg_fixture_difficulty'] = 3.0
-            potential_transfers.append(player)
+        candidates = [
+            player for player in all_players
+            if player['id'] not in current_ids and player['now_cost'] / 10.0 <= budget
+        ]
+        
+        # Add fixture difficulty for next GW, looked up for all candidates concurrently
+        difficulty_by_id = await get_next_fixture_difficulties([player['id'] for player in candidates])
+        potential_transfers = [
+            {**player, 'avg_fixture_difficulty': difficulty_by_id[player['id']]}
+            for player in candidates
+        ]
         
         # Try to use AI model to evaluate transfers
         try:
-            suggestions = predict_transfer_for_subscription(current_players, potential_transfers, subscription_tier)
-            # Filter and sort by predicted impact, form, and fixture
-            suggestions = sorted(suggestions, key=lambda x: (
-                -x.get('predicted_impact', 0),
-                -x['player_in'].get('form', 0),
-                x['player_in'].get('avg_fixture_difficulty', 3.0)
-            ))
-            return suggestions[:max_suggestions]
+            # Only the model needs full player dicts, so the fallback path never builds them
+            current_players = [player.model_dump() for player in team.players]
+            # Run the blocking model inference in a worker thread so the event loop stays free
+            suggestions = await asyncio.to_thread(
+                predict_transfer_for_subscription, current_players, potential_transfers, subscription_tier
+            )
+            # Select the top suggestions by predicted impact, form, and fixture
+            return heapq.nsmallest(max_suggestions, suggestions, key=_suggestion_rank)
         except Exception as model_error:
             logger.warning(f"ML model not available, using fallback: {model_error}")
             # Use mock service as fallback
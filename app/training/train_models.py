@@ -21,6 +21,8 @@ from typing import Dict, List, Any, Optional, Tuple
 from pathlib import Path
 from datetime import datetime
 import argparse
+from functools import lru_cache
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 
 from app.models.ml_models import (
     PointsPredictor,
@@ -30,167 +32,380 @@ from app.models.ml_models import (
 )
 
 from app.data_processing.training_data import (
+    PLAYER_FEATURE_SCHEMA,
     prepare_training_data,
     generate_position_specific_datasets,
     normalize_features
 )
+from app.utils.http_client import install_uvloop
 
 # Configure logger
 logger = logging.getLogger(__name__)
 
+# Positions as a fixed categorical, which makes position groupbys cheap
+POSITION_DTYPE = pd.CategoricalDtype(["GK", "DEF", "MID", "FWD"])
 
-async def prepare_prediction_dataset(base_dataset_path: str, weeks_to_predict: int = 5) -> pd.DataFrame:
+# Background writer for trained models, so a save overlaps the next fit
+_save_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="model-save")
+
+
+def save_in_background(model: Any) -> Future:
+    """
+    Schedule model.save() on the background save executor
+    
+    Args:
+        model: Trained model exposing a save() method
+        
+    Returns:
+        Future for the save
+    """
+    return _save_executor.submit(model.save)
+
+
+def wait_for_saves(futures: List[Future]) -> None:
+    """
+    Block until all scheduled saves finish, re-raising the first failure
+    
+    Args:
+        futures: Futures returned by save_in_background
+    """
+    for future in futures:
+        future.result()
+
+
+def read_training_dataset(dataset_path: str) -> pd.DataFrame:
+    """
+    Read a training dataset CSV with its known column dtypes
+    
+    Args:
+        dataset_path: Path to a dataset written by app.data_processing.training_data
+        
+    Returns:
+        DataFrame with compact numeric dtypes (when the values fit them) and a categorical position column
+    """
+    try:
+        return pd.read_csv(dataset_path, dtype={**PLAYER_FEATURE_SCHEMA, "position": POSITION_DTYPE})
+    except ValueError:
+        # Fall back to inference when a column holds gaps or floats (older or normalized datasets)
+        logger.debug(f"Dataset {dataset_path} does not match the compact schema, inferring dtypes")
+        return pd.read_csv(dataset_path, dtype={"position": POSITION_DTYPE})
+
+
+async def prepare_prediction_dataset(
+    base_dataset_path: str,
+    weeks_to_predict: int = 5,
+    seed: Optional[int] = 42
+) -> pd.DataFrame:
     """
     Prepare dataset for training prediction models
     
     Args:
         base_dataset_path: Path to base FPL training dataset
         weeks_to_predict: Number of future gameweeks to include
+        seed: Seed for the simulated target variance (None for a fresh draw)
         
     Returns:
         DataFrame ready for model training
     """
+    return load_prediction_dataset(base_dataset_path, weeks_to_predict, seed)
+
+
+def load_prediction_dataset(
+    base_dataset_path: str,
+    weeks_to_predict: int = 5,
+    seed: Optional[int] = 42
+) -> pd.DataFrame:
+    """
+    Prepare dataset for training prediction models, reusing the prepared frame while the file is unchanged
+    
+    Args:
+        base_dataset_path: Path to base FPL training dataset
+        weeks_to_predict: Number of future gameweeks to include
+        seed: Seed for the simulated target variance (None for a fresh draw)
+        
+    Returns:
+        DataFrame ready for model training (a copy callers may modify)
+    """
+    if seed is None:
+        # Unseeded frames must not be served from the cache
+        return _build_prediction_dataset.__wrapped__(base_dataset_path, 0.0, weeks_to_predict, None)
+    mtime = os.path.getmtime(base_dataset_path)
+    return _build_prediction_dataset(base_dataset_path, mtime, weeks_to_predict, seed).copy()
+
+
+@lru_cache(maxsize=8)
+def _build_prediction_dataset(
+    base_dataset_path: str,
+    mtime: float,
+    weeks_to_predict: int,
+    seed: Optional[int]
+) -> pd.DataFrame:
+    """
+    Build the prediction dataset; cached on (path, modification time, weeks, seed)
+    """
     # Load base dataset
     logger.info(f"Loading base dataset from {base_dataset_path}")
-    df = pd.read_csv(base_dataset_path)
+    df = read_training_dataset(base_dataset_path)
     
     # Create columns to predict next gameweek points
     logger.info(f"Preparing prediction targets for {weeks_to_predict} future gameweeks")
     
-    # Since this is a new dataset creation, we'll simulate future points using
-    # a combination of form, fixture difficulty, and historical performance
-    # In a real implementation, you would use actual historical data across gameweeks
-    
-    # Calculate baseline expected points using current points_per_game
-    df['next_gw_points'] = df['points_per_game']
+    next_gw_points = simulate_next_gw_points(df)
+    df['next_gw_points'] = next_gw_points
     
-    # Adjust based on form (positive form increases expected points)
-    form_factor = 0.2  # Weight for form adjustment
-    df['next_gw_points'] = df['next_gw_points'] + (df['form'] - df['points_per_game']) * form_factor
+    # For captain points, we'll simulate higher variance and higher ceiling:
+    # double points for captain plus random variance to make the model less deterministic
+    rng = np.random.default_rng(seed)  # Local generator; seeded for reproducibility
+    captain_points = rng.normal(0.0, 1.0, size=len(df))
+    captain_points *= next_gw_points
+    captain_points *= 0.3
+    captain_points += next_gw_points
+    captain_points += next_gw_points
+    np.maximum(captain_points, 0, out=captain_points)
+    df['captain_points'] = captain_points
     
-    # Adjust based on fixture difficulty (higher difficulty decreases expected points)
-    fixture_factor = 0.15  # Weight for fixture adjustment
-    df['next_gw_points'] = df['next_gw_points'] - (df['avg_fixture_difficulty'] - 2.5) * fixture_factor
+    logger.info(f"Dataset prepared with {len(df)} player records")
+    return df
+
+
+def simulate_next_gw_points(df: pd.DataFrame) -> np.ndarray:
+    """
+    Simulate next gameweek points from form, fixture difficulty and points per game
     
-    # Ensure points are non-negative
-    df['next_gw_points'] = df['next_gw_points'].apply(lambda x: max(0, x))
+    Since this is a new dataset creation, we simulate future points using a combination
+    of form, fixture difficulty, and historical performance. In a real implementation,
+    you would use actual historical data across gameweeks.
     
-    # For captain points, we'll simulate higher variance and higher ceiling
-    df['captain_points'] = df['next_gw_points'] * 2  # Double points for captain
+    Args:
+        df: Training dataset with points_per_game, form and avg_fixture_difficulty
+        
+    Returns:
+        Non-negative expected points per player
+    """
+    # Calculate baseline expected points using current points_per_game, adjusted
+    # for form and fixture difficulty, reusing two buffers instead of temporaries
+    form_factor = 0.2  # Weight for form adjustment (positive form increases expected points)
+    fixture_factor = 0.15  # Weight for fixture adjustment (higher difficulty decreases expected points)
+    points_per_game = df['points_per_game'].to_numpy(dtype=np.float64)
+    next_gw_points = df['form'].to_numpy(dtype=np.float64, copy=True)
+    next_gw_points -= points_per_game
+    next_gw_points *= form_factor
+    next_gw_points += points_per_game
+    fixture_adjustment = df['avg_fixture_difficulty'].to_numpy(dtype=np.float64, copy=True)
+    fixture_adjustment -= 2.5
+    fixture_adjustment *= fixture_factor
+    next_gw_points -= fixture_adjustment
     
-    # Add random variance to make the model less deterministic
-    np.random.seed(42)  # For reproducibility
-    variance = np.random.normal(0, 1, size=len(df)) * (df['next_gw_points'] * 0.3)
-    df['captain_points'] = df['captain_points'] + variance
-    df['captain_points'] = df['captain_points'].apply(lambda x: max(0, x))
+    # Ensure points are non-negative
+    np.maximum(next_gw_points, 0, out=next_gw_points)
+    return next_gw_points
+
+
+def pair_points_delta(in_points: np.ndarray, out_points: np.ndarray, noise: np.ndarray) -> np.ndarray:
+    """
+    Compute simulated transfer point impacts in a single output buffer
     
-    logger.info(f"Dataset prepared with {len(df)} player records")
-    return df
+    Args:
+        in_points: Expected points of the incoming players
+        out_points: Expected points of the outgoing players
+        noise: Random variance per pair
+        
+    Returns:
+        Array of in_points - out_points + noise
+    """
+    delta = np.subtract(in_points, out_points, dtype=np.float64)
+    delta += noise
+    return delta
 
 
-async def prepare_transfer_dataset(base_dataset_path: str, num_pairs: int = 1000) -> pd.DataFrame:
+async def prepare_transfer_dataset(
+    base_dataset_path: str,
+    num_pairs: int = 1000,
+    seed: Optional[int] = 42
+) -> pd.DataFrame:
     """
     Prepare dataset for transfer recommendation models
     
     Args:
         base_dataset_path: Path to base FPL training dataset
         num_pairs: Number of player pairs to generate
+        seed: Seed for pair sampling and the impact variance (None for a fresh draw);
+            next_gw_points is never drawn from it, whether read from the dataset or simulated
         
     Returns:
         DataFrame with transfer features and impact
     """
-    # Load base dataset
+    # Load base dataset, keeping next gameweek points already in it (e.g. model predictions
+    # added by train_ml_models.py) and simulating them only when the column is missing
     logger.info(f"Loading base dataset from {base_dataset_path}")
-    df = pd.read_csv(base_dataset_path)
+    df = read_training_dataset(base_dataset_path)
+    if 'next_gw_points' not in df.columns:
+        df['next_gw_points'] = simulate_next_gw_points(df)
     
     # Generate player pairs for transfers (within same position)
     logger.info(f"Generating {num_pairs} player transfer pairs")
     
-    # Group players by position
-    grouped = df.groupby('position')
-    
-    transfer_rows = []
-    for position, group in grouped:
+    # Weight by squad composition: DEF/MID more than GK/FWD
+    position_weights = {
+        'GK': 0.1,
+        'DEF': 0.35,
+        'MID': 0.35,
+        'FWD': 0.2
+    }
+    rng = np.random.default_rng(seed)
+    
+    def column(group: pd.DataFrame, name: str) -> np.ndarray:
+        # Optional stat columns default to 0 when missing from the dataset
+        if name in group.columns:
+            return group[name].to_numpy()
+        return np.zeros(len(group))
+    
+    # Group on integer category codes rather than hashing position strings
+    if not isinstance(df['position'].dtype, pd.CategoricalDtype):
+        df['position'] = df['position'].astype(POSITION_DTYPE)
+    
+    # Size every output column up front from the per-position quotas
+    position_groups = []
+    for position, group in df.groupby('position', sort=False, observed=True):
         # Calculate how many pairs to generate for this position
-        # Weight by squad composition: DEF/MID more than GK/FWD
-        position_weights = {
-            'GK': 0.1,
-            'DEF': 0.35,
-            'MID': 0.35,
-            'FWD': 0.2
-        }
-        
-        position_pairs = int(num_pairs * position_weights.get(str(position), 0.25))
-        
-        # Generate random pairs
-        players = group.sample(n=min(len(group), position_pairs * 2), replace=True)
-        
-        # Create pairs
-        for i in range(0, min(len(players) - 1, position_pairs)):
-            player_out = players.iloc[i].copy()
-            player_in = players.iloc[i + 1].copy()
-            
-            # Skip if same player
-            if player_out['player_id'] == player_in['player_id']:
-                continue
-                
-            # Calculate point impact (simulate with adjusted next_gw_points difference)
-            # Add randomness to make the model less deterministic
-            raw_point_diff = player_in['next_gw_points'] - player_out['next_gw_points']
-            variance = np.random.normal(0, 1) * 2  # Random variance
-            point_impact = raw_point_diff + variance
-            
-            # Create transfer features
-            transfer_data = {
-                # IDs and names
-                'player_in_id': player_in['player_id'],
-                'player_out_id': player_out['player_id'],
-                'player_in_name': player_in['name'],
-                'player_out_name': player_out['name'],
-                'position': position,
-                
-                # Player in features
-                'player_in_form': player_in['form'],
-                'player_in_points_per_game': player_in['points_per_game'],
-                'player_in_minutes': player_in['minutes'],
-                'player_in_goals': player_in.get('goals_scored', 0),
-                'player_in_assists': player_in.get('assists', 0),
-                'player_in_clean_sheets': player_in.get('clean_sheets', 0),
-                'player_in_fixture_difficulty': player_in['avg_fixture_difficulty'],
-                'player_in_ict': player_in.get('ict_index', 0),
-                'player_in_bonus': player_in.get('bonus', 0),
-                'player_in_price': player_in['price'],
-                
-                # Player out features
-                'player_out_form': player_out['form'],
-                'player_out_points_per_game': player_out['points_per_game'],
-                'player_out_minutes': player_out['minutes'],
-                'player_out_goals': player_out.get('goals_scored', 0),
-                'player_out_assists': player_out.get('assists', 0),
-                'player_out_clean_sheets': player_out.get('clean_sheets', 0),
-                'player_out_fixture_difficulty': player_out['avg_fixture_difficulty'],
-                'player_out_ict': player_out.get('ict_index', 0),
-                'player_out_bonus': player_out.get('bonus', 0),
-                'player_out_price': player_out['price'],
-                
-                # Difference features
-                'form_diff': player_in['form'] - player_out['form'],
-                'price_diff': player_in['price'] - player_out['price'],
-                'fixture_diff': player_out['avg_fixture_difficulty'] - player_in['avg_fixture_difficulty'],
-                'team_strength_diff': player_in.get('team_strength', 0) - player_out.get('team_strength', 0),
-                
-                # Target
-                'points_delta': point_impact
-            }
-            
-            transfer_rows.append(transfer_data)
-    
-    # Create DataFrame
-    transfer_df = pd.DataFrame(transfer_rows)
+        position_pairs = int(num_pairs * position_weights.get(position, 0.25))
+        num_position_pairs = min(min(len(group), position_pairs * 2) - 1, position_pairs)
+        if num_position_pairs > 0:
+            position_groups.append((position, group, num_position_pairs))
+    if not position_groups:
+        return pd.DataFrame()
+    total = sum(num_position_pairs for _, _, num_position_pairs in position_groups)
+    
+    # Typed output columns, filled by slice at write cursor k
+    columns: Dict[str, np.ndarray] = {}
+    k = 0
+    
+    def write(name: str, values: np.ndarray) -> None:
+        if name not in columns:
+            columns[name] = np.empty(total, dtype=values.dtype)
+        columns[name][k:k + len(values)] = values
+    
+    for position, group, num_position_pairs in position_groups:
+        # Draw random player_out/player_in rows and drop pairs of the same player
+        idx_out = rng.integers(0, len(group), size=num_position_pairs)
+        idx_in = rng.integers(0, len(group), size=num_position_pairs)
+        player_ids = group['player_id'].to_numpy()
+        keep = player_ids[idx_in] != player_ids[idx_out]
+        idx_out = idx_out[keep]
+        idx_in = idx_in[keep]
+        n = len(idx_in)
+        
+        def pair(name: str) -> Tuple[np.ndarray, np.ndarray]:
+            values = column(group, name)
+            return values[idx_in], values[idx_out]
+        
+        in_form, out_form = pair('form')
+        in_price, out_price = pair('price')
+        in_fixture, out_fixture = pair('avg_fixture_difficulty')
+        in_strength, out_strength = pair('team_strength')
+        in_points, out_points = pair('next_gw_points')
+        in_names, out_names = pair('name')
+        
+        # Calculate point impact (simulate with adjusted next_gw_points difference)
+        # Add randomness to make the model less deterministic
+        variance = rng.normal(0, 2, size=n)
+        
+        # IDs and names
+        write('player_in_id', player_ids[idx_in])
+        write('player_out_id', player_ids[idx_out])
+        write('player_in_name', in_names)
+        write('player_out_name', out_names)
+        write('position', np.full(n, POSITION_DTYPE.categories.get_loc(position), dtype=np.int8))
+        
+        # Player in / player out features
+        for side, idx in (('player_in', idx_in), ('player_out', idx_out)):
+            for feature, source in (
+                ('form', 'form'),
+                ('points_per_game', 'points_per_game'),
+                ('minutes', 'minutes'),
+                ('goals', 'goals_scored'),
+                ('assists', 'assists'),
+                ('clean_sheets', 'clean_sheets'),
+                ('fixture_difficulty', 'avg_fixture_difficulty'),
+                ('ict', 'ict_index'),
+                ('bonus', 'bonus'),
+                ('price', 'price'),
+            ):
+                write(f'{side}_{feature}', column(group, source)[idx])
+        
+        # Difference features
+        write('form_diff', in_form - out_form)
+        write('price_diff', in_price - out_price)
+        write('fixture_diff', out_fixture - in_fixture)
+        write('team_strength_diff', in_strength - out_strength)
+        
+        # Target
+        write('points_delta', pair_points_delta(in_points, out_points, variance))
+        
+        k += n
+    
+    # Trim to the rows actually written and build the frame without type inference
+    transfer_data = {name: values[:k] for name, values in columns.items()}
+    transfer_data['position'] = pd.Categorical.from_codes(transfer_data['position'], dtype=POSITION_DTYPE)
+    transfer_df = pd.DataFrame(transfer_data, copy=False)
     logger.info(f"Transfer dataset prepared with {len(transfer_df)} transfer records")
     return transfer_df
 
 
+def latest_dataset(directory: str) -> Optional[str]:
+    """
+    Find the newest CSV dataset in a directory
+    
+    Args:
+        directory: Directory holding timestamped dataset files
+        
+    Returns:
+        Path to the dataset with the greatest filename, or None if there are none
+    """
+    latest = max((f for f in os.listdir(directory) if f.endswith('.csv')), default=None)
+    return os.path.join(directory, latest) if latest else None
+
+
+def _init_training_worker() -> None:
+    """
+    Limit native thread pools in training worker processes to avoid oversubscribing cores
+    """
+    for var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+        os.environ[var] = "1"
+
+
+def _train_position_model(
+    position: str,
+    model_type: str,
+    prediction_df: pd.DataFrame,
+    output_dir: str
+) -> Tuple[str, str, Dict[str, Any]]:
+    """
+    Train and save one position-specific points predictor (runs in a worker process)
+    
+    Args:
+        position: Position to train for
+        model_type: Model type to train
+        prediction_df: Prepared prediction dataset for the position
+        output_dir: Directory to save the trained model
+        
+    Returns:
+        Tuple of (position, model_type, metrics)
+    """
+    logger.info(f"Training {model_type} model for {position}")
+    
+    # Create and train points predictor
+    predictor = PointsPredictor(
+        model_type=model_type,
+        position=position,
+        model_dir=output_dir
+    )
+    
+    metrics_dict = predictor.train(prediction_df)
+    predictor.save()
+    return position, model_type, metrics_dict
+
+
 async def train_position_specific_models(base_dir: str, output_dir: str, model_types: List[str]) -> Dict[str, Any]:
     """
     Train position-specific prediction models
@@ -215,6 +430,8 @@ async def train_position_specific_models(base_dir: str, output_dir: str, model_t
     gbm_types = ["lgbm", "xgboost", "catboost", "tabnet"]
     all_types = list(model_types) + gbm_types
     
+    # Find the dataset for each position
+    position_datasets = {}
     for position in positions:
         position_dir = os.path.join(base_dir, position.lower())
         
@@ -223,38 +440,35 @@ async def train_position_specific_models(base_dir: str, output_dir: str, model_t
             logger.warning(f"Position directory {position_dir} not found, skipping")
             continue
         
-        # Get the latest dataset in the position directory
-        datasets = [f for f in os.listdir(position_dir) if f.endswith('.csv')]
-        if not datasets:
+        # Get the latest dataset in the position directory (filenames carry a timestamp)
+        dataset_path = latest_dataset(position_dir)
+        if dataset_path is None:
             logger.warning(f"No datasets found in {position_dir}, skipping")
             continue
-            
-        datasets.sort(reverse=True)  # Sort by filename (with timestamp) descending
-        dataset_path = os.path.join(position_dir, datasets[0])
         
         logger.info(f"Preparing prediction dataset for {position} from {dataset_path}")
-        prediction_df = await prepare_prediction_dataset(dataset_path)
-        
-        # Train models for each type
-        position_metrics = {}
-        
-        for model_type in all_types:
-            logger.info(f"Training {model_type} model for {position}")
-            
-            # Create and train points predictor
-            predictor = PointsPredictor(
-                model_type=model_type,
-                position=position,
-                model_dir=output_dir
-            )
-            
-            metrics_dict = predictor.train(prediction_df)
-            predictor.save()
-            
-            position_metrics[model_type] = metrics_dict
-            logger.info(f"{model_type} model for {position} - MAE: {metrics_dict['mae']:.4f}")
-        
-        metrics[position] = position_metrics
+        position_datasets[position] = await prepare_prediction_dataset(dataset_path)
+    
+    jobs = [
+        (position, model_type, prediction_df)
+        for position, prediction_df in position_datasets.items()
+        for model_type in all_types
+    ]
+    if not jobs:
+        return metrics
+    
+    # Train every position x model type combination in parallel worker processes
+    loop = asyncio.get_running_loop()
+    max_workers = min(len(jobs), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_training_worker) as executor:
+        results = await asyncio.gather(*(
+            loop.run_in_executor(executor, _train_position_model, position, model_type, prediction_df, output_dir)
+            for position, model_type, prediction_df in jobs
+        ))
+    
+    for position, model_type, metrics_dict in results:
+        metrics.setdefault(position, {})[model_type] = metrics_dict
+        logger.info(f"{model_type} model for {position} - MAE: {metrics_dict['mae']:.4f}")
     
     return metrics
 
@@ -276,20 +490,18 @@ async def train_captain_models(base_dir: str, output_dir: str, model_types: List
     
     # Find latest dataset in the main directory
     main_dir = os.path.join(base_dir, "main")
-    datasets = [f for f in os.listdir(main_dir) if f.endswith('.csv')]
+    dataset_path = latest_dataset(main_dir)
     
-    if not datasets:
+    if dataset_path is None:
         logger.warning(f"No datasets found in {main_dir}, skipping")
         return {}
     
-    datasets.sort(reverse=True)
-    dataset_path = os.path.join(main_dir, datasets[0])
-    
     logger.info(f"Preparing captain dataset from {dataset_path}")
     prediction_df = await prepare_prediction_dataset(dataset_path)
     
     # Train models for each type
     metrics = {}
+    save_futures = []
     
     gbm_types = ["lgbm", "xgboost", "catboost", "tabnet"]
     all_types = list(model_types) + gbm_types
@@ -303,16 +515,22 @@ async def train_captain_models(base_dir: str, output_dir: str, model_types: List
             model_dir=output_dir
         )
         
-        metrics_dict = ranker.train(prediction_df, target_col="captain_points")
-        ranker.save()
+        metrics_dict = ranker.train(prediction_df.copy(deep=False), target_col="captain_points")
+        save_futures.append(save_in_background(ranker))
         
         metrics[model_type] = metrics_dict
         logger.info(f"{model_type} captain model - MAE: {metrics_dict['mae']:.4f}")
     
+    wait_for_saves(save_futures)
     return metrics
 
 
-async def train_transfer_models(base_dir: str, output_dir: str, model_types: List[str]) -> Dict[str, Any]:
+async def train_transfer_models(
+    base_dir: str,
+    output_dir: str,
+    model_types: List[str],
+    dataset_path: Optional[str] = None
+) -> Dict[str, Any]:
     """
     Train transfer recommendation models
     
@@ -320,6 +538,7 @@ async def train_transfer_models(base_dir: str, output_dir: str, model_types: Lis
         base_dir: Directory with main dataset
         output_dir: Directory to save trained models
         model_types: List of model types to train
+        dataset_path: Dataset to train on instead of the latest one in base_dir/main
         
     Returns:
         Dictionary with model performance metrics
@@ -329,20 +548,19 @@ async def train_transfer_models(base_dir: str, output_dir: str, model_types: Lis
     
     # Find latest dataset in the main directory
     main_dir = os.path.join(base_dir, "main")
-    datasets = [f for f in os.listdir(main_dir) if f.endswith('.csv')]
+    if dataset_path is None:
+        dataset_path = latest_dataset(main_dir)
     
-    if not datasets:
+    if dataset_path is None:
         logger.warning(f"No datasets found in {main_dir}, skipping")
         return {}
     
-    datasets.sort(reverse=True)
-    dataset_path = os.path.join(main_dir, datasets[0])
-    
     logger.info(f"Preparing transfer dataset from {dataset_path}")
     transfer_df = await prepare_transfer_dataset(dataset_path)
     
     # Train general transfer model
     metrics = {}
+    save_futures = []
     
     gbm_types = ["lgbm", "xgboost", "catboost", "tabnet"]
     all_types = list(model_types) + gbm_types
@@ -356,12 +574,13 @@ async def train_transfer_models(base_dir: str, output_dir: str, model_types: Lis
             model_dir=output_dir
         )
         
-        metrics_dict = advisor.train(transfer_df)
-        advisor.save()
+        metrics_dict = advisor.train(transfer_df.copy(deep=False))
+        save_futures.append(save_in_background(advisor))
         
         metrics[model_type] = metrics_dict
         logger.info(f"{model_type} transfer model - MAE: {metrics_dict['mae']:.4f}")
     
+    wait_for_saves(save_futures)
     return metrics
 
 
@@ -426,4 +645,5 @@ if __name__ == "__main__":
         logger.info(f"Transfer model metrics: {transfer_metrics}")
     
     # Run main function
+    install_uvloop()
     asyncio.run(main())
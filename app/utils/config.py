@@ -1,6 +1,29 @@
 import os
+from functools import lru_cache
+from types import MappingProxyType
 from pydantic_settings import BaseSettings
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Mapping, NamedTuple, Optional
+
+# Subscription Tiers and Model Configuration (read-only, built once at import)
+SUBSCRIPTION_TIERS: Mapping[str, Mapping[str, Any]] = MappingProxyType({
+    "basic": MappingProxyType({
+        "model_version": "basic-v1",
+        "recommendations_limit": 3,
+        "captain_picks_limit": 2,
+    }),
+    "premium": MappingProxyType({
+        "model_version": "premium-v1",
+        "recommendations_limit": 5,
+        "captain_picks_limit": 3,
+    }),
+    "elite": MappingProxyType({
+        "model_version": "elite-v1",
+        "recommendations_limit": 10,
+        "captain_picks_limit": 5,
+    }),
+})
+
+
 class Settings(BaseSettings):
     """
     Application settings loaded from environment variables
@@ -9,27 +32,10 @@ class Settings(BaseSettings):
     API_V1_PREFIX: str = "/api/v1"
     DEBUG: bool = False
     
-    # Subscription Tiers and Model Configuration
-    SUBSCRIPTION_TIERS: Dict[str, Dict[str, Any]] = {
-        "basic": {
-            "model_version": "basic-v1",
-            "recommendations_limit": 3,
-            "captain_picks_limit": 2,
-        },
-        "premium": {
-            "model_version": "premium-v1",
-            "recommendations_limit": 5,
-            "captain_picks_limit": 3,
-        },
-        "elite": {
-            "model_version": "elite-v1",
-            "recommendations_limit": 10,
-            "captain_picks_limit": 5,
-        }
-    }
-    
     # FPL API Timeouts
     FPL_API_TIMEOUT: float = 30.0
+    # Directory for cached FPL API responses
+    FPL_CACHE_DIR: str = ".cache/fpl"
     # Model Path (for local AI models)
     MODEL_PATH: Optional[str] = None
     # Telegram Bot and API URL (add these to avoid pydantic extra_forbidden error)
@@ -39,14 +45,46 @@ class Settings(BaseSettings):
         "env_file": ".env",
         "case_sensitive": True
     }
+    
+    @property
+    def SUBSCRIPTION_TIERS(self) -> Mapping[str, Mapping[str, Any]]:
+        """Subscription tier configuration (not environment driven)"""
+        return SUBSCRIPTION_TIERS
 
 
 # Create global settings object
 settings = Settings()
 
 
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
     """
     Get application settings
     """
     return settings
+
+
+class TierLimits(NamedTuple):
+    """
+    Per-request limits for a subscription tier
+    """
+    captain_picks_limit: int
+    recommendations_limit: int
+
+
+@lru_cache(maxsize=8)
+def get_tier_limits(subscription_tier: Optional[str] = "basic") -> TierLimits:
+    """
+    Get the limits for a subscription tier, falling back to the basic tier
+    
+    Args:
+        subscription_tier: User subscription tier (basic, premium, elite)
+        
+    Returns:
+        TierLimits for the tier
+    """
+    tier_config = SUBSCRIPTION_TIERS.get(subscription_tier or "basic", SUBSCRIPTION_TIERS["basic"])
+    return TierLimits(
+        captain_picks_limit=tier_config.get("captain_picks_limit", 2),
+        recommendations_limit=tier_config.get("recommendations_limit", 3),
+    )
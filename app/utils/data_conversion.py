@@ -1,5 +1,51 @@
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
+import numpy as np
 from app.schemas.fpl import Player, Team
+from app.utils.fpl_data import POSITION_NAME_BY_ID
+
+# Position names indexed by FPL element_type (index 0 is the fallback for unknown types)
+_POSITION_NAMES = ("Unknown",) + tuple(POSITION_NAME_BY_ID[position_id] for position_id in range(1, 5))
+_POSITION_NAMES_ARRAY = np.array(_POSITION_NAMES, dtype=object)
+
+
+def _player_fields(
+    player_data: Dict[str, Any],
+    price: Optional[float] = None,
+    position: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Map FPL API player data to Player schema fields
+    
+    Args:
+        player_data: Player data from the FPL API
+        price: Precomputed price, derived from now_cost when omitted
+        position: Precomputed position name, derived from element_type when omitted
+        
+    Returns:
+        Dictionary of Player field values
+    """
+    return {
+        "id": player_data["id"],
+        "name": f"{player_data['first_name']} {player_data['second_name']}",
+        "team": str(player_data["team"]),  # In a real implementation, we'd map this to the team name
+        "position": position if position is not None else get_position_name(player_data["element_type"]),
+        "price": price if price is not None else player_data["now_cost"] / 10.0,
+        "total_points": player_data["total_points"],
+        "form": float(player_data["form"]),
+        "minutes": player_data["minutes"],
+        "goals_scored": player_data["goals_scored"],
+        "assists": player_data["assists"],
+        "clean_sheets": player_data["clean_sheets"],
+        "goals_conceded": player_data["goals_conceded"],
+        "own_goals": player_data["own_goals"],
+        "penalties_saved": player_data["penalties_saved"],
+        "penalties_missed": player_data["penalties_missed"],
+        "yellow_cards": player_data["yellow_cards"],
+        "red_cards": player_data["red_cards"],
+        "saves": player_data["saves"],
+        "bonus": player_data["bonus"],
+        "status": player_data.get("status", "a"),
+    }
 
 
 def convert_api_player_to_schema(player_data: Dict[str, Any]) -> Player:
@@ -12,27 +58,7 @@ def convert_api_player_to_schema(player_data: Dict[str, Any]) -> Player:
     Returns:
         Player object
     """
-    return Player(
-        id=player_data["id"],
-        name=f"{player_data['first_name']} {player_data['second_name']}",
-        team=player_data["team"],  # In a real implementation, we'd map this to the team name
-        position=get_position_name(player_data["element_type"]),
-        price=player_data["now_cost"] / 10.0,
-        total_points=player_data["total_points"],
-        form=float(player_data["form"]),
-        minutes=player_data["minutes"],
-        goals_scored=player_data["goals_scored"],
-        assists=player_data["assists"],
-        clean_sheets=player_data["clean_sheets"],
-        goals_conceded=player_data["goals_conceded"],
-        own_goals=player_data["own_goals"],
-        penalties_saved=player_data["penalties_saved"],
-        penalties_missed=player_data["penalties_missed"],
-        yellow_cards=player_data["yellow_cards"],
-        red_cards=player_data["red_cards"],
-        saves=player_data["saves"],
-        bonus=player_data["bonus"]
-    )
+    return Player(**_player_fields(player_data))
 
 
 def get_position_name(position_id: int) -> str:
@@ -45,13 +71,32 @@ def get_position_name(position_id: int) -> str:
     Returns:
         Position name
     """
-    positions = {
-        1: "GK",  # Goalkeeper
-        2: "DEF",  # Defender
-        3: "MID",  # Midfielder
-        4: "FWD"   # Forward
-    }
-    return positions.get(position_id, "Unknown")
+    return _POSITION_NAMES[position_id] if 0 < position_id < len(_POSITION_NAMES) else "Unknown"
+
+
+def convert_api_players_bulk(players_data: List[Dict[str, Any]]) -> List[Player]:
+    """
+    Convert a batch of FPL API player data (e.g. the whole bootstrap list) to Player objects
+    
+    Args:
+        players_data: Player data from the FPL API
+        
+    Returns:
+        List of Player objects, in input order
+    """
+    count = len(players_data)
+    
+    # Derive the computed columns for the whole batch at once
+    prices = (np.fromiter((p["now_cost"] for p in players_data), dtype=np.float64, count=count) / 10.0).tolist()
+    element_types = np.fromiter((p["element_type"] for p in players_data), dtype=np.int64, count=count)
+    element_types[(element_types < 1) | (element_types >= len(_POSITION_NAMES))] = 0
+    positions = _POSITION_NAMES_ARRAY[element_types].tolist()
+    
+    # Fields come straight from the FPL API with types fixed by _player_fields, so skip validation
+    return [
+        Player.model_construct(**_player_fields(player_data, price, position))
+        for player_data, price, position in zip(players_data, prices, positions)
+    ]
 
 
 def convert_api_team_to_schema(team_data: Dict[str, Any], 
@@ -66,15 +111,11 @@ def convert_api_team_to_schema(team_data: Dict[str, Any],
     Returns:
         Team object
     """
-    players = []
-    total_value = 0.0
+    picked = [player_details[pick["element"]] for pick in team_data["picks"] if pick["element"] in player_details]
     
-    for pick in team_data["picks"]:
-        player_id = pick["element"]
-        if player_id in player_details:
-            player = convert_api_player_to_schema(player_details[player_id])
-            players.append(player)
-            total_value += player.price
+    # Fields come straight from the FPL API with types fixed by _player_fields, so skip validation
+    players = [Player.model_construct(**_player_fields(player_data)) for player_data in picked]
+    total_value = sum(player_data["now_cost"] for player_data in picked) / 10.0
     
     return Team(
         players=players,
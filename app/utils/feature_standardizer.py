@@ -6,13 +6,14 @@ consistency between training and prediction phases.
 """
 
 import logging
-from typing import Dict, Any, List, Optional, Union
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple, Union
 import numpy as np
 import pandas as pd
 
 logger = logging.getLogger(__name__)
 
-# Training feature names from process_player_features function
+# Training feature names from fill_player_features function
 TRAINING_FEATURE_NAMES = [
     "price", "form", "recent_form", "points_per_game", "points_per_90", 
     "minutes", "goals_scored", "assists", "clean_sheets", "goals_conceded",
@@ -35,8 +36,6 @@ def convert_player_to_features(player_data: Dict[str, Any]) -> Dict[str, float]:
     Returns:
         Dictionary with standardized feature names and values
     """
-    features = {}
-    
     # Basic stats
     total_points = player_data.get("total_points", 0)
     minutes = player_data.get("minutes", 0)
@@ -94,44 +93,153 @@ def convert_player_to_features(player_data: Dict[str, Any]) -> Dict[str, float]:
     xG = (goals / max(1, games_played)) if games_played > 0 else 0
     xA = (assists / max(1, games_played)) if games_played > 0 else 0
     
-    # Build feature dictionary
-    features = {
+    # Derived features; every other training feature is a raw stat defaulting to 0
+    derived = {
         "price": float(price),
         "form": float(form),
         "recent_form": float(recent_form),
         "points_per_game": float(ppg),
         "points_per_90": float(points_per_90),
-        "minutes": float(player_data.get("minutes", 0)),
-        "goals_scored": float(player_data.get("goals_scored", 0)),
-        "assists": float(player_data.get("assists", 0)),
-        "clean_sheets": float(player_data.get("clean_sheets", 0)),
-        "goals_conceded": float(player_data.get("goals_conceded", 0)),
-        "own_goals": float(player_data.get("own_goals", 0)),
-        "penalties_saved": float(player_data.get("penalties_saved", 0)),
-        "penalties_missed": float(player_data.get("penalties_missed", 0)),
-        "yellow_cards": float(player_data.get("yellow_cards", 0)),
-        "red_cards": float(player_data.get("red_cards", 0)),
-        "saves": float(player_data.get("saves", 0)),
-        "bonus": float(player_data.get("bonus", 0)),
-        "bps": float(player_data.get("bps", 0)),
-        "influence": float(player_data.get("influence", 0)),
-        "creativity": float(player_data.get("creativity", 0)),
-        "threat": float(player_data.get("threat", 0)),
-        "ict_index": float(player_data.get("ict_index", 0)),
         "xG": float(xG),
         "xA": float(xA),
         "ownership_percentage": float(ownership_percentage),
         "avg_fixture_difficulty": float(avg_fixture_difficulty),
         "team_strength": float(team_strength),
-        "team_strength_attack_home": float(player_data.get("team_strength_attack_home", 0)),
-        "team_strength_attack_away": float(player_data.get("team_strength_attack_away", 0)),
-        "team_strength_defence_home": float(player_data.get("team_strength_defence_home", 0)),
-        "team_strength_defence_away": float(player_data.get("team_strength_defence_away", 0)),
+    }
+    
+    # Build feature dictionary in training column order
+    features = {
+        name: derived[name] if name in derived else float(player_data.get(name, 0))
+        for name in TRAINING_FEATURE_NAMES
     }
     
     return features
 
 
+# Raw stat columns copied through unchanged (missing values default to 0)
+_PASSTHROUGH_FEATURES = [
+    "minutes", "goals_scored", "assists", "clean_sheets", "goals_conceded",
+    "own_goals", "penalties_saved", "penalties_missed", "yellow_cards",
+    "red_cards", "saves", "bonus", "bps", "influence", "creativity",
+    "threat", "ict_index", "team_strength_attack_home",
+    "team_strength_attack_away", "team_strength_defence_home",
+    "team_strength_defence_away"
+]
+
+# Raw input keys the batch builder reads; everything else in the player dicts is ignored
+_RAW_INPUT_COLUMNS = list(dict.fromkeys([
+    "total_points", "minutes", "price", "now_cost", "form", "goals_scored",
+    "assists", "selected_by_percent", "avg_fixture_difficulty", "team_strength",
+    *_PASSTHROUGH_FEATURES
+]))
+
+
+def _numeric_column(df: pd.DataFrame, name: str, default: float = 0.0) -> np.ndarray:
+    """
+    Coerce one raw column to float64, using default for missing, unparseable or infinite values
+    """
+    if name not in df.columns:
+        return np.full(len(df), default, dtype=np.float64)
+    values = df[name]
+    if not pd.api.types.is_numeric_dtype(values):
+        # FPL sends several stats (form, selected_by_percent, ICT) as strings,
+        # some with a decimal comma; numeric columns skip string parsing entirely
+        values = values.astype(str).str.replace(",", ".", regex=False)
+    numeric = pd.to_numeric(values, errors="coerce").to_numpy(dtype=np.float64)
+    invalid = ~np.isfinite(numeric)
+    if invalid.any():
+        logger.debug(f"Defaulting {int(invalid.sum())} missing or invalid '{name}' values to {default}")
+        numeric[invalid] = default
+    return numeric
+
+
+def _player_feature_columns(players: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    """
+    Compute every training feature as a float64 column for a batch of player dicts
+    """
+    # Only materialize the keys we use (API player dicts carry ~80 fields)
+    df = pd.DataFrame.from_records(players, columns=_RAW_INPUT_COLUMNS) if players else pd.DataFrame()
+    
+    total_points = _numeric_column(df, "total_points")
+    minutes = _numeric_column(df, "minutes")
+    
+    # Reciprocal of approximate games played (conservative estimate of 60 mins per game),
+    # computed once and shared by every per-game rate
+    per_game = np.floor_divide(minutes, 60)
+    np.maximum(per_game, 1, out=per_game)
+    np.reciprocal(per_game, out=per_game)
+    
+    # Divide and zero-fill in one pass: players without minutes keep 0
+    points_per_90 = np.zeros_like(minutes)
+    np.divide(total_points, minutes, out=points_per_90, where=minutes > 0)
+    points_per_90 *= 90
+    
+    # Price in millions; FPL API now_cost (e.g. 120 for £12.0M) takes precedence
+    price = _numeric_column(df, "price")
+    if "now_cost" in df.columns:
+        now_cost = pd.to_numeric(df["now_cost"], errors="coerce").to_numpy(dtype=np.float64)
+        price = np.where(np.isnan(now_cost), price, now_cost / 10.0)
+    
+    form = _numeric_column(df, "form")
+    goals = _numeric_column(df, "goals_scored")
+    assists = _numeric_column(df, "assists")
+    
+    features = {
+        "price": price,
+        "form": form,
+        # Recent form (approximate from current form for prediction)
+        "recent_form": form,
+        "points_per_game": total_points * per_game,
+        "points_per_90": points_per_90,
+        # xG and xA approximations
+        "xG": goals * per_game,
+        "xA": assists * per_game,
+        "ownership_percentage": _numeric_column(df, "selected_by_percent"),
+        "avg_fixture_difficulty": _numeric_column(df, "avg_fixture_difficulty", 3.0),
+        "team_strength": _numeric_column(df, "team_strength", 100.0),
+    }
+    for name in _PASSTHROUGH_FEATURES:
+        features[name] = _numeric_column(df, name)
+    
+    return features
+
+
+@lru_cache(maxsize=32)
+def _feature_index(feature_names: Tuple[str, ...]) -> Tuple[Tuple[int, str], ...]:
+    """
+    Output positions of the model features that the standardizer computes
+    """
+    known = set(TRAINING_FEATURE_NAMES)
+    return tuple((i, name) for i, name in enumerate(feature_names) if name in known)
+
+
+def _feature_frame(features: Dict[str, np.ndarray], num_players: int, feature_names: List[str]) -> pd.DataFrame:
+    """
+    Lay out feature columns in model order as one float32 block (unknown features are 0)
+    """
+    # Column-major, so each column write is contiguous and matches pandas' block layout
+    out = np.zeros((num_players, len(feature_names)), dtype=np.float32, order="F")
+    for i, name in _feature_index(tuple(feature_names)):
+        out[:, i] = features[name]
+    validate_features_matrix(out)
+    return pd.DataFrame(out, columns=feature_names, copy=False)
+
+
+def convert_players_to_features(players: List[Dict[str, Any]]) -> pd.DataFrame:
+    """
+    Convert a batch of player dicts to standardized training features
+    
+    Column-wise equivalent of convert_player_to_features for many players at once.
+    
+    Args:
+        players: Player data dictionaries (from schema or API)
+        
+    Returns:
+        float32 DataFrame with one row per player and TRAINING_FEATURE_NAMES columns
+    """
+    return _feature_frame(_player_feature_columns(players), len(players), TRAINING_FEATURE_NAMES)
+
+
 def prepare_features_for_model(
     player_data: Union[Dict[str, Any], List[Dict[str, Any]]], 
     model_feature_names: Optional[List[str]] = None
@@ -144,36 +252,47 @@ def prepare_features_for_model(
         model_feature_names: List of feature names expected by the model
         
     Returns:
-        Feature dictionary (single player) or DataFrame (multiple players)
+        Feature dictionary (single player) or float32 DataFrame (multiple players)
     """
     if isinstance(player_data, list):
-        # Multiple players
-        features_list = []
-        for player in player_data:
-            features = convert_player_to_features(player)
-            features_list.append(features)
-        
-        df = pd.DataFrame(features_list)
-        
-        # Reindex to match model's expected features
+        # Multiple players, laid out directly in the model's feature order
         if model_feature_names:
-            df = df.reindex(columns=model_feature_names, fill_value=0.0)
+            return _feature_frame(_player_feature_columns(player_data), len(player_data), model_feature_names)
         
-        return df
+        return convert_players_to_features(player_data)
     else:
         # Single player
         features = convert_player_to_features(player_data)
         
         # Filter to match model's expected features
         if model_feature_names:
-            filtered_features = {}
-            for feature_name in model_feature_names:
-                filtered_features[feature_name] = features.get(feature_name, 0.0)
+            # Unknown features default to 0; the known ones come from the cached index
+            filtered_features = dict.fromkeys(model_feature_names, 0.0)
+            for _, name in _feature_index(tuple(model_feature_names)):
+                filtered_features[name] = features[name]
             return filtered_features
         
         return features
 
 
+def prepare_features_ndarray(player_data: Dict[str, Any], model_feature_names: List[str]) -> np.ndarray:
+    """
+    Prepare one player's features as a model-ready row, without building a DataFrame
+    
+    Args:
+        player_data: Player data dictionary (from schema or API)
+        model_feature_names: Feature names expected by the model
+        
+    Returns:
+        float32 array of shape (1, len(model_feature_names)) in model column order
+    """
+    features = convert_player_to_features(player_data)
+    row = np.zeros((1, len(model_feature_names)), dtype=np.float32)
+    for i, name in _feature_index(tuple(model_feature_names)):
+        row[0, i] = features[name]
+    return validate_features_matrix(row)
+
+
 def standardize_player_features_for_prediction(
     players: List[Dict[str, Any]], 
     model_feature_names: List[str]
@@ -186,26 +305,26 @@ def standardize_player_features_for_prediction(
         model_feature_names: Feature names expected by the model
         
     Returns:
-        DataFrame with standardized features
+        float32 DataFrame with standardized features
     """
-    features_list = []
-    
-    for player in players:
-        try:
-            features = convert_player_to_features(player)
-            features_list.append(features)
-        except Exception as e:
-            logger.warning(f"Error processing player {player.get('id', 'unknown')}: {e}")
-            # Add default features for this player
-            default_features = {name: 0.0 for name in TRAINING_FEATURE_NAMES}
-            features_list.append(default_features)
-    
-    df = pd.DataFrame(features_list)
-    
     # Ensure all required features are present and in correct order
-    df = df.reindex(columns=model_feature_names, fill_value=0.0)
+    return _feature_frame(_player_feature_columns(players), len(players), model_feature_names)
+
+
+def feature_matrix(df: pd.DataFrame) -> np.ndarray:
+    """
+    Get the float32 array behind a standardized feature frame for model input
+    
+    Frames built by this module hold a single float32 block, so this is a view rather
+    than a copy; other frames are converted once.
     
-    return df
+    Args:
+        df: Feature DataFrame
+        
+    Returns:
+        2-D float32 array in the frame's column order
+    """
+    return df.to_numpy(dtype=np.float32, copy=False)
 
 
 def get_training_feature_names() -> List[str]:
@@ -218,9 +337,24 @@ def get_training_feature_names() -> List[str]:
     return TRAINING_FEATURE_NAMES.copy()
 
 
+def validate_features_matrix(matrix: np.ndarray) -> np.ndarray:
+    """
+    Replace NaN and inf with 0 across a whole feature matrix, in place
+    
+    Args:
+        matrix: Floating-point feature matrix
+        
+    Returns:
+        The same matrix, cleaned
+    """
+    return np.nan_to_num(matrix, copy=False, nan=0.0, posinf=0.0, neginf=0.0)
+
+
 def validate_features(features: Dict[str, float]) -> Dict[str, float]:
     """
-    Validate and clean feature values
+    Validate and clean feature values for a single player
+    
+    Batch paths use validate_features_matrix instead.
     
     Args:
         features: Feature dictionary
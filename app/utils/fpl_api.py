@@ -1,7 +1,16 @@
+import asyncio
 import httpx
+import orjson
+import os
+import time
+from pathlib import Path
 from typing import Dict, List, Any, Optional
 import logging
 
+from app.utils import fpl_data
+from app.utils.config import settings
+from app.utils.http_client import get_client, get_with_retries
+
 # Configure logger
 logger = logging.getLogger(__name__)
 
@@ -11,44 +20,136 @@ BOOTSTRAP_URL = f"{BASE_URL}/bootstrap-static/"
 PLAYER_URL = f"{BASE_URL}/element-summary"
 TEAM_URL = f"{BASE_URL}/entry"
 
+# Concurrent player requests
+PLAYER_FETCH_CONCURRENCY = 10
+
+# On-disk cache of element-summary responses, keyed by player and gameweek
+PLAYER_CACHE_TTL = 6 * 3600  # 6 hours
+
 
 async def get_fpl_data() -> Dict[str, Any]:
     """
-    Get general FPL data including teams, players, and gameweeks
+    Get general FPL data including teams, players, and gameweeks (from the shared bootstrap cache)
+    """
+    return await fpl_data.get_bootstrap_data()
+
+
+async def get_current_gameweek_id() -> Optional[int]:
+    """
+    Get the current gameweek ID from the shared gameweek cache
+    
+    Returns:
+        Current gameweek ID (the next one between gameweeks), or None when there are no gameweeks
+    """
+    return (await fpl_data.get_current_gameweek()).get("id")
+
+
+async def _player_cache_path(player_id: int) -> Path:
+    """
+    Cache file for a player's element-summary in the current gameweek
+    """
+    gameweek = await get_current_gameweek_id() or 0
+    return Path(settings.FPL_CACHE_DIR) / f"player_{player_id}_gw{gameweek}.json"
+
+
+def _read_player_cache(path: Path) -> Optional[Dict[str, Any]]:
+    """
+    Read a cached element-summary if it exists and is younger than PLAYER_CACHE_TTL
     """
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(BOOTSTRAP_URL, timeout=30.0)
-            response.raise_for_status()
-            return response.json()
-    except httpx.RequestError as e:
-        logger.error(f"Error fetching FPL data: {str(e)}")
-        raise Exception(f"Failed to fetch FPL data: {str(e)}")
+        if time.time() - path.stat().st_mtime > PLAYER_CACHE_TTL:
+            return None
+        return orjson.loads(path.read_bytes())
+    except FileNotFoundError:
+        return None
+    except (OSError, orjson.JSONDecodeError) as e:
+        logger.debug(f"Ignoring unreadable player cache {path}: {str(e)}")
+        return None
+
+
+def _write_player_cache(path: Path, data: Dict[str, Any]) -> None:
+    """
+    Write an element-summary to the cache (atomically, so readers never see partial files)
+    """
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_bytes(orjson.dumps(data))
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.debug(f"Could not write player cache {path}: {str(e)}")
 
 
 async def get_player_data(player_id: int) -> Dict[str, Any]:
     """
     Get detailed data for a specific player
     """
+    cache_path = await _player_cache_path(player_id)
+    cached = await asyncio.to_thread(_read_player_cache, cache_path)
+    if cached is not None:
+        return cached
+    
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f"{PLAYER_URL}/{player_id}/", timeout=30.0)
-            response.raise_for_status()
-            return response.json()
+        response = await get_client().get(f"{PLAYER_URL}/{player_id}/")
+        response.raise_for_status()
+        data = orjson.loads(response.content)
+        await asyncio.to_thread(_write_player_cache, cache_path, data)
+        return data
     except httpx.RequestError as e:
         logger.error(f"Error fetching player data for ID {player_id}: {str(e)}")
         raise Exception(f"Failed to fetch player data: {str(e)}")
 
 
+async def _get_json_with_backoff(url: str) -> Dict[str, Any]:
+    """
+    GET a JSON document, retrying with exponential backoff on 429/5xx responses and transport errors
+    """
+    response = await get_with_retries(url)
+    return orjson.loads(response.content)
+
+
+async def get_players_data(
+    player_ids: List[int],
+    concurrency: int = PLAYER_FETCH_CONCURRENCY
+) -> List[Dict[str, Any]]:
+    """
+    Get detailed data for several players concurrently
+    
+    Args:
+        player_ids: Player IDs to fetch
+        concurrency: Maximum number of requests in flight
+        
+    Returns:
+        Player data dictionaries in the same order as player_ids
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async def fetch(player_id: int) -> Dict[str, Any]:
+        cache_path = await _player_cache_path(player_id)
+        cached = await asyncio.to_thread(_read_player_cache, cache_path)
+        if cached is not None:
+            return cached
+        
+        async with semaphore:
+            try:
+                data = await _get_json_with_backoff(f"{PLAYER_URL}/{player_id}/")
+                await asyncio.to_thread(_write_player_cache, cache_path, data)
+                return data
+            except httpx.RequestError as e:
+                logger.error(f"Error fetching player data for ID {player_id}: {str(e)}")
+                raise Exception(f"Failed to fetch player data: {str(e)}")
+    
+    return await asyncio.gather(*(fetch(player_id) for player_id in player_ids))
+
+
 async def get_team_data(team_id: int) -> Dict[str, Any]:
     """
     Get data for a specific FPL team
     """
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f"{TEAM_URL}/{team_id}/", timeout=30.0)
-            response.raise_for_status()
-            return response.json()
+        response = await get_client().get(f"{TEAM_URL}/{team_id}/")
+        response.raise_for_status()
+        return orjson.loads(response.content)
     except httpx.RequestError as e:
         logger.error(f"Error fetching team data for ID {team_id}: {str(e)}")
         raise Exception(f"Failed to fetch team data: {str(e)}")
@@ -59,21 +160,15 @@ async def get_team_players(team_id: int, gameweek: Optional[int] = None) -> List
     Get the players in a specific FPL team for a given gameweek
     """
     try:
-        async with httpx.AsyncClient() as client:
-            # Get current gameweek if not specified
+        # Get current gameweek if not specified; a warm cache means a single request
+        if gameweek is None:
+            gameweek = await get_current_gameweek_id()
             if gameweek is None:
-                bootstrap_data = await get_fpl_data()
-                for gw in bootstrap_data["events"]:
-                    if gw["is_current"]:
-                        gameweek = gw["id"]
-                        break
-                
-                if gameweek is None:
-                    raise Exception("Could not determine current gameweek")
-            
-            response = await client.get(f"{TEAM_URL}/{team_id}/event/{gameweek}/picks/", timeout=30.0)
-            response.raise_for_status()
-            return response.json()
+                raise Exception("Could not determine current gameweek")
+        
+        response = await get_client().get(f"{TEAM_URL}/{team_id}/event/{gameweek}/picks/")
+        response.raise_for_status()
+        return orjson.loads(response.content)
     except httpx.RequestError as e:
         logger.error(f"Error fetching team players for team ID {team_id}: {str(e)}")
         raise Exception(f"Failed to fetch team players: {str(e)}")
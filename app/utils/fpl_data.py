@@ -6,13 +6,22 @@ This module handles fetching and parsing data from the FPL API.
 
 import httpx
 import logging
-from typing import Dict, List, Any, Optional, Union
+import numpy as np
+import orjson
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple, Union
+from types import MappingProxyType
 from functools import lru_cache
 import asyncio
 from datetime import datetime, timedelta
 import os
 import glob
 import json
+import time
+import weakref
+from collections import OrderedDict, defaultdict
+
+from app.utils.config import settings
+from app.utils.http_client import get_with_retries, run_with_client
 
 # Configure logger
 logger = logging.getLogger(__name__)
@@ -24,8 +33,56 @@ FIXTURES_URL = f"{BASE_URL}/fixtures/"
 PLAYER_DETAIL_URL = f"{BASE_URL}/element-summary"
 TEAM_URL = f"{BASE_URL}/entry"
 
-# Cache expiration time (in seconds)
-CACHE_EXPIRY = 3600  # 1 hour
+# FPL element_type IDs and position names
+POSITIONS = ((1, "GK"), (2, "DEF"), (3, "MID"), (4, "FWD"))
+POSITION_NAME_BY_ID = MappingProxyType(dict(POSITIONS))
+POSITION_ID_BY_NAME = MappingProxyType({name: position_id for position_id, name in POSITIONS})
+
+# Cache expiration times (in seconds), tuned to how often each endpoint changes
+CACHE_TTLS = MappingProxyType({
+    "bootstrap": 900,  # 15 minutes (used until the gameweek state is known)
+    "fixtures": 21600,  # 6 hours
+    "player_detail": 7200,  # 2 hours
+})
+# Bootstrap stats move quickly while gameweek matches are being played, slowly in between
+LIVE_BOOTSTRAP_TTL = 60  # 1 minute
+IDLE_BOOTSTRAP_TTL = 21600  # 6 hours
+CURRENT_GAMEWEEK_EXPIRY = 60  # 1 minute
+
+# Maximum number of players whose detail data is kept (least recently used are evicted)
+MAX_PLAYER_DETAILS = 256
+# Maximum number of player detail requests in flight during a batch fetch
+MAX_CONCURRENT_DETAIL_FETCHES = 20
+# Maximum number of fixture difficulty lookups in flight at once
+MAX_CONCURRENT_FIXTURE_LOOKUPS = 32
+
+# Internal player record fields copied from bootstrap elements: (source key, output key, transform)
+_PLAYER_FIELDS = (
+    ("id", "id", None),
+    ("now_cost", "price", lambda v: v / 10.0),  # Convert from pence to pounds
+    ("total_points", "total_points", None),
+    ("form", "form", lambda v: float(v) if v else 0.0),
+    ("minutes", "minutes", None),
+    ("goals_scored", "goals_scored", None),
+    ("assists", "assists", None),
+    ("clean_sheets", "clean_sheets", None),
+    ("goals_conceded", "goals_conceded", None),
+    ("own_goals", "own_goals", None),
+    ("penalties_saved", "penalties_saved", None),
+    ("penalties_missed", "penalties_missed", None),
+    ("yellow_cards", "yellow_cards", None),
+    ("red_cards", "red_cards", None),
+    ("saves", "saves", None),
+    ("bonus", "bonus", None),
+)  # type: Tuple[Tuple[str, str, Optional[Callable[[Any], Any]]], ...]
+
+# Last fetched bootstrap payload on disk, read by sync_get_data without an event loop
+BOOTSTRAP_SNAPSHOT_PATH = os.path.join(settings.FPL_CACHE_DIR, "bootstrap.json")
+
+# Numeric player fields used for rankings, one row per bootstrap element
+PLAYER_ARRAY_DTYPE = np.dtype([
+    ("id", "i4"), ("pos", "i1"), ("cost", "i4"), ("pts", "i4"), ("form", "f4")
+])
 
 
 class FPLDataCache:
@@ -35,60 +92,198 @@ class FPLDataCache:
         # Use explicit types with Optional to allow None values
         self.bootstrap_data = None  # type: Optional[Dict[str, Any]]
         self.bootstrap_timestamp = None  # type: Optional[datetime]
+        # ETags of the cached responses, sent back as If-None-Match to skip unchanged downloads
+        self.bootstrap_etag = None  # type: Optional[str]
+        self.fixtures_etag = None  # type: Optional[str]
+        self.player_details_etag = {}  # type: Dict[int, str]
+        # Lookups by ID into bootstrap elements/teams, rebuilt with each bootstrap fetch
+        self.player_index = {}  # type: Dict[int, Dict[str, Any]]
+        self.team_index = {}  # type: Dict[int, Dict[str, Any]]
+        self.players_arr = np.empty(0, dtype=PLAYER_ARRAY_DTYPE)  # type: np.ndarray
+        # Season file path -> (modification time, {player_id: history})
+        self.season_index = {}  # type: Dict[str, Tuple[float, Dict[int, List[Dict[str, Any]]]]]
         self.fixtures_data = None  # type: Optional[List[Dict[str, Any]]]
         self.fixtures_timestamp = None  # type: Optional[datetime]
-        self.player_details_cache = {}  # type: Dict[int, Dict[str, Any]]
+        # Fixtures per team (home and away), rebuilt with each fixtures fetch
+        self.fixtures_by_team = {}  # type: Dict[int, List[Dict[str, Any]]]
+        # Fixture difficulty matrix and the (fixtures, bootstrap) timestamps it was built from
+        self.difficulty_matrix = None  # type: Optional[Dict[int, Dict[int, int]]]
+        self.difficulty_source = None  # type: Optional[Tuple[Optional[datetime], Optional[datetime]]]
+        self.player_details_cache = OrderedDict()  # type: OrderedDict[int, Dict[str, Any]]
         self.player_details_timestamp = {}  # type: Dict[int, datetime]
+        self.current_gameweek = None  # type: Optional[Dict[str, Any]]
+        self.current_gameweek_timestamp = None  # type: Optional[datetime]
+    
+    def bootstrap_ttl(self) -> float:
+        """Bootstrap TTL for the current gameweek state (short while a gameweek is in play)"""
+        gameweek = self.current_gameweek
+        if not gameweek:
+            return CACHE_TTLS["bootstrap"]
+        if gameweek.get("is_current") and not gameweek.get("finished"):
+            return LIVE_BOOTSTRAP_TTL
+        return IDLE_BOOTSTRAP_TTL
     
     def is_bootstrap_expired(self) -> bool:
         """Check if bootstrap cache has expired"""
         if not self.bootstrap_timestamp:
             return True
-        return (datetime.now() - self.bootstrap_timestamp).total_seconds() > CACHE_EXPIRY
+        return (datetime.now() - self.bootstrap_timestamp).total_seconds() > self.bootstrap_ttl()
     
     def is_fixtures_expired(self) -> bool:
         """Check if fixtures cache has expired"""
         if not self.fixtures_timestamp:
             return True
-        return (datetime.now() - self.fixtures_timestamp).total_seconds() > CACHE_EXPIRY
+        return (datetime.now() - self.fixtures_timestamp).total_seconds() > CACHE_TTLS["fixtures"]
     
     def is_player_details_expired(self, player_id: int) -> bool:
         """Check if player details cache has expired for a specific player"""
         if player_id not in self.player_details_timestamp:
             return True
-        return (datetime.now() - self.player_details_timestamp[player_id]).total_seconds() > CACHE_EXPIRY
+        return (datetime.now() - self.player_details_timestamp[player_id]).total_seconds() > CACHE_TTLS["player_detail"]
+    
+    def get_player_details(self, player_id: int) -> Optional[Dict[str, Any]]:
+        """Get unexpired cached player details, marking them most recently used"""
+        if player_id not in self.player_details_cache or self.is_player_details_expired(player_id):
+            return None
+        self.player_details_cache.move_to_end(player_id)
+        return self.player_details_cache[player_id]
+    
+    def store_player_details(self, player_id: int, details: Dict[str, Any]) -> None:
+        """Cache player details, evicting the least recently used beyond MAX_PLAYER_DETAILS"""
+        self.player_details_cache[player_id] = details
+        self.player_details_cache.move_to_end(player_id)
+        self.player_details_timestamp[player_id] = datetime.now()
+        while len(self.player_details_cache) > MAX_PLAYER_DETAILS:
+            evicted_id, _ = self.player_details_cache.popitem(last=False)
+            self.player_details_timestamp.pop(evicted_id, None)
+            self.player_details_etag.pop(evicted_id, None)
+            _discard_player_detail_lock(evicted_id)
+    
+    def is_current_gameweek_expired(self) -> bool:
+        """Check if the current gameweek cache has expired"""
+        if not self.current_gameweek_timestamp:
+            return True
+        return (datetime.now() - self.current_gameweek_timestamp).total_seconds() > CURRENT_GAMEWEEK_EXPIRY
 
 
 # Initialize cache
 data_cache = FPLDataCache()
 
 
+class _CacheLocks:
+    """Cache locks for one event loop (asyncio locks are bound to the loop that first contends them)"""
+    
+    def __init__(self):
+        # Ensures only one caller recomputes the current gameweek when it expires
+        self.current_gameweek = asyncio.Lock()
+        # Ensure only one caller fetches each cold cache entry; the others wait for its result
+        self.bootstrap = asyncio.Lock()
+        self.fixtures = asyncio.Lock()
+        self.player_detail = defaultdict(asyncio.Lock)  # type: Dict[int, asyncio.Lock]
+
+
+# Event loop -> its cache locks; entries go away with their loop
+_loop_locks = weakref.WeakKeyDictionary()  # type: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _CacheLocks]
+
+
+def _locks() -> _CacheLocks:
+    """Get the cache locks for the running event loop, creating them on first use"""
+    loop = asyncio.get_running_loop()
+    locks = _loop_locks.get(loop)
+    if locks is None:
+        locks = _loop_locks[loop] = _CacheLocks()
+    return locks
+
+
+def _discard_player_detail_lock(player_id: int) -> None:
+    """Drop the fetch locks of a player whose details were evicted from the cache"""
+    for locks in list(_loop_locks.values()):
+        locks.player_detail.pop(player_id, None)
+
+
+# In-flight background refreshes of stale cache entries, by cache name
+_refresh_tasks = {}  # type: Dict[str, asyncio.Task]
+
+
+def _refresh_in_background(name: str, fetch: Callable[[], Awaitable[Any]]) -> None:
+    """
+    Start a background refresh of a stale cache entry unless one is already running
+    
+    Args:
+        name: Cache name (e.g. "bootstrap")
+        fetch: Coroutine function that fetches and stores fresh data
+    """
+    task = _refresh_tasks.get(name)
+    if task is not None and not task.done():
+        return
+    
+    async def refresh() -> None:
+        try:
+            await fetch()
+        except Exception as e:
+            logger.warning(f"Background refresh of {name} data failed: {str(e)}")
+    
+    _refresh_tasks[name] = asyncio.create_task(refresh())
+
+
+def _conditional_headers(etag: Optional[str]) -> Dict[str, str]:
+    """
+    Request headers that let the FPL API answer 304 Not Modified for an unchanged cached response
+    """
+    return {"If-None-Match": etag} if etag else {}
+
+
 async def get_bootstrap_data() -> Dict[str, Any]:
     """
     Get general FPL data including teams, players, and gameweeks
     
+    Stale data is returned immediately while a fresh copy is fetched in the background.
+    
     Returns:
         Dictionary containing FPL bootstrap static data
     """
-    global data_cache
-    
     # Return cached data if available and not expired
-    if data_cache.bootstrap_data and not data_cache.is_bootstrap_expired():
-        logger.debug("Using cached bootstrap data")
-        assert data_cache.bootstrap_data is not None
+    if data_cache.bootstrap_data:
+        if data_cache.is_bootstrap_expired():
+            _refresh_in_background("bootstrap", _fetch_bootstrap_data)
+        else:
+            logger.debug("Using cached bootstrap data")
         return data_cache.bootstrap_data
     
+    async with _locks().bootstrap:
+        # Another caller may have fetched it while we waited
+        if data_cache.bootstrap_data:
+            return data_cache.bootstrap_data
+        return await _fetch_bootstrap_data()
+
+
+async def _fetch_bootstrap_data() -> Dict[str, Any]:
+    """
+    Fetch bootstrap data from the FPL API and refresh every cache derived from it
+    """
     try:
         logger.info("Fetching bootstrap data from FPL API")
-        async with httpx.AsyncClient() as client:
-            response = await client.get(BOOTSTRAP_URL, timeout=30.0)
-            response.raise_for_status()
-              # Update cache
-            data_cache.bootstrap_data = response.json()
+        response = await get_with_retries(BOOTSTRAP_URL, headers=_conditional_headers(data_cache.bootstrap_etag))
+        if response.status_code == 304 and data_cache.bootstrap_data:
+            logger.debug("Bootstrap data not modified")
             data_cache.bootstrap_timestamp = datetime.now()
-            
-            assert data_cache.bootstrap_data is not None
             return data_cache.bootstrap_data
+        
+        # Update cache
+        bootstrap_data = orjson.loads(response.content)
+        data_cache.bootstrap_etag = response.headers.get("ETag")
+        data_cache.player_index = {p["id"]: p for p in bootstrap_data.get("elements", [])}
+        data_cache.team_index = {t["id"]: t for t in bootstrap_data.get("teams", [])}
+        data_cache.players_arr = _players_array(bootstrap_data.get("elements", []))
+        data_cache.current_gameweek = _find_current_gameweek(bootstrap_data)
+        data_cache.current_gameweek_timestamp = datetime.now()
+        data_cache.bootstrap_data = bootstrap_data
+        data_cache.bootstrap_timestamp = datetime.now()
+        # Write the raw payload off the event loop for synchronous readers
+        write = asyncio.get_running_loop().run_in_executor(None, _write_bootstrap_snapshot, response.content)
+        write.add_done_callback(_log_snapshot_write_error)
+        
+        return bootstrap_data
     except httpx.RequestError as e:
         logger.error(f"Error fetching FPL bootstrap data: {str(e)}")
         raise Exception(f"Failed to fetch FPL bootstrap data: {str(e)}")
@@ -98,28 +293,50 @@ async def get_fixtures_data() -> List[Dict[str, Any]]:
     """
     Get fixture data for all teams
     
+    Stale data is returned immediately while a fresh copy is fetched in the background.
+    
     Returns:
         List of dictionaries containing fixture data
     """
-    global data_cache
-    
     # Return cached data if available and not expired
-    if data_cache.fixtures_data and not data_cache.is_fixtures_expired():
-        logger.debug("Using cached fixtures data")
-        assert data_cache.fixtures_data is not None
+    if data_cache.fixtures_data:
+        if data_cache.is_fixtures_expired():
+            _refresh_in_background("fixtures", _fetch_fixtures_data)
+        else:
+            logger.debug("Using cached fixtures data")
         return data_cache.fixtures_data
     
+    async with _locks().fixtures:
+        # Another caller may have fetched it while we waited
+        if data_cache.fixtures_data:
+            return data_cache.fixtures_data
+        return await _fetch_fixtures_data()
+
+
+async def _fetch_fixtures_data() -> List[Dict[str, Any]]:
+    """
+    Fetch fixtures from the FPL API and refresh the per-team fixture index
+    """
     try:
         logger.info("Fetching fixtures data from FPL API")
-        async with httpx.AsyncClient() as client:
-            response = await client.get(FIXTURES_URL, timeout=30.0)
-            response.raise_for_status()
-              # Update cache
-            data_cache.fixtures_data = response.json()
+        response = await get_with_retries(FIXTURES_URL, headers=_conditional_headers(data_cache.fixtures_etag))
+        if response.status_code == 304 and data_cache.fixtures_data:
+            logger.debug("Fixtures data not modified")
             data_cache.fixtures_timestamp = datetime.now()
-            
-            assert data_cache.fixtures_data is not None
             return data_cache.fixtures_data
+        
+        # Update cache
+        fixtures_data = orjson.loads(response.content)
+        data_cache.fixtures_etag = response.headers.get("ETag")
+        fixtures_by_team = {}  # type: Dict[int, List[Dict[str, Any]]]
+        for fixture in fixtures_data:
+            fixtures_by_team.setdefault(fixture["team_h"], []).append(fixture)
+            fixtures_by_team.setdefault(fixture["team_a"], []).append(fixture)
+        data_cache.fixtures_by_team = fixtures_by_team
+        data_cache.fixtures_data = fixtures_data
+        data_cache.fixtures_timestamp = datetime.now()
+        
+        return fixtures_data
     except httpx.RequestError as e:
         logger.error(f"Error fetching FPL fixtures data: {str(e)}")
         raise Exception(f"Failed to fetch FPL fixtures data: {str(e)}")
@@ -135,28 +352,75 @@ async def get_player_detail_data(player_id: int) -> Dict[str, Any]:
     Returns:
         Dictionary containing detailed player data
     """
-    global data_cache
-    
     # Return cached data if available and not expired
-    if (player_id in data_cache.player_details_cache and 
-            not data_cache.is_player_details_expired(player_id)):
+    cached = data_cache.get_player_details(player_id)
+    if cached is not None:
         logger.debug(f"Using cached player detail data for player ID {player_id}")
-        return data_cache.player_details_cache[player_id]
+        return cached
     
-    try:
-        logger.info(f"Fetching player detail data for player ID {player_id}")
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f"{PLAYER_DETAIL_URL}/{player_id}/", timeout=30.0)
-            response.raise_for_status()
+    async with _locks().player_detail[player_id]:
+        # Another caller may have fetched it while we waited
+        cached = data_cache.get_player_details(player_id)
+        if cached is not None:
+            return cached
+        
+        try:
+            logger.info(f"Fetching player detail data for player ID {player_id}")
+            # Expired details are still held until evicted, so they can be revalidated
+            stale = data_cache.player_details_cache.get(player_id)
+            etag = data_cache.player_details_etag.get(player_id) if stale is not None else None
+            response = await get_with_retries(
+                f"{PLAYER_DETAIL_URL}/{player_id}/", headers=_conditional_headers(etag)
+            )
+            if response.status_code == 304 and stale is not None:
+                data_cache.store_player_details(player_id, stale)
+                return stale
             
             # Update cache
-            data_cache.player_details_cache[player_id] = response.json()
-            data_cache.player_details_timestamp[player_id] = datetime.now()
+            player_details = orjson.loads(response.content)
+            data_cache.store_player_details(player_id, player_details)
+            etag = response.headers.get("ETag")
+            if etag:
+                data_cache.player_details_etag[player_id] = etag
+            else:
+                data_cache.player_details_etag.pop(player_id, None)
             
-            return data_cache.player_details_cache[player_id]
-    except httpx.RequestError as e:
-        logger.error(f"Error fetching player detail data for player ID {player_id}: {str(e)}")
-        raise Exception(f"Failed to fetch player detail data: {str(e)}")
+            return player_details
+        except httpx.RequestError as e:
+            logger.error(f"Error fetching player detail data for player ID {player_id}: {str(e)}")
+            raise Exception(f"Failed to fetch player detail data: {str(e)}")
+
+
+async def get_player_details_batch(player_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+    """
+    Get detailed data for several players, fetching cache misses concurrently
+    
+    Args:
+        player_ids: Player IDs in the FPL API
+    
+    Returns:
+        Dictionary mapping player IDs to their detailed data (players that failed to load are omitted)
+    """
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_DETAIL_FETCHES)
+    
+    async def fetch(player_id: int) -> Dict[str, Any]:
+        # Cache hits return without waiting on the semaphore
+        cached = data_cache.get_player_details(player_id)
+        if cached is not None:
+            return cached
+        async with semaphore:
+            return await get_player_detail_data(player_id)
+    
+    unique_ids = list(dict.fromkeys(player_ids))
+    results = await asyncio.gather(*(fetch(player_id) for player_id in unique_ids), return_exceptions=True)
+    
+    details = {}
+    for player_id, result in zip(unique_ids, results):
+        if isinstance(result, Exception):
+            logger.warning(f"Could not load player detail data for player ID {player_id}: {result}")
+        else:
+            details[player_id] = result
+    return details
 
 
 async def get_players() -> List[Dict[str, Any]]:
@@ -187,14 +451,12 @@ async def get_player_by_id(player_id: int) -> Optional[Dict[str, Any]]:
     Returns:
         Dictionary containing player data or None if not found
     """
-    players = await get_players()
+    await get_bootstrap_data()
+    player = data_cache.player_index.get(player_id)
     
-    for player in players:
-        if player["id"] == player_id:
-            return player
-    
-    logger.warning(f"Player with ID {player_id} not found")
-    return None
+    if player is None:
+        logger.warning(f"Player with ID {player_id} not found")
+    return player
 
 
 async def get_player_with_history(player_id: int) -> Dict[str, Any]:
@@ -220,10 +482,114 @@ async def get_player_with_history(player_id: int) -> Dict[str, Any]:
     return result
 
 
+def _iter_json_array(path: str, chunk_size: int = 1 << 16) -> Iterator[Any]:
+    """
+    Lazily yield the objects of a top-level JSON array file, reading it in chunks
+    
+    Only the current chunk and the object being decoded are held in memory, so a
+    caller that stops early never parses the rest of the file.
+    
+    Args:
+        path: Path to a file containing a JSON array of objects
+        chunk_size: Number of characters read per chunk
+    
+    Yields:
+        Each element of the array
+    """
+    decoder = json.JSONDecoder()
+    with open(path, 'r', encoding='utf-8') as f:
+        buf = ''
+        pos = 0
+        eof = False
+        started = False
+        while True:
+            # Skip whitespace and separators, refilling the buffer as needed
+            while pos < len(buf) and buf[pos] in ' \t\r\n,':
+                pos += 1
+            if pos >= len(buf):
+                if eof:
+                    return
+                chunk = f.read(chunk_size)
+                buf, pos, eof = buf[pos:] + chunk, 0, not chunk
+                continue
+            
+            if not started:
+                if buf[pos] != '[':
+                    raise ValueError(f"{path} does not contain a JSON array")
+                started = True
+                pos += 1
+                continue
+            if buf[pos] == ']':
+                return
+            
+            try:
+                item, pos = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                # Object continues in the next chunk
+                if eof:
+                    raise
+                chunk = f.read(chunk_size)
+                buf, pos, eof = buf[pos:] + chunk, 0, not chunk
+                continue
+            yield item
+
+
+def _iter_season_file(season_file: str) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the player records of a season file, one at a time
+    
+    Season files are JSON Lines (.jsonl, one player per line) as written by
+    fetch_fpl_history.py; older .json files holding a single array are also read.
+    """
+    if season_file.endswith('.jsonl'):
+        with open(season_file, 'rb') as f:
+            for line in f:
+                if line.strip():
+                    yield orjson.loads(line)
+    else:
+        yield from _iter_json_array(season_file)
+
+
+def _season_files(data_dir: str) -> List[str]:
+    """
+    Season files in data_dir, preferring the .jsonl copy when a season exists in both formats
+    """
+    by_season = {}  # type: Dict[str, str]
+    for path in sorted(glob.glob(os.path.join(data_dir, '*.json')) + glob.glob(os.path.join(data_dir, '*.jsonl'))):
+        season, ext = os.path.splitext(path)
+        if ext == '.jsonl' or season not in by_season:
+            by_season[season] = path
+    return list(by_season.values())
+
+
+def get_season_history_index(season_file: str) -> Dict[int, List[Dict[str, Any]]]:
+    """
+    Get a season file's {player_id: history} index, re-reading the file only when it changes
+    
+    Args:
+        season_file: Path to a season file of player dicts with 'id' and 'history' (.jsonl or .json)
+    
+    Returns:
+        Dictionary mapping player IDs to their history for that season
+    """
+    mtime = os.path.getmtime(season_file)
+    cached = data_cache.season_index.get(season_file)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    
+    index = {}  # type: Dict[int, List[Dict[str, Any]]]
+    for p in _iter_season_file(season_file):
+        player_id = p.get('id')
+        if 'history' in p and player_id not in index:
+            index[player_id] = p['history']
+    data_cache.season_index[season_file] = (mtime, index)
+    return index
+
+
 async def get_player_with_history_all_seasons(player_id: int) -> Dict[str, Any]:
     """
     Get player data including history and fixtures for all available seasons.
-    Aggregates from local files in app/data/ (e.g., 2018-19.json, 2019-20.json, etc.) if available.
+    Aggregates from local files in app/data/ (e.g., 2018-19.jsonl, 2019-20.jsonl, etc.) if available.
     Falls back to current season if no files found.
     """
     player = await get_player_by_id(player_id)
@@ -233,18 +599,16 @@ async def get_player_with_history_all_seasons(player_id: int) -> Dict[str, Any]:
     # Directory where multi-season files are stored
     data_dir = os.path.join(os.path.dirname(__file__), '..', 'data')
     data_dir = os.path.abspath(data_dir)
-    season_files = glob.glob(os.path.join(data_dir, '*.json'))
+    season_files = _season_files(data_dir)
     all_history = []
     found = False
     for season_file in season_files:
         try:
-            with open(season_file, 'r', encoding='utf-8') as f:
-                season_data = json.load(f)
-                # Each file should be a list of player dicts with 'id' and 'history'
-                for p in season_data:
-                    if p.get('id') == player_id and 'history' in p:
-                        all_history.extend(p['history'])
-                        found = True
+            # Each file is indexed by player ID once, then answered by dict lookup
+            history = get_season_history_index(season_file).get(player_id)
+            if history is not None:
+                all_history.extend(history)
+                found = True
         except Exception as e:
             logger.warning(f"Could not read {season_file}: {e}")
     if not found:
@@ -281,14 +645,12 @@ async def get_team_by_id(team_id: int) -> Optional[Dict[str, Any]]:
     Returns:
         Dictionary containing team data or None if not found
     """
-    teams = await get_teams()
+    await get_bootstrap_data()
+    team = data_cache.team_index.get(team_id)
     
-    for team in teams:
-        if team["id"] == team_id:
-            return team
-    
-    logger.warning(f"Team with ID {team_id} not found")
-    return None
+    if team is None:
+        logger.warning(f"Team with ID {team_id} not found")
+    return team
 
 
 async def get_team_players(team_id: int) -> list:
@@ -296,69 +658,47 @@ async def get_team_players(team_id: int) -> list:
     Fetch the actual FPL team for the given team_id from the FPL API.
     """
     try:
-        async with httpx.AsyncClient() as client:
-            # Get current gameweek
-            bootstrap = await client.get("https://fantasy.premierleague.com/api/bootstrap-static/")
-            bootstrap.raise_for_status()
-            bootstrap_data = bootstrap.json()
-            events = bootstrap_data["events"]
-            current_gw = next((e["id"] for e in events if e["is_current"]), None)
-            if not current_gw:
-                current_gw = max(e["id"] for e in events if e["is_next"])
-            
-            # Get team picks for the current gameweek
-            picks_resp = await client.get(f"https://fantasy.premierleague.com/api/entry/{team_id}/event/{current_gw}/picks/")
-            picks_resp.raise_for_status()
-            picks = picks_resp.json()["picks"]
-            
-            # Get all player data and teams
-            all_players = bootstrap_data["elements"]
-            all_teams = bootstrap_data["teams"]
-            player_map = {p["id"]: p for p in all_players}
-            team_map = {t["id"]: t for t in all_teams}
-            
-            # Position mapping
-            position_map = {1: "GK", 2: "DEF", 3: "MID", 4: "FWD"}
-            
-            # Build the team with transformed data structure
-            team_players = []
-            for pick in picks:
-                player_data = player_map.get(pick["element"])
-                if player_data:
-                    # Transform FPL API format to our internal format
-                    team_name = team_map.get(player_data["team"], {}).get("name", "Unknown")
-                    position = position_map.get(player_data["element_type"], "Unknown")
-                    
-                    transformed_player = {
-                        "id": player_data["id"],
-                        "name": f"{player_data['first_name']} {player_data['second_name']}".strip(),
-                        "team": team_name,
-                        "position": position,
-                        "price": player_data["now_cost"] / 10.0,  # Convert from pence to pounds
-                        "total_points": player_data["total_points"],
-                        "form": float(player_data["form"]) if player_data["form"] else 0.0,
-                        "minutes": player_data["minutes"],
-                        "goals_scored": player_data["goals_scored"],
-                        "assists": player_data["assists"],
-                        "clean_sheets": player_data["clean_sheets"],
-                        "goals_conceded": player_data["goals_conceded"],
-                        "own_goals": player_data["own_goals"],
-                        "penalties_saved": player_data["penalties_saved"],
-                        "penalties_missed": player_data["penalties_missed"],
-                        "yellow_cards": player_data["yellow_cards"],
-                        "red_cards": player_data["red_cards"],
-                        "saves": player_data["saves"],
-                        "bonus": player_data["bonus"]
-                    }
-                    team_players.append(transformed_player)
-            
-            return team_players
+        # Current gameweek and the ID lookups are precomputed when bootstrap data is cached
+        current_gw = (await get_current_gameweek())["id"]
+        
+        # Get team picks for the current gameweek
+        picks_resp = await get_with_retries(f"{TEAM_URL}/{team_id}/event/{current_gw}/picks/")
+        picks = orjson.loads(picks_resp.content)["picks"]
+        
+        player_map = data_cache.player_index
+        team_map = data_cache.team_index
+        
+        # Build the team with transformed data structure
+        return [
+            _to_team_player(player_data, team_map)
+            for player_data in (player_map.get(pick["element"]) for pick in picks)
+            if player_data
+        ]
     except Exception as e:
         import logging
         logging.getLogger(__name__).error(f"Error fetching real FPL team: {e}")
         return []
 
 
+def _to_team_player(player_data: Dict[str, Any], team_map: Dict[int, Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Transform a bootstrap element from the FPL API format to our internal format
+    
+    Args:
+        player_data: Bootstrap element
+        team_map: Bootstrap teams by ID
+    
+    Returns:
+        Internal player dictionary
+    """
+    player = {dst: (fn(player_data[src]) if fn else player_data[src]) for src, dst, fn in _PLAYER_FIELDS}
+    player["name"] = f"{player_data['first_name']} {player_data['second_name']}".strip()
+    player["team"] = team_map.get(player_data["team"], {}).get("name", "Unknown")
+    player["position"] = POSITION_NAME_BY_ID.get(player_data["element_type"], "Unknown")
+    player["status"] = player_data.get("status", "a")
+    return player
+
+
 async def get_current_gameweek() -> Dict[str, Any]:
     """
     Get the current gameweek data
@@ -366,18 +706,43 @@ async def get_current_gameweek() -> Dict[str, Any]:
     Returns:
         Dictionary containing current gameweek data
     """
-    bootstrap_data = await get_bootstrap_data()
+    # Return cached gameweek if available and not expired
+    if data_cache.current_gameweek is not None and not data_cache.is_current_gameweek_expired():
+        return data_cache.current_gameweek
+    
+    async with _locks().current_gameweek:
+        # Another caller may have refreshed it while we waited
+        if data_cache.current_gameweek is not None and not data_cache.is_current_gameweek_expired():
+            return data_cache.current_gameweek
+        
+        data_cache.current_gameweek = _find_current_gameweek(await get_bootstrap_data())
+        data_cache.current_gameweek_timestamp = datetime.now()
+        return data_cache.current_gameweek
+
+
+def _find_current_gameweek(bootstrap_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Find the current gameweek in bootstrap data
+    
+    Args:
+        bootstrap_data: FPL bootstrap static data
+    
+    Returns:
+        Dictionary containing current gameweek data
+    """
     events = bootstrap_data.get("events", [])
     
+    # Single pass: the current gameweek wins, otherwise fall back to the next one
+    next_event = None
     for event in events:
         if event["is_current"]:
             return event
+        if next_event is None and event["is_next"]:
+            next_event = event
+    
+    if next_event is not None:
+        return next_event
     
-    # If no current gameweek found, return the next one
-    for event in events:
-        if event["is_next"]:
-            return event
-            
     # If no current or next gameweek, return the first one
     return events[0] if events else {}
 
@@ -393,13 +758,10 @@ async def get_team_fixtures(team_id: int, include_finished: bool = False) -> Lis
     Returns:
         List of fixture data for the specified team
     """
-    all_fixtures = await get_fixtures_data()
+    await get_fixtures_data()
     
-    # Filter fixtures for the specified team
-    team_fixtures = [
-        fixture for fixture in all_fixtures 
-        if fixture["team_a"] == team_id or fixture["team_h"] == team_id
-    ]
+    # Fixtures for the specified team, from the per-team index
+    team_fixtures = data_cache.fixtures_by_team.get(team_id, [])
     
     # Filter out finished fixtures if not needed
     if not include_finished:
@@ -408,12 +770,13 @@ async def get_team_fixtures(team_id: int, include_finished: bool = False) -> Lis
             if fixture["finished"] == False
         ]
     
-    # Add is_home flag and opponent ID
+    # Add is_home flag and opponent ID (on copies, since cached fixtures are shared by both teams)
+    result = []
     for fixture in team_fixtures:
-        fixture["is_home"] = fixture["team_h"] == team_id
-        fixture["opponent"] = fixture["team_a"] if fixture["is_home"] else fixture["team_h"]
+        is_home = fixture["team_h"] == team_id
+        result.append({**fixture, "is_home": is_home, "opponent": fixture["team_a"] if is_home else fixture["team_h"]})
     
-    return team_fixtures
+    return result
 
 
 async def get_fixture_difficulty() -> Dict[int, Dict[int, int]]:
@@ -425,9 +788,13 @@ async def get_fixture_difficulty() -> Dict[int, Dict[int, int]]:
         Example: {1: {2: 4, 3: 2, ...}, 2: {1: 3, ...}}
     """
     teams = await get_teams()
-    team_count = len(teams)
     fixtures = await get_fixtures_data()
     
+    # Reuse the matrix until either of its sources is refreshed
+    source = (data_cache.fixtures_timestamp, data_cache.bootstrap_timestamp)
+    if data_cache.difficulty_matrix is not None and data_cache.difficulty_source == source:
+        return data_cache.difficulty_matrix
+    
     # Initialize difficulty matrix
     difficulty = {team["id"]: {} for team in teams}
     
@@ -444,6 +811,8 @@ async def get_fixture_difficulty() -> Dict[int, Dict[int, int]]:
         difficulty[home_team][away_team] = away_difficulty
         difficulty[away_team][home_team] = home_difficulty
     
+    data_cache.difficulty_matrix = difficulty
+    data_cache.difficulty_source = source
     return difficulty
 
 
@@ -471,13 +840,17 @@ async def get_player_fixture_difficulty(player_id: int, next_n: int = 5) -> List
     # Get difficulty ratings
     difficulty_matrix = await get_fixture_difficulty()
     
+    # Teams by ID (filled with the bootstrap data loaded above) and this team's difficulty row
+    team_index = data_cache.team_index
+    team_difficulty = difficulty_matrix[team_id]
+    
     # Create result
     result = []
-    for i, fixture in enumerate(fixtures[:next_n]):
+    for fixture in fixtures[:next_n]:
         opponent_id = fixture["opponent"]
-        opponent_team = await get_team_by_id(opponent_id)
+        opponent_team = team_index.get(opponent_id)
         
-        difficulty = difficulty_matrix[team_id].get(opponent_id, 3)  # Default to medium difficulty
+        difficulty = team_difficulty.get(opponent_id, 3)  # Default to medium difficulty
         
         result.append({
             "gameweek": fixture["event"],
@@ -489,6 +862,80 @@ async def get_player_fixture_difficulty(player_id: int, next_n: int = 5) -> List
     return result
 
 
+async def get_next_fixture_difficulties(player_ids: List[int]) -> Dict[int, float]:
+    """
+    Look up each player's next fixture difficulty concurrently
+    
+    Args:
+        player_ids: Player IDs to look up
+    
+    Returns:
+        Dictionary mapping player ID to difficulty (3.0 when the lookup fails or finds no fixture)
+    """
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_FIXTURE_LOOKUPS)
+    
+    async def lookup(player_id: int) -> float:
+        async with semaphore:
+            fixtures = await get_player_fixture_difficulty(player_id, next_n=1)
+        return fixtures[0]["difficulty"] if fixtures else 3.0
+    
+    results = await asyncio.gather(*(lookup(player_id) for player_id in player_ids), return_exceptions=True)
+    
+    # Failures come back as values, so dispatch on type instead of catching per lookup
+    failures = [result for result in results if isinstance(result, BaseException)]
+    if failures and logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "%d fixture difficulty lookups failed (%s), using default difficulty",
+            len(failures), ", ".join(sorted({type(failure).__name__ for failure in failures}))
+        )
+    return {
+        player_id: 3.0 if isinstance(result, BaseException) else result
+        for player_id, result in zip(player_ids, results)
+    }
+
+
+def _players_array(elements: List[Dict[str, Any]]) -> np.ndarray:
+    """
+    Pack the numeric fields used for player rankings into a structured array (row i = elements[i])
+    """
+    return np.array(
+        [(p["id"], p["element_type"], p["now_cost"], p["total_points"], float(p["form"] or 0))
+         for p in elements],
+        dtype=PLAYER_ARRAY_DTYPE
+    )
+
+
+def _top_player_indices(scores: np.ndarray, mask: np.ndarray, limit: int) -> np.ndarray:
+    """
+    Indices of the highest-scoring players within mask, best first (ties keep API order)
+    """
+    candidates = np.flatnonzero(mask)
+    if limit <= 0:
+        return candidates[:0]
+    candidate_scores = scores[candidates]
+    if limit < len(candidates):
+        # Partition in O(n) to find the limit-th best score, then sort only players at or above it
+        # (keeping every tie at the cut-off so the stable sort still picks them in API order)
+        threshold = np.partition(candidate_scores, len(candidates) - limit)[len(candidates) - limit]
+        keep = candidate_scores >= threshold
+        candidates, candidate_scores = candidates[keep], candidate_scores[keep]
+    order = np.argsort(-candidate_scores, kind="stable")[:limit]
+    return candidates[order]
+
+
+async def _ranking_inputs(position: Optional[int]) -> Tuple[List[Dict[str, Any]], np.ndarray, np.ndarray]:
+    """
+    Bootstrap elements, their structured array and the position filter mask
+    """
+    elements = (await get_bootstrap_data()).get("elements", [])
+    players_arr = data_cache.players_arr
+    if position is None:
+        mask = np.ones(len(players_arr), dtype=bool)
+    else:
+        mask = players_arr["pos"] == position
+    return elements, players_arr, mask
+
+
 async def get_players_by_form(position: Optional[int] = None, 
                            limit: int = 10) -> List[Dict[str, Any]]:
     """
@@ -501,16 +948,8 @@ async def get_players_by_form(position: Optional[int] = None,
     Returns:
         List of players sorted by form
     """
-    players = await get_players()
-    
-    # Apply position filter if specified
-    if position is not None:
-        players = [p for p in players if p["element_type"] == position]
-    
-    # Sort by form (descending)
-    sorted_players = sorted(players, key=lambda p: float(p["form"]), reverse=True)
-    
-    return sorted_players[:limit]
+    elements, players_arr, mask = await _ranking_inputs(position)
+    return [elements[i] for i in _top_player_indices(players_arr["form"], mask, limit)]
 
 
 async def get_players_by_points(position: Optional[int] = None, 
@@ -525,16 +964,8 @@ async def get_players_by_points(position: Optional[int] = None,
     Returns:
         List of players sorted by total points
     """
-    players = await get_players()
-    
-    # Apply position filter if specified
-    if position is not None:
-        players = [p for p in players if p["element_type"] == position]
-    
-    # Sort by total points (descending)
-    sorted_players = sorted(players, key=lambda p: p["total_points"], reverse=True)
-    
-    return sorted_players[:limit]
+    elements, players_arr, mask = await _ranking_inputs(position)
+    return [elements[i] for i in _top_player_indices(players_arr["pts"], mask, limit)]
 
 
 async def get_players_by_value(position: Optional[int] = None, 
@@ -549,23 +980,53 @@ async def get_players_by_value(position: Optional[int] = None,
     Returns:
         List of players sorted by value
     """
-    players = await get_players()
+    elements, players_arr, mask = await _ranking_inputs(position)
     
-    # Apply position filter if specified
-    if position is not None:
-        players = [p for p in players if p["element_type"] == position]
+    # Calculate value (points per cost), leaving out players with no cost
+    cost = players_arr["cost"]
+    mask &= cost > 0
+    value = np.zeros(len(players_arr))
+    np.divide(players_arr["pts"], cost, out=value, where=mask)
     
-    # Calculate value (points per cost) and filter out players with no cost
-    players_with_value = []
-    for player in players:
-        if player["now_cost"] > 0:
-            value = player["total_points"] / player["now_cost"]
-            players_with_value.append({**player, "value": value})
-    
-    # Sort by value (descending)
-    sorted_players = sorted(players_with_value, key=lambda p: p["value"], reverse=True)
-    
-    return sorted_players[:limit]
+    return [{**elements[i], "value": float(value[i])} for i in _top_player_indices(value, mask, limit)]
+
+
+def _write_bootstrap_snapshot(content: bytes) -> None:
+    """
+    Write the bootstrap payload to BOOTSTRAP_SNAPSHOT_PATH (atomically, so readers never see partial files)
+    """
+    try:
+        os.makedirs(os.path.dirname(BOOTSTRAP_SNAPSHOT_PATH), exist_ok=True)
+        tmp_path = f"{BOOTSTRAP_SNAPSHOT_PATH}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(content)
+        os.replace(tmp_path, BOOTSTRAP_SNAPSHOT_PATH)
+    except OSError as e:
+        logger.debug(f"Could not write bootstrap snapshot {BOOTSTRAP_SNAPSHOT_PATH}: {str(e)}")
+
+
+def _log_snapshot_write_error(write: "asyncio.Future[None]") -> None:
+    """
+    Log a failed background bootstrap snapshot write (nothing awaits its future)
+    """
+    if not write.cancelled() and write.exception() is not None:
+        logger.warning(f"Bootstrap snapshot write failed: {str(write.exception())}")
+
+
+def _read_bootstrap_snapshot() -> Optional[Dict[str, Any]]:
+    """
+    Read the bootstrap snapshot if it exists and is younger than the bootstrap cache TTL
+    """
+    try:
+        if time.time() - os.path.getmtime(BOOTSTRAP_SNAPSHOT_PATH) > CACHE_TTLS["bootstrap"]:
+            return None
+        with open(BOOTSTRAP_SNAPSHOT_PATH, "rb") as f:
+            return orjson.loads(f.read())
+    except FileNotFoundError:
+        return None
+    except (OSError, orjson.JSONDecodeError) as e:
+        logger.debug(f"Ignoring unreadable bootstrap snapshot {BOOTSTRAP_SNAPSHOT_PATH}: {str(e)}")
+        return None
 
 
 # Simple function for synchronous access to common data
@@ -573,10 +1034,21 @@ def sync_get_data():
     """
     Get basic FPL data synchronously (for use in sync contexts)
     
+    Reads the on-disk bootstrap snapshot when it is fresh, and only fetches through a
+    new event loop when it is missing or expired.
+    
     Returns:
         Dictionary containing basic FPL data
     """
-    return asyncio.run(get_bootstrap_data())
+    snapshot = _read_bootstrap_snapshot()
+    if snapshot is not None:
+        return snapshot
+    
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return run_with_client(get_bootstrap_data())
+    raise RuntimeError("sync_get_data() cannot fetch inside a running event loop; await get_bootstrap_data() instead")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,175 @@
+"""
+Shared HTTP client
+
+An httpx.AsyncClient reused across FPL API calls so connections are kept
+alive instead of paying a new TCP+TLS handshake per request. Pooled connections
+belong to the event loop that opened them, so there is one client per running loop.
+"""
+
+import asyncio
+import httpx
+import importlib.util
+import logging
+import weakref
+from typing import Any, Coroutine, Dict, Optional, TypeVar
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Request/connect timeouts (in seconds), keep-alive pool and connection retries
+REQUEST_TIMEOUT = 30.0
+CONNECT_TIMEOUT = 5.0
+MAX_KEEPALIVE_CONNECTIONS = 32
+KEEPALIVE_EXPIRY = 60.0
+CONNECT_RETRIES = 3
+
+# Retry policy for rate limiting / server errors and dropped connections
+MAX_RETRIES = 3
+RETRY_BACKOFF = 0.5  # seconds, doubled after each attempt
+MAX_RETRY_DELAY = 8.0
+MAX_RETRY_AFTER = 30.0  # upper bound on a server-requested Retry-After wait
+
+# Ask for compressed responses explicitly; Brotli is only advertised when httpx can decode it
+ACCEPT_ENCODING = "br, gzip, deflate" if importlib.util.find_spec("brotli") else "gzip, deflate"
+DEFAULT_HEADERS = {
+    "Accept-Encoding": ACCEPT_ENCODING,
+    "User-Agent": "fpl_assistant/0.1.0",
+}  # type: Dict[str, str]
+
+# Event loop -> its client; entries go away with their loop
+_clients = weakref.WeakKeyDictionary()  # type: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]
+
+
+def get_client() -> httpx.AsyncClient:
+    """
+    Get the shared HTTP client for the running event loop, creating it on first use
+    
+    Returns:
+        Shared httpx.AsyncClient
+    """
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    # Creation never awaits, so no lock is needed to keep it single-instance on the event loop
+    if client is None or client.is_closed:
+        limits = httpx.Limits(
+            max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=KEEPALIVE_EXPIRY
+        )
+        client = _clients[loop] = httpx.AsyncClient(
+            timeout=httpx.Timeout(REQUEST_TIMEOUT, connect=CONNECT_TIMEOUT),
+            limits=limits,
+            headers=DEFAULT_HEADERS,
+            # Retries failed connection attempts only (not HTTP error responses)
+            transport=httpx.AsyncHTTPTransport(retries=CONNECT_RETRIES, limits=limits)
+        )
+    return client
+
+
+def _retry_delay(error: Exception, backoff: float) -> Optional[float]:
+    """
+    Get how long to wait before retrying a failed request, or None if it should not be retried
+    
+    Args:
+        error: Error raised by the request
+        backoff: Current exponential backoff delay (in seconds)
+    
+    Returns:
+        Delay in seconds, or None for errors that are not transient
+    """
+    if isinstance(error, httpx.TransportError):
+        return backoff
+    
+    if not isinstance(error, httpx.HTTPStatusError):
+        return None
+    status = error.response.status_code
+    if status != 429 and status < 500:
+        return None
+    
+    # Honour the server's Retry-After (in seconds) on rate limiting
+    retry_after = error.response.headers.get("Retry-After")
+    if status == 429 and retry_after and retry_after.isdigit():
+        return min(float(retry_after), MAX_RETRY_AFTER)
+    return backoff
+
+
+async def get_with_retries(
+    url: str,
+    client: Optional[httpx.AsyncClient] = None,
+    headers: Optional[Dict[str, str]] = None
+) -> httpx.Response:
+    """
+    GET a URL, retrying with exponential backoff on 429/5xx responses and transport errors
+    
+    Args:
+        url: URL to fetch
+        client: Client to use (defaults to the shared client)
+        headers: Extra request headers (e.g. If-None-Match)
+    
+    Returns:
+        Successful (or 304 Not Modified) response
+    """
+    client = client or get_client()
+    backoff = RETRY_BACKOFF
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            response = await client.get(url, headers=headers)
+            # 304 Not Modified answers a conditional GET; raise_for_status treats it as an error
+            if response.status_code != 304:
+                response.raise_for_status()
+            return response
+        except (httpx.HTTPStatusError, httpx.TransportError) as e:
+            delay = _retry_delay(e, backoff)
+            if attempt == MAX_RETRIES or delay is None:
+                raise
+            logger.warning(f"Request to {url} failed ({e.__class__.__name__}), retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+            backoff = min(backoff * 2, MAX_RETRY_DELAY)
+    raise AssertionError("unreachable")
+
+
+async def close_client() -> None:
+    """
+    Close the running event loop's HTTP client and its pooled connections
+    """
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+        logger.debug("Closed shared HTTP client")
+
+
+def install_uvloop() -> bool:
+    """
+    Make new event loops use uvloop when it is installed (asyncio.run entry points)
+    
+    Returns:
+        True if uvloop is in use
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return False
+    if not isinstance(asyncio.get_event_loop_policy(), uvloop.EventLoopPolicy):
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
+
+
+def run_with_client(coro: Coroutine[Any, Any, T]) -> T:
+    """
+    Run a coroutine on a fresh event loop, closing that loop's HTTP client before the loop ends
+    
+    Args:
+        coro: Coroutine to run (e.g. from a sync entry point or worker process)
+    
+    Returns:
+        Result of the coroutine
+    """
+    async def run() -> T:
+        try:
+            return await coro
+        finally:
+            await close_client()
+    
+    install_uvloop()
+    return asyncio.run(run())
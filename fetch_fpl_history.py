@@ -1,10 +1,12 @@
 import os
-import json
 import httpx
-from tqdm import tqdm
-from typing import List, Dict, Any
+import orjson
+from tqdm.asyncio import tqdm_asyncio
+from typing import List, Dict, Any, Optional
 import asyncio
 
+from app.utils.http_client import get_with_retries, install_uvloop
+
 # Directory to save data
 DATA_DIR = os.path.join(os.path.dirname(__file__), 'app', 'data')
 os.makedirs(DATA_DIR, exist_ok=True)
@@ -22,6 +24,15 @@ SEASONS = [
 
 BASE_URL = 'https://fantasy.premierleague.com/api'
 
+# Maximum number of player summary requests in flight at once
+MAX_CONCURRENT_REQUESTS = 20
+
+# Compressed responses shrink each season's bootstrap and summaries considerably
+REQUEST_HEADERS = {
+    'Accept-Encoding': 'gzip, deflate',
+    'User-Agent': 'fpl_assistant/0.1.0',
+}
+
 async def fetch_season_player_histories(season_id: int, season_label: str) -> None:
     if season_id == 2023:
         bootstrap_url = f'{BASE_URL}/bootstrap-static/'
@@ -29,37 +40,45 @@ async def fetch_season_player_histories(season_id: int, season_label: str) -> No
     else:
         bootstrap_url = f'{BASE_URL}/{season_id}/bootstrap-static/'
         summary_url = f'{BASE_URL}/{season_id}/element-summary/{{player_id}}/'
-    async with httpx.AsyncClient() as client:
+    limits = httpx.Limits(max_keepalive_connections=MAX_CONCURRENT_REQUESTS)
+    async with httpx.AsyncClient(limits=limits, headers=REQUEST_HEADERS) as client:
         print(f'Fetching player list for {season_label}...')
         try:
-            r = await client.get(bootstrap_url)
-            r.raise_for_status()
+            r = await get_with_retries(bootstrap_url, client=client)
         except httpx.HTTPStatusError as e:
             print(f"Skipping {season_label}: {e}")
             return
-        data = r.json()
+        data = orjson.loads(r.content)
         players: List[Dict[str, Any]] = data['elements']
-        out: List[Dict[str, Any]] = []
-        for p in tqdm(players, desc=f'Players {season_label}'):
+        sem = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+        async def fetch_one(p: Dict[str, Any]) -> Optional[Dict[str, Any]]:
             pid = p['id']
             try:
-                r2 = await client.get(summary_url.format(player_id=pid))
-                r2.raise_for_status()
-                details = r2.json()
-                out.append({
+                async with sem:
+                    r2 = await get_with_retries(summary_url.format(player_id=pid), client=client)
+                details = orjson.loads(r2.content)
+                return {
                     'id': pid,
                     'first_name': p.get('first_name', ''),
                     'second_name': p.get('second_name', ''),
                     'team': p.get('team', ''),
                     'element_type': p.get('element_type', ''),
                     'history': details.get('history', []),
-                })
+                }
             except Exception as e:
                 print(f'Failed for player {pid} in {season_label}: {e}')
-        # Save to file
-        out_path = os.path.join(DATA_DIR, f'{season_label}.json')
-        with open(out_path, 'w', encoding='utf-8') as f:
-            json.dump(out, f, indent=2)
+                return None
+
+        # Fetch all summaries concurrently (bounded by the semaphore), keeping player order
+        results = await tqdm_asyncio.gather(*(fetch_one(p) for p in players), desc=f'Players {season_label}')
+        out: List[Dict[str, Any]] = [r for r in results if r is not None]
+        # Save as JSON Lines (one player per line) so readers can stream it record by record
+        out_path = os.path.join(DATA_DIR, f'{season_label}.jsonl')
+        with open(out_path, 'wb') as f:
+            for rec in out:
+                f.write(orjson.dumps(rec))
+                f.write(b'\n')
         print(f'Saved {len(out)} players for {season_label} to {out_path}')
 
 async def main() -> None:
@@ -67,4 +86,5 @@ async def main() -> None:
         await fetch_season_player_histories(season_id, season_label)
 
 if __name__ == '__main__':
+    install_uvloop()
     asyncio.run(main())
@@ -1,8 +1,12 @@
+import asyncio
 import logging
 from telegram import Update, ReplyKeyboardMarkup
 from telegram.ext import ApplicationBuilder, CommandHandler, MessageHandler, ContextTypes, filters, ConversationHandler
 import httpx
 import os
+import time
+from operator import itemgetter
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -15,6 +19,53 @@ logger = logging.getLogger(__name__)
 
 ASK_TEAM_ID, = range(1)
 
+# Backend client shared across analyses so keep-alive connections are reused
+HTTP_CLIENT = None  # type: Optional[httpx.AsyncClient]
+# Requests an analysis sends to the backend at once (transfers, captain, score)
+PARALLEL_BACKEND_REQUESTS = 3
+
+# Gameweek the backend is asked to analyse
+GAMEWEEK = 1
+
+# How long backend responses are reused (in seconds); stale entries are served for up to
+# STALE_TTL_FACTOR times longer while a background refresh runs. Recommendations are keyed
+# by squad signature and are deterministic for an unchanged squad within a gameweek.
+CACHE_TTLS = {"team": 60, "transfers": 1800, "captain": 1800, "score": 1800}
+STALE_TTL_FACTOR = 5
+MAX_CACHE_ENTRIES = 1024
+# Entries stay usable as a last known good analysis while the backend is down (in seconds)
+LAST_KNOWN_TTL = 24 * 3600
+
+# (endpoint, cache ID) -> (monotonic time stored, response JSON). The cache ID is (team_id,)
+# for /team and (team_id, squad signature, gameweek) for the recommendation endpoints
+_RESPONSE_CACHE = {}  # type: Dict[Tuple[str, Tuple], Tuple[float, Any]]
+_REFRESH_TASKS = {}  # type: Dict[Tuple[str, Tuple], asyncio.Task]
+# team_id -> cache ID of the squad in its most recent analysis
+_LAST_ANALYSIS_KEYS = {}  # type: Dict[str, Tuple]
+# Replies being sent in the background (referenced so they are not garbage collected mid-send)
+_SEND_TASKS = set()  # type: Set[asyncio.Task]
+
+async def on_startup(app):
+    global HTTP_CLIENT
+    HTTP_CLIENT = httpx.AsyncClient(
+        base_url=API_URL,
+        timeout=httpx.Timeout(10.0, connect=5.0),
+        limits=httpx.Limits(max_keepalive_connections=32, max_connections=64)
+    )
+    # Open one connection per parallel request up front so the first analysis starts warm
+    results = await asyncio.gather(
+        *(HTTP_CLIENT.get("/") for _ in range(PARALLEL_BACKEND_REQUESTS)),
+        return_exceptions=True
+    )
+    if any(isinstance(r, Exception) for r in results):
+        logger.warning(f"Backend at {API_URL} not reachable at startup; connections will open on first use")
+
+async def on_shutdown(app):
+    global HTTP_CLIENT
+    if HTTP_CLIENT is not None:
+        await HTTP_CLIENT.aclose()
+        HTTP_CLIENT = None
+
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if not update.message:
         return ConversationHandler.END
@@ -25,9 +76,168 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
 async def analyze(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if not update.message:
         return ConversationHandler.END
+    # "/analyze force" skips cached results for this analysis
+    context.user_data["force_refresh"] = any(arg.lower() == "force" for arg in (context.args or []))
     await update.message.reply_text("Please send your FPL Team ID:")
     return ASK_TEAM_ID
 
+_get_price = itemgetter("price")
+
+def _send_bg(coro, after=None):
+    # Send a reply without waiting for Telegram's acknowledgement; `after` keeps replies in order
+    async def send():
+        if after is not None:
+            await asyncio.gather(after, return_exceptions=True)
+        await coro
+    
+    def done(task):
+        _SEND_TASKS.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Sending reply failed: {task.exception()}")
+    
+    task = asyncio.create_task(send())
+    _SEND_TASKS.add(task)
+    task.add_done_callback(done)
+    return task
+
+def _store(key, value):
+    _RESPONSE_CACHE.pop(key, None)
+    _RESPONSE_CACHE[key] = (time.monotonic(), value)
+    # Dicts keep insertion order, so the first entry is the oldest
+    while len(_RESPONSE_CACHE) > MAX_CACHE_ENTRIES:
+        del _RESPONSE_CACHE[next(iter(_RESPONSE_CACHE))]
+
+def _refresh_in_background(key, fetch):
+    task = _REFRESH_TASKS.get(key)
+    if task is not None and not task.done():
+        return
+    
+    async def refresh():
+        try:
+            _store(key, await fetch())
+        except Exception as e:
+            logger.warning(f"Background refresh of {key[0]} for team {key[1][0]} failed: {e}")
+    
+    _REFRESH_TASKS[key] = asyncio.create_task(refresh())
+
+async def _cached(endpoint: str, cache_id: Tuple, fetch: Callable[[], Awaitable[Any]], force: bool = False) -> Any:
+    # Fresh entries are returned as is, stale ones are returned while a refresh runs
+    key = (endpoint, cache_id)
+    entry = _RESPONSE_CACHE.get(key)
+    if entry is not None and not force:
+        age = time.monotonic() - entry[0]
+        ttl = CACHE_TTLS[endpoint]
+        if age <= ttl:
+            return entry[1]
+        if age <= ttl * STALE_TTL_FACTOR:
+            _refresh_in_background(key, fetch)
+            return entry[1]
+    
+    value = await fetch()
+    _store(key, value)
+    return value
+
+async def _fetch_analysis(analysis_key, team, force=False):
+    # Transfer suggestions, captain pick and team score only depend on the team,
+    # so request them concurrently; an unchanged squad is served from the cache
+    return await asyncio.gather(
+        _cached("transfers", analysis_key, lambda: _post_json(
+            "/recommendations/transfers",
+            team,
+            {"budget": 100.0, "gameweek": GAMEWEEK, "subscription_tier": "basic"}
+        ), force=force),
+        _cached("captain", analysis_key, lambda: _post_json(
+            "/captain/best",
+            team,
+            {"gameweek": GAMEWEEK, "subscription_tier": "basic"}
+        ), force=force),
+        _cached("score", analysis_key, lambda: _post_json(
+            "/team-score/rate",
+            team,
+            {"gameweek": GAMEWEEK}
+        ), force=force),
+        return_exceptions=True
+    )
+
+def _analysis_key(team_id, players):
+    # Squad signature: the same players at the same prices give the same recommendations
+    squad = tuple((p.get("id"), p.get("price")) for p in players)
+    return (team_id, squad, GAMEWEEK)
+
+async def _get_json(path):
+    resp = await HTTP_CLIENT.get(path)
+    resp.raise_for_status()
+    return resp.json()
+
+async def _get_team_players(team_id):
+    # Reject anything but a list of players before it is cached or used to build the team
+    players = await _get_json(f"/team/{team_id}")
+    if not isinstance(players, list):
+        raise ValueError(f"Unexpected /team response for team {team_id}: {type(players).__name__}")
+    return players
+
+async def _post_json(path, team, params):
+    resp = await HTTP_CLIENT.post(path, json=team, params=params)
+    resp.raise_for_status()
+    return resp.json()
+
+def _result_or_default(result, default, label):
+    # A failed side request falls back to its default instead of failing the analysis
+    if isinstance(result, Exception):
+        logger.warning(f"Could not fetch {label}: {result}")
+        return default
+    return result
+
+def _format_analysis(score, captain, transfers):
+    parts = [
+        "🏆 **Your FPL Team Analysis**\n\n",
+        f"📊 **Team Score:** {score.get('score', 'N/A')}/100\n",
+    ]
+    
+    if score.get('suggestions'):
+        parts.append(f"💡 **Suggestions:** {', '.join(score['suggestions'])}\n")
+    
+    if captain and captain.get('name'):
+        parts.append(f"👑 **Recommended Captain:** {captain['name']}\n")
+        if captain.get('reasoning'):
+            parts.append(f"📝 *Reason:* {captain['reasoning']}\n")
+    
+    if transfers:
+        parts.append("\n📈 **Top Transfer Recommendations:**\n")
+        for i, transfer in enumerate(transfers[:3], 1):  # Show top 3
+            player_out = transfer.get('player_out', {})
+            player_in = transfer.get('player_in', {})
+            impact = transfer.get('predicted_impact', 0)
+            
+            if player_out.get('name') and player_in.get('name'):
+                parts.extend([
+                    f"{i}. OUT: {player_out['name']} → IN: {player_in['name']}",
+                    f" (Impact: +{impact:.1f}pts)" if impact else "",
+                    "\n",
+                ])
+    
+    if not transfers:
+        parts.append("\n📈 **Transfers:** No recommendations available at the moment\n")
+    
+    return "".join(parts)
+
+def _last_known_analysis(team_id):
+    # Cached responses for the team's most recent squad within LAST_KNOWN_TTL, regardless of freshness
+    analysis_key = _LAST_ANALYSIS_KEYS.get(team_id)
+    if analysis_key is None:
+        return None
+    now = time.monotonic()
+    entries = {}
+    for endpoint in ("transfers", "captain", "score"):
+        entry = _RESPONSE_CACHE.get((endpoint, analysis_key))
+        if entry is not None and now - entry[0] <= LAST_KNOWN_TTL:
+            entries[endpoint] = entry
+    if not entries:
+        return None
+    age_minutes = int((now - min(stored_at for stored_at, _ in entries.values())) // 60)
+    values = {endpoint: value for endpoint, (_, value) in entries.items()}
+    return age_minutes, values.get("score", {}), values.get("captain"), values.get("transfers", [])
+
 async def handle_team_id(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if not update.message or not update.message.text:
         if update.message:
@@ -35,81 +245,53 @@ async def handle_team_id(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return ConversationHandler.END
     
     team_id = update.message.text.strip()
-    await update.message.reply_text("Fetching your team and recommendations...")
+    force_refresh = context.user_data.pop("force_refresh", False)
+    progress = _send_bg(update.message.reply_text("Fetching your team and recommendations..."))
     
     try:
-        async with httpx.AsyncClient() as client:
-            # Get team info
-            team_resp = await client.get(f"{API_URL}/team/{team_id}")
-            team_resp.raise_for_status()
-            players = team_resp.json()
-            
-            # Create Team object with proper structure
-            team = {
-                "players": players,
-                "total_value": sum(p["price"] for p in players),
-                "remaining_budget": 100.0  # Default budget, could be fetched from API
-            }
-            
-            # Get transfer suggestions
-            transfers_resp = await client.post(
-                f"{API_URL}/recommendations/transfers", 
-                json=team,
-                params={"budget": 100.0, "gameweek": 1, "subscription_tier": "basic"}
-            )
-            transfers = transfers_resp.json() if transfers_resp.status_code == 200 else []
-            
-            # Get captain pick
-            captain_resp = await client.post(
-                f"{API_URL}/captain/best", 
-                json=team,
-                params={"gameweek": 1, "subscription_tier": "basic"}
-            )
-            captain = captain_resp.json() if captain_resp.status_code == 200 else None
-            
-            # Get team score
-            score_resp = await client.post(
-                f"{API_URL}/team-score/rate", 
-                json=team,
-                params={"gameweek": 1}
-            )
-            score = score_resp.json() if score_resp.status_code == 200 else {}
-            
-        # Format the response message
-        msg = f"🏆 **Your FPL Team Analysis**\n\n"
-        msg += f"📊 **Team Score:** {score.get('score', 'N/A')}/100\n"
+        # Get team info
+        players = await _cached("team", (team_id,), lambda: _get_team_players(team_id), force=force_refresh)
         
-        if score.get('suggestions'):
-            msg += f"💡 **Suggestions:** {', '.join(score['suggestions'])}\n"
+        # Create Team object with proper structure
+        team = {
+            "players": players,
+            "total_value": sum(map(_get_price, players)),
+            "remaining_budget": 100.0  # Default budget, could be fetched from API
+        }
         
-        if captain and captain.get('name'):
-            msg += f"👑 **Recommended Captain:** {captain['name']}\n"
-            if captain.get('reasoning'):
-                msg += f"📝 *Reason:* {captain['reasoning']}\n"
+        # An unchanged squad reuses its cached recommendations without calling the backend again
+        analysis_key = _analysis_key(team_id, players)
+        transfers, captain, score = await _fetch_analysis(analysis_key, team, force_refresh)
+        if not all(isinstance(r, Exception) for r in (transfers, captain, score)):
+            # Remember this squad as the team's last known analysis
+            _LAST_ANALYSIS_KEYS.pop(team_id, None)
+            _LAST_ANALYSIS_KEYS[team_id] = analysis_key
+            if len(_LAST_ANALYSIS_KEYS) > MAX_CACHE_ENTRIES:
+                del _LAST_ANALYSIS_KEYS[next(iter(_LAST_ANALYSIS_KEYS))]
+        transfers = _result_or_default(transfers, [], "transfer suggestions")
+        captain = _result_or_default(captain, None, "captain pick")
+        score = _result_or_default(score, {}, "team score")
         
-        if transfers:
-            msg += f"\n📈 **Top Transfer Recommendations:**\n"
-            for i, transfer in enumerate(transfers[:3], 1):  # Show top 3
-                player_out = transfer.get('player_out', {})
-                player_in = transfer.get('player_in', {})
-                impact = transfer.get('predicted_impact', 0)
-                
-                if player_out.get('name') and player_in.get('name'):
-                    msg += f"{i}. OUT: {player_out['name']} → IN: {player_in['name']}"
-                    if impact:
-                        msg += f" (Impact: +{impact:.1f}pts)"
-                    msg += "\n"
-        
-        if not transfers:
-            msg += "\n📈 **Transfers:** No recommendations available at the moment\n"
+        msg = _format_analysis(score, captain, transfers)
         
         if update.message:
-            await update.message.reply_text(msg, parse_mode='Markdown')
+            _send_bg(update.message.reply_text(msg, parse_mode='Markdown'), after=progress)
             
     except Exception as e:
         logger.error(f"Bot error: {e}")
         if update.message:
-            await update.message.reply_text("Sorry, there was an error fetching your recommendations. Please try again later.")
+            # Degrade to the last known good analysis rather than a bare error
+            last_known = _last_known_analysis(team_id)
+            if last_known is not None:
+                age_minutes, score, captain, transfers = last_known
+                msg = f"⚠️ Showing cached results from {age_minutes} minutes ago (backend unavailable)\n\n"
+                msg += _format_analysis(score, captain, transfers)
+                _send_bg(update.message.reply_text(msg, parse_mode='Markdown'), after=progress)
+            else:
+                _send_bg(
+                    update.message.reply_text("Sorry, there was an error fetching your recommendations. Please try again later."),
+                    after=progress
+                )
     
     return ConversationHandler.END
 
@@ -125,17 +307,33 @@ def main():
     if not token:
         print("TELEGRAM_BOT_TOKEN not set in environment.")
         return
-    app = ApplicationBuilder().token(token).build()
+    # Separate, explicitly sized pools so long-polling getUpdates never starves replies
+    app = (
+        ApplicationBuilder()
+        .token(token)
+        .connection_pool_size(32)
+        .pool_timeout(20.0)
+        .connect_timeout(10.0)
+        .read_timeout(20.0)
+        .get_updates_connection_pool_size(4)
+        .get_updates_pool_timeout(30.0)
+        # Process updates from different users concurrently instead of one after another
+        .concurrent_updates(True)
+        .post_init(on_startup)
+        .post_shutdown(on_shutdown)
+        .build()
+    )
+    # Non-blocking handlers let an analysis wait on the backend without holding up other updates
     conv_handler = ConversationHandler(
-        entry_points=[CommandHandler("analyze", analyze)],
+        entry_points=[CommandHandler("analyze", analyze, block=False)],
         states={
-            ASK_TEAM_ID: [MessageHandler(filters.TEXT & ~filters.COMMAND, handle_team_id)]
+            ASK_TEAM_ID: [MessageHandler(filters.TEXT & ~filters.COMMAND, handle_team_id, block=False)]
         },
-        fallbacks=[CommandHandler("cancel", cancel)]
+        fallbacks=[CommandHandler("cancel", cancel, block=False)]
     )
-    app.add_handler(CommandHandler("start", start))
+    app.add_handler(CommandHandler("start", start, block=False))
     app.add_handler(conv_handler)
-    app.add_handler(CommandHandler("cancel", cancel))
+    app.add_handler(CommandHandler("cancel", cancel, block=False))
     app.run_polling()
 
 if __name__ == "__main__":
@@ -0,0 +1,50 @@
+"""
+Tests for micro-batching of model calls
+"""
+
+import asyncio
+
+from app.services import batcher
+
+
+class StubModel:
+    """Model with a single-call method and its batch variant"""
+
+    def __init__(self):
+        self.batches = []
+
+    async def score(self, x):
+        raise AssertionError("score should be batched")
+
+    async def score_batch(self, calls):
+        self.batches.append(calls)
+        return [x * 2 for (x,) in calls]
+
+
+async def _score_all(model, values):
+    return await asyncio.gather(*(batcher.call_batched(model, "score", v) for v in values))
+
+
+def test_concurrent_calls_are_batched(monkeypatch):
+    monkeypatch.setattr(batcher, "_BATCHERS", {})
+    model = StubModel()
+
+    assert asyncio.run(_score_all(model, [1, 2, 3])) == [2, 4, 6]
+    assert model.batches == [[(1,), (2,), (3,)]]
+
+
+def test_batcher_survives_a_new_event_loop(monkeypatch):
+    monkeypatch.setattr(batcher, "_BATCHERS", {})
+    model = StubModel()
+
+    assert asyncio.run(_score_all(model, [1, 2])) == [2, 4]
+    assert asyncio.run(asyncio.wait_for(_score_all(model, [3]), 1)) == [6]
+    assert len(model.batches) == 2
+
+
+def test_models_without_batch_method_are_called_directly():
+    class Plain:
+        async def score(self, x):
+            return x + 1
+
+    assert asyncio.run(batcher.call_batched(Plain(), "score", 1)) == 2
@@ -0,0 +1,126 @@
+"""
+Tests for conditional (ETag) revalidation of cached FPL API responses
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import httpx
+import orjson
+import pytest
+
+from app.utils import fpl_data, http_client
+
+
+class ETagServer:
+    """Mock FPL API that answers 304 when the client sends back the current ETag"""
+
+    def __init__(self, payload):
+        self.payload = payload
+        self.etag = '"v1"'
+        self.statuses = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        if request.headers.get("If-None-Match") == self.etag:
+            self.statuses.append(304)
+            return httpx.Response(304, headers={"ETag": self.etag})
+        self.statuses.append(200)
+        return httpx.Response(200, content=orjson.dumps(self.payload), headers={"ETag": self.etag})
+
+
+@pytest.fixture
+def mock_api(monkeypatch, tmp_path):
+    def install(payload):
+        server = ETagServer(payload)
+        client = httpx.AsyncClient(transport=httpx.MockTransport(server))
+        monkeypatch.setattr(http_client, "get_client", lambda: client)
+        return server
+
+    monkeypatch.setattr(fpl_data, "data_cache", fpl_data.FPLDataCache())
+    monkeypatch.setattr(fpl_data, "BOOTSTRAP_SNAPSHOT_PATH", str(tmp_path / "bootstrap.json"))
+    return install
+
+
+def test_get_with_retries_returns_not_modified(mock_api):
+    server = mock_api({"ok": True})
+
+    async def run():
+        first = await http_client.get_with_retries("https://fpl.test/x/")
+        second = await http_client.get_with_retries(
+            "https://fpl.test/x/", headers={"If-None-Match": first.headers["ETag"]}
+        )
+        return first.status_code, second.status_code
+
+    assert asyncio.run(run()) == (200, 304)
+    assert server.statuses == [200, 304]
+
+
+def test_fixtures_revalidate_with_etag(mock_api):
+    server = mock_api([{"id": 1, "team_h": 1, "team_a": 2}])
+
+    async def run():
+        first = await fpl_data._fetch_fixtures_data()
+        fpl_data.data_cache.fixtures_timestamp = datetime.now() - timedelta(days=1)
+        second = await fpl_data._fetch_fixtures_data()
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert server.statuses == [200, 304]
+    assert second is first
+    assert not fpl_data.data_cache.is_fixtures_expired()
+
+
+def test_bootstrap_revalidates_with_etag(mock_api):
+    server = mock_api({"elements": [], "teams": [], "events": []})
+
+    async def run():
+        first = await fpl_data._fetch_bootstrap_data()
+        fpl_data.data_cache.bootstrap_timestamp = datetime.now() - timedelta(days=1)
+        second = await fpl_data._fetch_bootstrap_data()
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert server.statuses == [200, 304]
+    assert second is first
+    assert not fpl_data.data_cache.is_bootstrap_expired()
+
+
+def test_expired_player_details_revalidate_with_etag(mock_api):
+    server = mock_api({"history": [{"round": 1, "total_points": 6}]})
+
+    async def run():
+        first = await fpl_data.get_player_detail_data(7)
+        fpl_data.data_cache.player_details_timestamp[7] = datetime.now() - timedelta(days=1)
+        second = await fpl_data.get_player_detail_data(7)
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert server.statuses == [200, 304]
+    assert second is first
+    assert fpl_data.data_cache.get_player_details(7) is first
+
+
+def test_cache_locks_are_per_event_loop(mock_api):
+    server = mock_api({"history": []})
+
+    async def fetch(player_id):
+        await fpl_data.get_player_detail_data(player_id)
+        return fpl_data._locks()
+
+    first = asyncio.run(fetch(1))
+    fpl_data.data_cache = fpl_data.FPLDataCache()
+    second = asyncio.run(fetch(1))
+    assert first is not second
+    assert server.statuses == [200, 200]
+
+
+def test_evicted_player_drops_its_lock(mock_api, monkeypatch):
+    mock_api({"history": []})
+    monkeypatch.setattr(fpl_data, "MAX_PLAYER_DETAILS", 1)
+
+    async def run():
+        await fpl_data.get_player_detail_data(1)
+        await fpl_data.get_player_detail_data(2)
+        return set(fpl_data._locks().player_detail)
+
+    assert asyncio.run(run()) == {2}
@@ -0,0 +1,86 @@
+"""
+Tests for dataset selection in the captain and transfer trainers
+"""
+
+import asyncio
+import sys
+import types
+from concurrent.futures import Future
+
+import pandas as pd
+import pytest
+
+# app.models.ml_models is not needed for these tests; register a placeholder before importing the trainers
+if "app.models.ml_models" not in sys.modules:
+    ml_models = types.ModuleType("app.models.ml_models")
+    for name in ("PointsPredictor", "CaptainRanker", "TransferAdvisor", "TeamEvaluator"):
+        setattr(ml_models, name, object)
+    sys.modules.setdefault("app.models", types.ModuleType("app.models"))
+    sys.modules["app.models.ml_models"] = ml_models
+
+from app.training import train_models  # noqa: E402
+
+
+class FakeModel:
+    def __init__(self, model_type, model_dir):
+        self.model_type = model_type
+
+    def train(self, df, target_col=None):
+        return {"mae": 0.0}
+
+    def save(self):
+        pass
+
+
+def _done_future(model):
+    future = Future()
+    future.set_result(None)
+    return future
+
+
+@pytest.fixture
+def trainer_env(tmp_path, monkeypatch):
+    main_dir = tmp_path / "main"
+    main_dir.mkdir()
+    (main_dir / "fpl_training_data_a.csv").write_text("id\n1\n")
+    (main_dir / "fpl_training_data_b.csv").write_text("id\n1\n")
+    loaded = []
+
+    async def fake_prepare(path, *args, **kwargs):
+        loaded.append(path)
+        return pd.DataFrame({"id": [1]})
+
+    monkeypatch.setattr(train_models, "prepare_prediction_dataset", fake_prepare)
+    monkeypatch.setattr(train_models, "prepare_transfer_dataset", fake_prepare)
+    monkeypatch.setattr(train_models, "CaptainRanker", FakeModel)
+    monkeypatch.setattr(train_models, "TransferAdvisor", FakeModel)
+    monkeypatch.setattr(train_models, "save_in_background", _done_future)
+    return tmp_path, main_dir, loaded
+
+
+def test_captain_models_use_latest_dataset(trainer_env):
+    base_dir, main_dir, loaded = trainer_env
+    asyncio.run(train_models.train_captain_models(str(base_dir), str(base_dir / "out"), ["basic"]))
+    assert set(loaded) == {str(main_dir / "fpl_training_data_b.csv")}
+
+
+def test_transfer_models_use_latest_dataset_by_default(trainer_env):
+    base_dir, main_dir, loaded = trainer_env
+    asyncio.run(train_models.train_transfer_models(str(base_dir), str(base_dir / "out"), ["basic"]))
+    assert set(loaded) == {str(main_dir / "fpl_training_data_b.csv")}
+
+
+def test_transfer_models_use_explicit_dataset(trainer_env):
+    base_dir, main_dir, loaded = trainer_env
+    augmented = main_dir / "fpl_training_data_a.csv.aug_1_2"
+    augmented.write_text("id\n1\n")
+    asyncio.run(train_models.train_transfer_models(
+        str(base_dir), str(base_dir / "out"), ["basic"], dataset_path=str(augmented)
+    ))
+    assert set(loaded) == {str(augmented)}
+
+
+def test_trainers_skip_without_datasets(tmp_path):
+    (tmp_path / "main").mkdir()
+    assert asyncio.run(train_models.train_captain_models(str(tmp_path), str(tmp_path / "out"), ["basic"])) == {}
+    assert asyncio.run(train_models.train_transfer_models(str(tmp_path), str(tmp_path / "out"), ["basic"])) == {}
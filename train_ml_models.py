@@ -20,9 +20,9 @@ import argparse
 import logging
 from pathlib import Path
 
-# Set up logging
+# Set up logging (TRAINING_LOG_LEVEL=DEBUG for troubleshooting; library debug output slows long runs)
 logging.basicConfig(
-    level=logging.DEBUG,  # Set to DEBUG for troubleshooting
+    level=os.environ.get("TRAINING_LOG_LEVEL", "INFO").upper(),
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
     handlers=[
         logging.FileHandler("training_output.log", mode="w"),
@@ -31,6 +31,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Rows serialized per chunk when writing the augmented training CSV
+CSV_WRITE_CHUNKSIZE = 50_000
+
 
 def print_section_header(title):
     logger.info(f"\n{'=' * 10} {title} {'=' * 10}")
@@ -126,20 +129,19 @@ async def main():
     logger.info("Captain models training complete.")
     
     # --- Inject predicted next_gw_points into main dataset for transfer model training ---
+    import numpy as np
     import pandas as pd
     import joblib
     from app.models.ml_models import PointsPredictor
-    import shutil
     import time
 
     # Find latest main dataset
     main_data_dir = os.path.join(data_dir_str, "main")
-    main_files = [f for f in os.listdir(main_data_dir) if f.endswith('.csv')]
+    main_files = sorted(Path(main_data_dir).glob("*.csv"), reverse=True)
     if not main_files:
         logger.error("No main CSV files found in data directory. Aborting transfer model training.")
         return
-    main_files.sort(reverse=True)
-    main_csv = os.path.join(main_data_dir, main_files[0])
+    main_csv = str(main_files[0])
     try:
         df = pd.read_csv(main_csv)
     except Exception as e:
@@ -153,61 +155,89 @@ async def main():
     # We'll use the highest tier available (elite > premium > basic)
     tier_priority = ['stacking', 'elite', 'premium', 'basic']
     positions = ['gk', 'def', 'mid', 'fwd']
-    predictors = {}
-    logger.info("Loading trained points predictor models for all positions...")
-    for pos in positions:
+    # List the model directory once; file checks below are set lookups instead of stat() calls
+    model_files = {p.name for p in Path(model_dir_str).iterdir()}
+
+    def load_points_predictor(pos):
+        # Return the highest-tier predictor for a position that loads successfully, or None
         for tier in tier_priority:
             if tier == 'stacking':
-                model_path = os.path.join(model_dir_str, f"points_predictor_{pos}_stacking_stacking.joblib")
                 # stacking ensemble uses a special file naming
-                if os.path.exists(model_path):
-                    predictors[pos] = PointsPredictor(model_type='stacking', position=pos.upper(), model_dir=model_dir_str)
-                    if predictors[pos].load():
-                        break
+                if f"points_predictor_{pos}_stacking_stacking.joblib" in model_files:
+                    predictor = PointsPredictor(model_type='stacking', position=pos.upper(), model_dir=model_dir_str)
+                    if predictor.load():
+                        return predictor
             else:
-                model_path = os.path.join(model_dir_str, f"points_predictor_{pos}_{tier}.joblib")
-                scaler_path = os.path.join(model_dir_str, f"points_predictor_{pos}_{tier}_scaler.joblib")
-                if os.path.exists(model_path) and os.path.exists(scaler_path):
-                    predictors[pos] = PointsPredictor(model_type=tier, position=pos.upper(), model_dir=model_dir_str)
-                    if predictors[pos].load():
-                        break
-        if pos not in predictors:
+                if (f"points_predictor_{pos}_{tier}.joblib" in model_files
+                        and f"points_predictor_{pos}_{tier}_scaler.joblib" in model_files):
+                    predictor = PointsPredictor(model_type=tier, position=pos.upper(), model_dir=model_dir_str)
+                    if predictor.load():
+                        return predictor
+        return None
+
+    logger.info("Loading trained points predictor models for all positions...")
+    # Positions are independent and joblib loading is mostly disk and unpickling, so load them in threads
+    loaded = await asyncio.gather(*(asyncio.to_thread(load_points_predictor, pos) for pos in positions))
+    predictors = {}
+    for pos, predictor in zip(positions, loaded):
+        if predictor is None:
             logger.warning(f"No points predictor model found for position {pos.upper()}. Will fallback to points_per_game.")
+        else:
+            predictors[pos] = predictor
     logger.info("All points predictor models loaded.")
 
-    # Predict next_gw_points for each player
+    # Predict next_gw_points one position at a time, with a single batched call per predictor
     logger.info("Predicting next_gw_points for all players in main dataset...")
-    pred_points = []
-    for idx, (row_idx, row) in enumerate(df.iterrows()):
-        pos = str(row['position']).lower()
-        predictor = predictors.get(pos)
-        if idx % 500 == 0:
-            logger.info(f"Predicting player {idx+1}/{len(df)}...")
+    if 'points_per_game' in df.columns:
+        next_gw_points = df['points_per_game'].astype(float)
+    else:
+        next_gw_points = pd.Series(0.0, index=df.index)
+    non_feature_columns = ['player_id', 'name', 'team', 'position']
+    # Ordered feature index per position, built once (identifier columns never count as features)
+    feature_indexes = {
+        pos: pd.Index(predictor.feature_names)
+        for pos, predictor in predictors.items()
+        if predictor.feature_names
+    }
+    n_fallback = 0
+    for pos, sub in df.groupby(df['position'].astype(str).str.lower()):
+        feature_index = feature_indexes.get(pos)
+        if feature_index is None:
+            n_fallback += len(sub)
+            continue
+        predictor = predictors[pos]
+        logger.debug(f"Predicting {len(sub)} {pos.upper()} players...")
         try:
-            if predictor is not None and predictor.feature_names:
-                # Always use predictor.feature_names
-                features = {fname: 0 for fname in predictor.feature_names}
-                row_features = row.drop(['player_id', 'name', 'team', 'position'], errors='ignore').fillna(0)
-                row_features = row_features.infer_objects()  # Fix pandas downcasting warning
-                row_features = row_features.to_dict()
-                for k, v in row_features.items():
-                    if k in features:
-                        features[k] = v
-                pred = predictor.predict(features)
-                pred_points.append(pred)
+            # Always use predictor.feature_names, with missing features as 0; reindexing selects
+            # only the feature columns instead of copying the whole group first
+            X = sub.reindex(columns=feature_index, fill_value=0)
+            identifier_features = feature_index.intersection(non_feature_columns)
+            if len(identifier_features):
+                X[identifier_features] = 0
+            X = X.fillna(0).infer_objects()
+            predict_batch = getattr(predictor, "predict_batch", None)
+            if predict_batch is not None:
+                # Tree ensembles predict natively on float32; half the bytes per feature gather
+                numeric_columns = X.select_dtypes(include='number').columns
+                X[numeric_columns] = X[numeric_columns].astype(np.float32)
+                preds = predict_batch(X)
             else:
-                pred_points.append(row.get('points_per_game', 0))
+                preds = [predictor.predict(features) for features in X.to_dict('records')]
+            next_gw_points.loc[sub.index] = preds
         except Exception as e:
-            logger.error(f"Prediction failed for player {row.get('name', 'unknown')} (ID: {row.get('player_id', 'N/A')}): {e}")
-            pred_points.append(row.get('points_per_game', 0))
-    df['next_gw_points'] = pred_points
+            n_fallback += len(sub)
+            logger.error(f"Prediction failed for {pos.upper()} players: {e}")
+    if n_fallback:
+        logger.warning(f"{n_fallback} of {len(df)} predictions fell back to points_per_game")
+    # Predictions carry no meaningful precision beyond 4 decimals; shorter floats write faster
+    df['next_gw_points'] = next_gw_points.round(4)
     logger.info("next_gw_points prediction complete.")
 
-    # Overwrite the latest main CSV with the new one for transfer model training
+    # Write the augmented dataset to a scratch file next to the main CSV (the original stays untouched;
+    # the suffix keeps it out of *.csv dataset discovery)
     unique_id = f"{os.getpid()}_{int(time.time())}"
-    backup_csv = main_csv + f'.bak_{unique_id}'
-    shutil.copy2(main_csv, backup_csv)
-    df.to_csv(main_csv, index=False)
+    augmented_csv = main_csv + f'.aug_{unique_id}'
+    df.to_csv(augmented_csv, index=False, chunksize=CSV_WRITE_CHUNKSIZE)
 
     try:
         print_section_header("Training Transfer Models")
@@ -215,12 +245,12 @@ async def main():
         transfer_metrics = await train_transfer_models(
             base_dir=data_dir_str,
             output_dir=model_dir_str,
-            model_types=model_types
+            model_types=model_types,
+            dataset_path=augmented_csv
         )
         logger.info("Transfer models training complete.")
     finally:
-        # Restore the original main CSV
-        shutil.move(backup_csv, main_csv)
+        os.remove(augmented_csv)
     
     logger.info("\nModel training complete!")
     print_metrics_summary(position_metrics, "position-specific")
@@ -229,4 +259,6 @@ async def main():
 
 
 if __name__ == "__main__":
+    from app.utils.http_client import install_uvloop
+    install_uvloop()
     asyncio.run(main())